@@ -8,28 +8,33 @@ Usage:
   python scripts/behavior_lookup.py --variation 3100 --judge 430 440
   python scripts/behavior_lookup.py --skill 1043 --judge 430
   python scripts/behavior_lookup.py --skill 1043  # Magic-only trace, if you do not have TAE behavior IDs yet
+
+Batch mode loads the params once and writes one JSON line per skill (Magic and
+BehaviorParam_PC chains, dummy flags, trace time in ms):
+  python scripts/behavior_lookup.py --all-skills --behavior-map work/tae_behavior_map/behavior_ids_param.json > work/behavior_trace.jsonl
+  python scripts/behavior_lookup.py --skills-file work/responses/ready/ashes_generated.json --jobs 4 --dummy-only
+
+A chain is flagged as dummy when its Bullet has atkAttribute=254 or isAttackSFX=0,
+or its AtkParam_Pc has atkAttribute=254 (see csv_skill_extraction_notes.md).
 """
 
 from __future__ import annotations
 
 import argparse
-import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
-
-PARAM_DIR = Path("PARAM")
-
+from typing import Dict, List, Mapping
 
-def load_csv(path: Path) -> List[dict]:
-    with path.open(newline="", encoding="utf-8") as f:
-        return list(csv.DictReader(f))
+from helpers.behavior_graph import REF_TABLES
+from helpers.behavior_trace import SKILLS_FILE, Tables, load_tables, trace_skill
+from helpers.params import PARAM_DIR, ROOT
 
 
-def index_by_id(rows: Iterable[dict]) -> Dict[str, dict]:
-    return {row["ID"]: row for row in rows}
-
-
-def describe_atk(row: dict) -> str:
+def describe_atk(row: Mapping[str, str]) -> str:
     parts = [
         f"phys {row.get('atkPhys')}",
         f"mag {row.get('atkMag')}",
@@ -43,7 +48,7 @@ def describe_atk(row: dict) -> str:
     return ", ".join(parts)
 
 
-def describe_spe(row: dict) -> str:
+def describe_spe(row: Mapping[str, str]) -> str:
     parts = []
     for key in ("effectEndurance", "hpRecoverRate", "hpRecoverPower", "staminaRecoverRate"):
         val = row.get(key)
@@ -56,71 +61,90 @@ def describe_spe(row: dict) -> str:
     return ", ".join(parts) if parts else "no obvious stats"
 
 
+def run_batch(
+    tables: Tables,
+    skills: List[Mapping[str, object]],
+    behavior_map: Mapping[str, List[int]],
+    jobs: int = 1,
+    dummy_only: bool = False,
+) -> None:
+    """Trace every skill and stream one JSON line per skill to stdout, in input order."""
+    start = time.perf_counter()
+
+    def trace(skill: Mapping[str, object]) -> dict:
+        return trace_skill(tables, skill, behavior_map.get(str(skill.get("id")), []))
+
+    totals: Dict[str, int] = {"skills": 0, "chains": 0, "dummyChains": 0}
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        try:
+            for record in pool.map(trace, skills):
+                totals["skills"] += 1
+                totals["chains"] += record["chains"]
+                totals["dummyChains"] += record["dummyChains"]
+                if dummy_only and not record["dummyChains"]:
+                    continue
+                sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # The reader went away (e.g. piped to head): drop the rest quietly,
+            # including the interpreter's final flush of stdout.
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            pool.shutdown(cancel_futures=True)
+            return
+    elapsed = time.perf_counter() - start
+    print(
+        f"Traced {totals['skills']} skills ({totals['chains']} chains, {totals['dummyChains']} dummy) in {elapsed * 1000:.0f} ms.",
+        file=sys.stderr,
+    )
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Trace BehaviorParam_PC -> Bullet/Atk/SpEffect (plus Magic shortcut if skill is known)")
     parser.add_argument("--variation", type=int, default=None, help="behaviorVariationId (EquipParamWeapon.behaviorVariationId or 0 for Ashes)")
     parser.add_argument("--judge", "--behavior", dest="judges", type=int, nargs="+", help="behaviorJudgeId values from TAE")
     parser.add_argument("--skill", type=int, help="Skill ID from work/responses/ready/skill.json (auto: find swordArtsParamId and variation)")
     parser.add_argument("--param-dir", default=PARAM_DIR, type=Path, help="Path to PARAM directory")
+    parser.add_argument("--all-skills", action="store_true", help=f"Batch-trace every skill in {SKILLS_FILE.relative_to(ROOT)} as JSON Lines")
+    parser.add_argument("--skills-file", type=Path, help="Batch-trace every skill in this skill.json-style list as JSON Lines")
+    parser.add_argument("--behavior-map", type=Path, help="Batch mode: JSON of skill ID -> behaviorJudgeId list (same format as skill_dump --behavior-map)")
+    parser.add_argument("--jobs", type=int, default=1, help="Batch mode: skills traced concurrently")
+    parser.add_argument("--dummy-only", action="store_true", help="Batch mode: only print skills with at least one dummy chain")
     args = parser.parse_args()
 
     param_dir: Path = args.param_dir
-    behavior_rows = load_csv(param_dir / "BehaviorParam_PC.csv")
-    bullet_rows = index_by_id(load_csv(param_dir / "Bullet.csv"))
-    atk_rows = index_by_id(load_csv(param_dir / "AtkParam_Pc.csv"))
-    spe_rows = index_by_id(load_csv(param_dir / "SpEffectParam.csv"))
-    magic_rows = load_csv(param_dir / "Magic.csv")
-    equip_weapon_rows = load_csv(param_dir / "EquipParamWeapon.csv")
-    equip_gem_rows = load_csv(param_dir / "EquipParamGem.csv")
+    tables = load_tables(param_dir)
+    graph, behavior_rows, bullet_rows, atk_rows, spe_rows = tables
+
+    if args.all_skills or args.skills_file:
+        skills_file = args.skills_file or SKILLS_FILE
+        skills = json.loads(skills_file.read_text(encoding="utf-8"))
+        behavior_map = json.loads(args.behavior_map.read_text(encoding="utf-8")) if args.behavior_map else {}
+        run_batch(tables, skills, behavior_map, jobs=args.jobs, dummy_only=args.dummy_only)
+        return
 
     sword_arts_id: str | None = None
     variation = str(args.variation) if args.variation is not None else None
 
-    def derive_from_skill(skill_id: int) -> Tuple[str | None, str | None]:
-        sid = str(skill_id)
-        # Ashes: EquipParamGem.ID == skill, swordArtsParamId points to the behaviors
-        for row in equip_gem_rows:
-            if row["ID"] == sid:
-                return row.get("swordArtsParamId", sid), "0"
-        # Unique weapons: either swordArtsParamId matches skill, or ID matches skill text ID
-        for row in equip_weapon_rows:
-            if row.get("swordArtsParamId") == sid or row.get("ID") == sid:
-                return row.get("swordArtsParamId", sid), row.get("behaviorVariationId") or None
-        return sid, None
-
     if args.skill is not None:
-        sword_arts_id, derived_var = derive_from_skill(args.skill)
+        # Ashes: EquipParamGem.ID == skill; unique weapons: ID or swordArtsParamId matches skill
+        sword_arts_id, derived_var = graph.skill(str(args.skill))
         if variation is None:
             variation = derived_var or "0"
         print(f"[skill] ID {args.skill} -> swordArtsParamId {sword_arts_id} (variation {variation or 'unknown'})")
     else:
         sword_arts_id = None
 
-    def gather_sp_effects(row: dict) -> List[str]:
-        ids: List[str] = []
-        for key in ("spEffectId0", "spEffectId1", "spEffectId2", "spEffectId3", "spEffectId4"):
-            val = row.get(key)
-            if val and val not in ("-1", "0"):
-                ids.append(val)
-        return ids
-
     def trace_behavior(judges: List[int], variation_id: str) -> None:
         judge_set = {str(j) for j in judges}
-        matches = [
-            row
-            for row in behavior_rows
-            if row["variationId"] == variation_id and row["behaviorJudgeId"] in judge_set and row.get("refId") not in (None, "-1")
-        ]
+        matches = [behavior_rows.get(row_id) for row_id in graph.behavior_ids(variation_id, judge_set)]
         if not matches:
             print("No BehaviorParam_PC rows found for variation", variation_id, "judge", sorted(judge_set))
             return
 
-        ref_type_label = {"0": "AtkParam_Pc", "1": "Bullet", "2": "SpEffectParam"}
-
-        for row in sorted(matches, key=lambda r: int(r["ID"])):
+        for row in matches:
             ref_type = row.get("refType", "")
             ref_id = row.get("refId")
-            label = ref_type_label.get(ref_type, "unknown")
+            label = REF_TABLES.get(ref_type, "unknown")
             print(f"BehaviorParam_PC ID {row['ID']} (var={row['variationId']}, judge={row['behaviorJudgeId']}, refType={ref_type} -> {label}, ezState={row.get('ezStateBehaviorType_old')})")
 
             if label == "AtkParam_Pc":
@@ -132,14 +156,15 @@ def main() -> None:
 
             elif label == "Bullet":
                 bullet = bullet_rows.get(ref_id)
-                if not bullet:
+                edges = graph.bullet(ref_id)
+                if not bullet or edges is None:
                     print(f"  Bullet {ref_id}: not found")
                 else:
-                    spe_ids = gather_sp_effects(bullet)
-                    print(f"  Bullet {ref_id}: atkId_Bullet={bullet.get('atkId_Bullet')} hitBullet={bullet.get('HitBulletID')} life={bullet.get('life')} dist={bullet.get('dist')} spEffects={spe_ids or 'none'}")
-                    atk = atk_rows.get(bullet.get("atkId_Bullet"))
+                    spe_ids = edges.sp_effects
+                    print(f"  Bullet {ref_id}: atkId_Bullet={edges.atk_id} hitBullet={bullet.get('HitBulletID')} life={bullet.get('life')} dist={bullet.get('dist')} spEffects={spe_ids or 'none'}")
+                    atk = atk_rows.get(edges.atk_id)
                     if atk:
-                        print(f"    AtkParam_Pc {bullet['atkId_Bullet']}: {describe_atk(atk)}")
+                        print(f"    AtkParam_Pc {edges.atk_id}: {describe_atk(atk)}")
                     for sid in spe_ids:
                         spe = spe_rows.get(sid)
                         if spe:
@@ -156,32 +181,27 @@ def main() -> None:
                 print(f"  Unknown refType {ref_type} with refId {ref_id}")
 
     def trace_magic(prefix: str) -> None:
-        ref_label = { "0": "AtkParam_Pc", "1": "Bullet", "2": "SpEffectParam" }
-        hits = []
-        for row in magic_rows:
-            for i in range(1, 11):
-                rid = row.get(f"refId{i}")
-                if rid and rid != "-1" and rid.startswith(prefix):
-                    hits.append((row, i, rid, row.get(f"refCategory{i}")))
+        hits = graph.magic_refs(prefix)
         if not hits:
             print(f"No Magic rows found with refId* starting {prefix}")
             return
         print(f"Magic rows for swordArtsParamId prefix {prefix}:")
-        for row, idx, rid, cat in hits:
-            label = ref_label.get(cat, "?")
-            print(f" Magic {row['ID']} ref{idx} -> {label} {rid}")
+        for magic_id, idx, rid, cat in hits:
+            label = REF_TABLES.get(cat, "?")
+            print(f" Magic {magic_id} ref{idx} -> {label} {rid}")
             if label == "AtkParam_Pc":
                 atk = atk_rows.get(rid)
                 if atk:
                     print(f"   AtkParam_Pc {rid}: {describe_atk(atk)}")
             elif label == "Bullet":
                 bullet = bullet_rows.get(rid)
-                if bullet:
-                    spe_ids = gather_sp_effects(bullet)
-                    print(f"   Bullet {rid}: atkId_Bullet={bullet.get('atkId_Bullet')} hitBullet={bullet.get('HitBulletID')} life={bullet.get('life')} dist={bullet.get('dist')} spEffects={spe_ids or 'none'}")
-                    atk = atk_rows.get(bullet.get("atkId_Bullet"))
+                edges = graph.bullet(rid)
+                if bullet and edges is not None:
+                    spe_ids = edges.sp_effects
+                    print(f"   Bullet {rid}: atkId_Bullet={edges.atk_id} hitBullet={bullet.get('HitBulletID')} life={bullet.get('life')} dist={bullet.get('dist')} spEffects={spe_ids or 'none'}")
+                    atk = atk_rows.get(edges.atk_id)
                     if atk:
-                        print(f"     AtkParam_Pc {bullet['atkId_Bullet']}: {describe_atk(atk)}")
+                        print(f"     AtkParam_Pc {edges.atk_id}: {describe_atk(atk)}")
                     for sid in spe_ids:
                         spe = spe_rows.get(sid)
                         if spe:
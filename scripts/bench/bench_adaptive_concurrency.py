@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Drive helpers/scheduler.py's AdaptiveLimit against a stub codex-mcp-wrapper
+that simulates a backend with limited capacity, and compare it with fixed
+--concurrency values.
+
+The stub counts how many copies of itself are running (marker files in a
+temp dir). Up to --knee concurrent runs take --base-sleep seconds; each run
+beyond that adds --slope of the base time. Above --throttle-at it prints a
+429 rate-limit message to stderr and exits 1 after a short delay, as the
+real wrapper does when the provider throttles. Failed runs are not retried,
+so "ok" is the work a plan run would actually keep.
+
+The adaptive run must raise its limit, back off after throttling and keep
+most runs; every limit change is printed with its reason.
+
+Usage:
+  python scripts/bench/bench_adaptive_concurrency.py
+  python scripts/bench/bench_adaptive_concurrency.py --jobs 80 --knee 4 --throttle-at 6 --fixed 2 5 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+ROOT = Path(__file__).resolve().parents[2]
+HELPERS_DIR = ROOT / "scripts"
+if str(HELPERS_DIR) not in sys.path:
+    sys.path.append(str(HELPERS_DIR))
+
+from helpers.scheduler import AdaptiveLimit, failure_reason, run_bounded, run_process  # noqa: E402
+from run_batches import wrapper_command  # noqa: E402
+
+STUB = """#!{python}
+import json, os, sys, time
+env = os.environ
+running = env["STUB_DIR"]
+marker = os.path.join(running, str(os.getpid()))
+open(marker, "w").close()
+try:
+    active = len(os.listdir(running))
+    base = float(env["STUB_BASE"])
+    if active > int(env["STUB_THROTTLE_AT"]):
+        time.sleep(base * 0.1)
+        print("error: 429 Too Many Requests (rate limit reached)", file=sys.stderr)
+        sys.exit(1)
+    extra = max(0, active - int(env["STUB_KNEE"])) * float(env["STUB_SLOPE"])
+    time.sleep(base * (1 + extra))
+    print(json.dumps([{{"id": int(sys.argv[2]), "active": active}}]))
+finally:
+    os.remove(marker)
+"""
+
+
+def write_stub(directory: Path) -> Path:
+    stub = directory / "codex-mcp-wrapper-stub"
+    stub.write_text(STUB.format(python=sys.executable), encoding="utf-8")
+    stub.chmod(0o755)
+    return stub
+
+
+def run_variant(stub: Path, jobs: int, concurrency: Union[int, AdaptiveLimit]) -> Tuple[float, int, int]:
+    """Wall seconds, ok runs and failed runs for ``jobs`` stub runs."""
+    outcomes: List[bool] = []
+
+    async def run_one(job_id: int) -> None:
+        res = await run_process(wrapper_command(str(job_id), Path("stub.toml"), "stub-model", str(stub)))
+        if isinstance(concurrency, AdaptiveLimit):
+            concurrency.record(res)
+        outcomes.append(failure_reason(res) is None)
+
+    start = time.perf_counter()
+    asyncio.run(run_bounded(range(1, jobs + 1), run_one, concurrency))
+    return time.perf_counter() - start, outcomes.count(True), outcomes.count(False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AIMD concurrency vs fixed limits against a throttling stub wrapper.")
+    parser.add_argument("--jobs", type=int, default=60)
+    parser.add_argument("--base-sleep", type=float, default=0.3, help="Stub run time at or below the knee.")
+    parser.add_argument("--knee", type=int, default=4, help="Concurrent runs the stub serves at full speed.")
+    parser.add_argument("--slope", type=float, default=0.5, help="Extra base times per run beyond the knee.")
+    parser.add_argument("--throttle-at", type=int, default=6, help="Concurrent runs above this get a 429.")
+    parser.add_argument("--fixed", type=int, nargs="*", default=[2, 5, 10], help="Fixed limits to compare.")
+    parser.add_argument("--initial", type=int, default=2, help="Adaptive starting limit.")
+    parser.add_argument("--maximum", type=int, default=16, help="Adaptive upper bound.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stub = write_stub(Path(tmp))
+        running = Path(tmp) / "running"
+        running.mkdir()
+        os.environ.update(
+            STUB_DIR=str(running),
+            STUB_BASE=str(args.base_sleep),
+            STUB_KNEE=str(args.knee),
+            STUB_SLOPE=str(args.slope),
+            STUB_THROTTLE_AT=str(args.throttle_at),
+        )
+        results: Dict[str, Tuple[float, int, int]] = {}
+        for limit in args.fixed:
+            results[f"fixed {limit}"] = run_variant(stub, args.jobs, limit)
+        log: List[str] = []
+        adaptive = AdaptiveLimit(args.initial, maximum=args.maximum, log=log.append)
+        results[f"adaptive {args.initial}..{args.maximum}"] = run_variant(stub, args.jobs, adaptive)
+
+    print(
+        f"{args.jobs} stub runs; {args.base_sleep}s up to {args.knee} concurrent, "
+        f"+{args.slope}x per extra run, 429 above {args.throttle_at}"
+    )
+    print(f"{'variant':<18}{'wall s':>9}{'ok':>6}{'failed':>8}{'ok/s':>8}")
+    for label, (seconds, ok, failed) in results.items():
+        print(f"{label:<18}{seconds:>9.2f}{ok:>6}{failed:>8}{ok / seconds:>8.2f}")
+    print("adaptive limit changes:")
+    for line in log:
+        print(f"  {line}")
+    print(f"  final limit {adaptive.limit}")
+
+    if not any(change.new > change.old for change in adaptive.changes):
+        raise SystemExit("adaptive limit never increased")
+    if adaptive.failures and not any(change.new < change.old for change in adaptive.changes):
+        raise SystemExit("adaptive limit never backed off after failed runs")
+    adaptive_ok = results[f"adaptive {args.initial}..{args.maximum}"][1]
+    if adaptive_ok * 2 < args.jobs:
+        raise SystemExit(f"adaptive run kept only {adaptive_ok} of {args.jobs} runs")
+
+
+if __name__ == "__main__":
+    main()
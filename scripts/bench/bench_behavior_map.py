@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Compare the indented-JSON behavior map written by tae_dump_behaviors with the
+binary map (raw and zlib-compressed): file size, full load, and loading just
+the behaviorJudgeId -> events mapping.
+
+``BehaviorMap.open`` unpacks only the binary header and string table, and
+``judge_events()`` is lazy (each judge's events are decoded on first access),
+so "mapping" times open + mapping and "one judge" adds one lookup; "all
+decoded" additionally builds every event dict, which costs about what
+json.loads does for the same events. The last lines check each against the
+10x smaller / 10x faster target.
+
+Usage:
+  python scripts/bench/bench_behavior_map.py
+  python scripts/bench/bench_behavior_map.py --tae-root dump/tae_collected --repeat 500
+  python scripts/bench/bench_behavior_map.py --json work/tae_behavior_map/behaviors_dump.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[2]
+HELPERS_DIR = ROOT / "scripts"
+if str(HELPERS_DIR) not in sys.path:
+    sys.path.append(str(HELPERS_DIR))
+
+from helpers.tae import BehaviorMap, scan_taes  # noqa: E402
+
+
+def json_judge_events(path: Path) -> Dict[int, List[dict]]:
+    """What a consumer of the JSON map has to do to group events by judge."""
+    document = json.loads(path.read_text(encoding="utf-8"))
+    grouped: Dict[int, List[dict]] = {}
+    for event in document["events"]:
+        grouped.setdefault(event["behaviorJudgeId"], []).append(event)
+    return grouped
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark behavior map formats.")
+    parser.add_argument(
+        "--tae-root",
+        type=Path,
+        default=ROOT / "PARAM/tae_behavior_map/tae",
+        help="Root directory to search for .tae files (recursively).",
+    )
+    parser.add_argument("--json", type=Path, help="Benchmark an existing JSON map instead of scanning --tae-root.")
+    parser.add_argument("--repeat", type=int, default=200, help="Loads per case (best is reported).")
+    args = parser.parse_args()
+
+    if args.json:
+        source = BehaviorMap.open(args.json)
+    else:
+        tae_files = sorted(args.tae_root.rglob("*.tae"))
+        if not tae_files:
+            raise SystemExit(f"No .tae files found under {args.tae_root}")
+        source = BehaviorMap.from_scan(args.tae_root, scan_taes(tae_files))
+    document = source.to_json()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        raw_path = tmp_dir / "behaviors.raw.bin"
+        packed_path = tmp_dir / "behaviors.bin"
+        json_path = tmp_dir / "behaviors.json"
+        source.save(raw_path, compress=False)
+        source.save(packed_path)
+        json_path.write_text(json.dumps(document, indent=2), encoding="utf-8")
+
+        for path in (raw_path, packed_path):
+            if BehaviorMap.open(path).to_json() != document:
+                raise SystemExit(f"{path.name} does not round-trip to the JSON map")
+        if dict(BehaviorMap.open(packed_path).judge_events()) != json_judge_events(json_path):
+            raise SystemExit("judge -> events mapping differs between formats")
+
+        some_judge = document["behaviors"][0] if document["behaviors"] else 0
+        cases = {
+            "json: judge -> events": (json_path, lambda: json_judge_events(json_path)),
+            "bin: all decoded": (raw_path, lambda: dict(BehaviorMap.open(raw_path).judge_events())),
+            "bin+zlib: all decoded": (packed_path, lambda: dict(BehaviorMap.open(packed_path).judge_events())),
+            "bin+zlib: mapping (lazy)": (packed_path, lambda: BehaviorMap.open(packed_path).judge_events()),
+            "bin+zlib: one judge": (packed_path, lambda: BehaviorMap.open(packed_path).judge_events()[some_judge]),
+        }
+        json_size = json_path.stat().st_size
+        print(f"{len(document['events'])} events, {len(document['behaviors'])} judges, best of {args.repeat}")
+        print(f"{'case':<28}{'bytes':>9}{'x smaller':>11}{'load ms':>10}{'x faster':>10}")
+        json_seconds = best_of(cases["json: judge -> events"][1], args.repeat)
+        speedups: Dict[str, float] = {}
+        for name, (path, fn) in cases.items():
+            seconds = json_seconds if name.startswith("json") else best_of(fn, args.repeat)
+            size = path.stat().st_size
+            speedups[name] = json_seconds / seconds
+            print(
+                f"{name:<28}{size:>9}{json_size / size:>11.1f}"
+                f"{seconds * 1000:>10.3f}{json_seconds / seconds:>10.1f}"
+            )
+        smaller = json_size / packed_path.stat().st_size
+        for name in ("bin+zlib: mapping (lazy)", "bin+zlib: one judge", "bin+zlib: all decoded"):
+            verdict = "meets" if smaller >= 10 and speedups[name] >= 10 else "BELOW"
+            print(f"10x target, {name}: {smaller:.1f}x smaller, {speedups[name]:.1f}x faster -> {verdict}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Compare PARAM loading strategies: wall time and peak RSS per strategy.
+
+Every strategy runs in a fresh interpreter so peak RSS is not polluted by the
+previous run; warm strategies use a cache primed in a temporary directory.
+
+Usage:
+  python scripts/bench/bench_param_load.py
+  python scripts/bench/bench_param_load.py --table BehaviorParam_PC --columns ID variationId behaviorJudgeId refId --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[2]
+HELPERS_DIR = ROOT / "scripts"
+if str(HELPERS_DIR) not in sys.path:
+    sys.path.append(str(HELPERS_DIR))
+
+from helpers.params import PARAM_DIR, load_param, resolve_param_path  # noqa: E402
+
+# The columns build_aow_stage1.load_weapon_base_stats reads.
+DEFAULT_COLUMNS = [
+    "Name",
+    "disableGemAttr",
+    "atkAttribute",
+    "atkAttribute2",
+    "attackBasePhysics",
+    "attackBaseMagic",
+    "attackBaseFire",
+    "attackBaseThunder",
+    "attackBaseDark",
+    "spEffectBehaviorId0",
+    "spEffectBehaviorId1",
+    "spEffectBehaviorId2",
+]
+
+STRATEGIES = {
+    "dictreader": "list(csv.DictReader(f)), then read the columns from each dict",
+    "params-cold": "load_param with an empty cache (parse + write cache)",
+    "params-warm-all": "load_param from cache, decode every column",
+    "params-warm-projected": "load_param(columns=...) from cache",
+}
+
+
+def run_strategy(strategy: str, path: Path, columns: List[str], cache_dir: Path) -> int:
+    """Load ``path`` using ``strategy`` and touch every requested cell."""
+    touched = 0
+    if strategy == "dictreader":
+        with path.open(newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            for col in columns:
+                touched += len(row.get(col) or "")
+        return touched
+
+    if strategy == "params-cold":
+        table = load_param(path, cache_dir=cache_dir, columns=columns)
+    elif strategy == "params-warm-all":
+        table = load_param(path, cache_dir=cache_dir)
+        table.require(table.columns)
+    else:
+        table = load_param(path, cache_dir=cache_dir, columns=columns)
+    for record in table.records(columns):
+        for cell in record:
+            touched += len(cell)
+    return touched
+
+
+def child_main(args: argparse.Namespace) -> None:
+    path = resolve_param_path(args.table, args.param_dir)
+    start = time.perf_counter()
+    touched = run_strategy(args.child, path, args.columns, args.cache_dir)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"seconds": elapsed, "peak_kb": peak_kb, "touched": touched}))
+
+
+def spawn(strategy: str, args: argparse.Namespace, cache_dir: Path) -> Dict[str, float]:
+    cmd = [
+        sys.executable,
+        __file__,
+        "--child",
+        strategy,
+        "--table",
+        args.table,
+        "--param-dir",
+        str(args.param_dir),
+        "--cache-dir",
+        str(cache_dir),
+        "--columns",
+        *args.columns,
+    ]
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def baseline_kb() -> int:
+    """Peak RSS of an interpreter that only imports the helpers."""
+    cmd = [
+        sys.executable,
+        "-c",
+        (
+            "import resource, sys; sys.path.append(%r); import csv, helpers.params; "
+            "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+        )
+        % str(HELPERS_DIR),
+    ]
+    return int(subprocess.run(cmd, check=True, capture_output=True, text=True).stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark PARAM CSV loading strategies.")
+    parser.add_argument("--table", default="EquipParamWeapon", help="PARAM table name or CSV path.")
+    parser.add_argument("--columns", nargs="+", default=DEFAULT_COLUMNS, help="Columns to read.")
+    parser.add_argument("--param-dir", type=Path, default=PARAM_DIR, help="Path to PARAM directory.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per strategy (best is reported).")
+    parser.add_argument("--child", choices=sorted(STRATEGIES), help=argparse.SUPPRESS)
+    parser.add_argument("--cache-dir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child_main(args)
+        return
+
+    base_kb = baseline_kb()
+    print(f"Table {args.table}, {len(args.columns)} columns, best of {args.repeat} (RSS above a {base_kb / 1024:.1f} MiB idle interpreter)")
+    print(f"{'strategy':<24}{'wall ms':>10}{'peak RSS MiB':>14}")
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as warm_dir:
+        # Prime the warm cache once; cold runs each get a fresh directory.
+        spawn("params-cold", args, Path(warm_dir))
+        for strategy in STRATEGIES:
+            runs = []
+            for _ in range(args.repeat):
+                if strategy == "params-cold":
+                    with tempfile.TemporaryDirectory() as cold_dir:
+                        runs.append(spawn(strategy, args, Path(cold_dir)))
+                else:
+                    runs.append(spawn(strategy, args, Path(warm_dir)))
+            best = min(runs, key=lambda r: r["seconds"])
+            results[strategy] = best
+            print(
+                f"{strategy:<24}{best['seconds'] * 1000:>10.1f}"
+                f"{(best['peak_kb'] - base_kb) / 1024:>14.1f}"
+            )
+
+    touched = {r["touched"] for r in results.values()}
+    if len(touched) != 1:
+        raise SystemExit(f"Strategies disagree on cell contents: {results}")
+    reference = results["dictreader"]
+    projected = results["params-warm-projected"]
+    print(
+        f"params-warm-projected vs dictreader: "
+        f"{reference['seconds'] / projected['seconds']:.0f}x faster, "
+        f"{(reference['peak_kb'] - base_kb) / max(projected['peak_kb'] - base_kb, 1):.0f}x less memory"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Compare the old Popen + poll()/sleep(1) batch loop with the asyncio scheduler
+(helpers/scheduler.py) that run_plan.py and run_prompt_queue.py now use.
+
+No model is called: both drive a stub codex-mcp-wrapper written to a temp
+dir, which sleeps for the duration encoded in its prompt and echoes a JSON
+array the way the real wrapper's chat output contains one. Every job's output
+must parse with run_batches.extract_json_from_output and carry its own id.
+"ideal" is the makespan of the same jobs with zero scheduling gap.
+
+Also reports the interpreter start + ``import run_batches`` cost that the old
+run_plan.py paid once per plan entry (it spawned scripts/run_batches.py) and
+the new one pays once per run.
+
+Usage:
+  python scripts/bench/bench_scheduler.py
+  python scripts/bench/bench_scheduler.py --jobs 30 --concurrency 5 --min-sleep 0.2 --max-sleep 1.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import heapq
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+HELPERS_DIR = ROOT / "scripts"
+if str(HELPERS_DIR) not in sys.path:
+    sys.path.append(str(HELPERS_DIR))
+
+from helpers.scheduler import run_bounded, run_process  # noqa: E402
+from run_batches import extract_json_from_output, wrapper_command  # noqa: E402
+
+STUB = """#!{python}
+import json, sys, time
+# argv: chat <prompt> --config ... -- --model M; the prompt is "<id> <seconds>".
+job_id, seconds = sys.argv[2].split()
+time.sleep(float(seconds))
+print("stub wrapper: session started")
+print(json.dumps([{{"id": int(job_id), "name": "Item " + job_id, "caption": "", "info": ""}}]))
+print("stub wrapper: done", file=sys.stderr)
+"""
+
+Job = Tuple[int, float]
+
+
+def write_stub(directory: Path) -> Path:
+    stub = directory / "codex-mcp-wrapper-stub"
+    stub.write_text(STUB.format(python=sys.executable), encoding="utf-8")
+    stub.chmod(0o755)
+    return stub
+
+
+def command(stub: Path, job: Job) -> List[str]:
+    job_id, seconds = job
+    return wrapper_command(f"{job_id} {seconds:.3f}", Path("stub.toml"), "stub-model", str(stub))
+
+
+def check_output(job: Job, stdout: str, stderr: str) -> None:
+    _snippet, parsed = extract_json_from_output(stdout + "\n" + stderr)
+    if not parsed or parsed[0].get("id") != job[0]:
+        raise SystemExit(f"job {job[0]}: stub output did not parse back to its id")
+
+
+def run_poll_loop(stub: Path, jobs: List[Job], concurrency: int) -> None:
+    """The loop run_plan.py / run_prompt_queue.py used before the scheduler."""
+    procs: List[Tuple[subprocess.Popen, Job]] = []
+    idx = 0
+    while idx < len(jobs) or procs:
+        while idx < len(jobs) and len(procs) < concurrency:
+            proc = subprocess.Popen(command(stub, jobs[idx]), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            procs.append((proc, jobs[idx]))
+            idx += 1
+        done = []
+        for proc, job in procs:
+            if proc.poll() is not None:
+                out, err = proc.communicate()
+                check_output(job, out, err)
+                done.append((proc, job))
+        for entry in done:
+            procs.remove(entry)
+        if not done:
+            time.sleep(1)
+
+
+def run_scheduler(stub: Path, jobs: List[Job], concurrency: int) -> None:
+    async def run_one(job: Job) -> None:
+        res = await run_process(command(stub, job))
+        check_output(job, res.stdout, res.stderr)
+
+    asyncio.run(run_bounded(jobs, run_one, concurrency))
+
+
+def ideal_makespan(jobs: List[Job], concurrency: int) -> float:
+    """Completion time of the same start order with slots refilled instantly."""
+    slots = [0.0] * max(1, concurrency)
+    for _, seconds in jobs:
+        heapq.heappush(slots, heapq.heappop(slots) + seconds)
+    return max(slots)
+
+
+def interpreter_start(directory: Path, repeat: int) -> float:
+    cmd = [sys.executable, "-c", f"import sys; sys.path.insert(0, {str(HELPERS_DIR)!r}); import run_batches"]
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=directory, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Poll loop vs asyncio scheduler against a stub wrapper.")
+    parser.add_argument("--jobs", type=int, default=20, help="Stub wrapper runs per variant.")
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--min-sleep", type=float, default=0.2, help="Shortest stub run, seconds.")
+    parser.add_argument("--max-sleep", type=float, default=1.2, help="Longest stub run, seconds.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    jobs = [(idx, rng.uniform(args.min_sleep, args.max_sleep)) for idx in range(1, args.jobs + 1)]
+    with tempfile.TemporaryDirectory() as tmp:
+        stub = write_stub(Path(tmp))
+        timings = {
+            "ideal (no gaps)": ideal_makespan(jobs, args.concurrency),
+            "poll loop": timed(lambda: run_poll_loop(stub, jobs, args.concurrency)),
+            "asyncio scheduler": timed(lambda: run_scheduler(stub, jobs, args.concurrency)),
+        }
+        spawn = interpreter_start(Path(tmp), 3)
+
+    print(f"{args.jobs} stub runs of {args.min_sleep}-{args.max_sleep}s, concurrency {args.concurrency}")
+    print(f"{'variant':<22}{'wall s':>10}{'over ideal s':>14}")
+    ideal = timings["ideal (no gaps)"]
+    for label, seconds in timings.items():
+        print(f"{label:<22}{seconds:>10.2f}{seconds - ideal:>14.2f}")
+    print(f"poll loop vs scheduler: {timings['poll loop'] / timings['asyncio scheduler']:.2f}x")
+    print(f"interpreter start + import run_batches (old cost per plan entry): {spawn * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Compare build_aow_stage1's skill-name resolution strategies on every name it
+resolves (the attack-data CSV rows plus the EquipParamGem names), and fail if
+the Aho-Corasick matcher disagrees with the original per-name regex loop on
+any of them.
+
+Usage:
+  python scripts/bench/bench_skill_resolver.py
+  python scripts/bench/bench_skill_resolver.py --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+ROOT = Path(__file__).resolve().parents[2]
+HELPERS_DIR = ROOT / "scripts"
+STAGES_DIR = ROOT / "scripts/build_aow"
+for path in (HELPERS_DIR, STAGES_DIR):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+from build_aow_stage1 import (  # noqa: E402
+    ATTACK_DATA_CSV,
+    EQUIP_PARAM_GEM_CSV,
+    IGNORED_PREFIXES,
+    SkillNameMatcher,
+    base_skill_name,
+    extract_prefix,
+    load_skill_names,
+    resolve_skill_from_list,
+    strip_weapon_prefix,
+)
+from helpers.params import load_param  # noqa: E402
+
+
+def legacy_resolve(name: str, skill_names: List[str]) -> str:
+    """The original resolver: one re.search (and pattern build) per skill name."""
+    prefix, remainder = extract_prefix(name)
+    target = remainder if prefix and prefix in IGNORED_PREFIXES else name
+    working = strip_weapon_prefix(target)
+    for skill in skill_names:
+        pattern = rf"(?i)(^|[\s\[\(-]){re.escape(skill)}(?=$|[\s\]\)-])"
+        if re.search(pattern, working):
+            return skill
+    return base_skill_name(target)
+
+
+def resolved_names() -> List[str]:
+    with ATTACK_DATA_CSV.open() as f:
+        names = [(row.get("Name") or "").strip() for row in csv.DictReader(f)]
+    for row in load_param(EQUIP_PARAM_GEM_CSV):
+        name = (row.get("Name") or "").strip()
+        if name.lower().startswith("ash of war:"):
+            name = name.split(":", 1)[1].strip()
+        names.append(name)
+    return [name for name in names if name]
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark stage1 skill-name resolution.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per strategy (best is reported).")
+    args = parser.parse_args()
+
+    skill_names = load_skill_names()
+    if not skill_names:
+        raise SystemExit("No skill names loaded (docs/skill_names_from_gem_and_behavior.txt missing?)")
+    names = resolved_names()
+    matcher = SkillNameMatcher(skill_names)
+
+    expected = [legacy_resolve(name, skill_names) for name in names]
+    actual = [resolve_skill_from_list(name, matcher) for name in names]
+    mismatched = [(name, want, got) for name, want, got in zip(names, expected, actual) if want != got]
+    if mismatched:
+        for name, want, got in mismatched[:10]:
+            print(f"{name!r}: regex {want!r}, matcher {got!r}")
+        raise SystemExit(f"Resolvers disagree on {len(mismatched)} of {len(names)} names")
+
+    matched = sum(1 for name in names if matcher.find(strip_weapon_prefix(name)) is not None)
+    print(
+        f"{len(names)} names ({matched} matched a listed skill), {len(skill_names)} skills, "
+        f"best of {args.repeat}; resolvers agree on every name"
+    )
+    strategies = {
+        "regex per skill": lambda: [legacy_resolve(name, skill_names) for name in names],
+        "aho-corasick (incl. build)": lambda: [resolve_skill_from_list(name, fresh) for fresh in [SkillNameMatcher(skill_names)] for name in names],
+        "aho-corasick": lambda: [resolve_skill_from_list(name, matcher) for name in names],
+    }
+    print(f"{'strategy':<28}{'wall ms':>10}{'us/name':>10}")
+    timings = {}
+    for label, fn in strategies.items():
+        seconds = best_of(fn, args.repeat)
+        timings[label] = seconds
+        print(f"{label:<28}{seconds * 1000:>10.1f}{seconds * 1e6 / len(names):>10.1f}")
+    print(f"aho-corasick vs regex: {timings['regex per skill'] / timings['aho-corasick']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Compare generate_skill_stats' per-row numeric path with its NumPy batch path
+(--numpy): the parsed row numbers and stance scaling must agree on every
+attack-sheet row and stance line, and both are timed. Needs numpy.
+
+Usage:
+  python scripts/bench/bench_skill_stats_numpy.py
+  python scripts/bench/bench_skill_stats_numpy.py --repeat 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+HELPERS_DIR = ROOT / "scripts"
+if str(HELPERS_DIR) not in sys.path:
+    sys.path.append(str(HELPERS_DIR))
+
+import generate_skill_stats as gss  # noqa: E402
+from helpers.reference import load_reference  # noqa: E402
+
+ScaleCall = Tuple[List[float], List[float], List[float]]
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def stance_calls(numbers: List["gss.RowNumbers"], slots: int = 4) -> List[ScaleCall]:
+    """
+    Stance scaling inputs built from the sheet: poise/super armor of ``slots``
+    consecutive rows against each distinct category factor set in turn.
+    """
+    factor_sets = sorted(
+        {
+            tuple(gss.stance_factors({"stance_categories": cats}))
+            for cats in load_reference().aow_categories.values()
+        }
+    )
+    calls: List[ScaleCall] = []
+    for idx in range(0, len(numbers), slots):
+        chunk = numbers[idx:idx + slots]
+        factors = list(factor_sets[(idx // slots) % len(factor_sets)])
+        calls.append(([n.poise for n in chunk], [n.super_armor for n in chunk], factors))
+    return calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the per-row and NumPy numeric paths.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per variant; the best is reported.")
+    args = parser.parse_args()
+    if gss.np is None:
+        raise SystemExit("numpy is not installed; the batch path is unavailable")
+
+    rows = gss.merge_duplicate_rows(load_reference().attack_rows())
+    per_row = [gss.row_numbers(row) for row in rows]
+    batch = gss.batch_row_numbers(rows)
+    bad = [row["Name"] for row, want, got in zip(rows, per_row, batch) if want != got]
+    if bad:
+        raise SystemExit(f"{len(bad)} rows differ, e.g. {bad[:3]}")
+
+    calls = stance_calls(per_row)
+    for values, supers, factors in calls:
+        if gss.scale_stance_ranges(values, supers, factors) != gss.scale_stance_ranges_numpy(
+            values, supers, factors
+        ):
+            raise SystemExit(f"stance scaling differs for {values} x {factors}")
+    print(f"{len(rows)} rows and {len(calls)} stance scalings agree")
+
+    timings = {
+        "row numbers, per row": best_of(lambda: [gss.row_numbers(row) for row in rows], args.repeat),
+        "row numbers, numpy": best_of(lambda: gss.batch_row_numbers(rows), args.repeat),
+        "stance scaling, python": best_of(
+            lambda: [gss.scale_stance_ranges(*call) for call in calls], args.repeat
+        ),
+        "stance scaling, numpy": best_of(
+            lambda: [gss.scale_stance_ranges_numpy(*call) for call in calls], args.repeat
+        ),
+    }
+    print(f"{'step':<28}{'wall ms':>10}")
+    for label, seconds in timings.items():
+        print(f"{label:<28}{seconds * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Time Stage 3 + Stage 4 (collapse and rendering of AoW-data-2 rows), the part
+of the pipeline that parses numeric layouts such as "12, 15 [6-18]".
+
+"cold" clears the helpers/numeric_text.py parse caches before each run (a
+fresh process); "warm" keeps them (a long-lived runner or --incremental
+rerun). With --baseline REV the stage scripts from that git revision are
+loaded alongside, their Stage 4 output must match the current tree row for
+row, and both are timed.
+
+Stage 2 rows are read from --input when given, otherwise built in memory
+from Stage 1/2 as run_pipeline.py does.
+
+Usage:
+  python scripts/bench/bench_stage34.py
+  python scripts/bench/bench_stage34.py --baseline HEAD~1 --repeat 7
+  python scripts/bench/bench_stage34.py --input work/aow_pipeline/AoW-data-2.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import time
+import types
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+HELPERS_DIR = ROOT / "scripts"
+STAGES_DIR = ROOT / "scripts/build_aow"
+for path in (HELPERS_DIR, STAGES_DIR):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+import build_aow_stage1 as stage1  # noqa: E402
+import build_aow_stage2 as stage2  # noqa: E402
+import build_aow_stage3 as stage3  # noqa: E402
+import build_aow_stage4 as stage4  # noqa: E402
+from helpers.numeric_text import clear_caches  # noqa: E402
+from run_pipeline import csv_rows  # noqa: E402
+
+Rows = List[Dict[str, str]]
+Layout = Tuple[Rows, List[str]]
+
+
+def stage2_rows(path: Optional[Path]) -> Layout:
+    if path is not None:
+        return stage3.read_rows(path)
+    rows1, _ = stage1.build_all_rows()
+    fields1 = list(stage1.OUTPUT_COLUMNS)
+    rows2, fields2, *_ = stage2.transform_rows(csv_rows(rows1, fields1), fields1)
+    return csv_rows(rows2, fields2), fields2
+
+
+def load_revision(rev: str, stage: str) -> types.ModuleType:
+    """``scripts/build_aow/build_aow_<stage>.py`` as of ``rev``, as a fresh module."""
+    rel = f"scripts/build_aow/build_aow_{stage}.py"
+    try:
+        source = subprocess.run(
+            ["git", "show", f"{rev}:{rel}"], cwd=ROOT, check=True, capture_output=True, text=True
+        ).stdout
+    except subprocess.CalledProcessError as exc:
+        raise SystemExit(f"git show {rev}:{rel} failed: {exc.stderr.strip()}")
+    name = f"baseline_{stage}"
+    module = types.ModuleType(name)
+    module.__file__ = str(ROOT / rel)
+    sys.modules[name] = module
+    exec(compile(source, f"{rev}:{rel}", "exec"), module.__dict__)
+    return module
+
+
+def run_stages(s3: types.ModuleType, s4: types.ModuleType, layout: Layout) -> Layout:
+    rows, fieldnames = layout
+    rows3, fields3 = s3.transform_rows([dict(row) for row in rows], list(fieldnames))
+    rows4, fields4 = s4.transform_rows(csv_rows(rows3, fields3), fields3)
+    return csv_rows(rows4, fields4), fields4
+
+
+def best_of(fn: Callable[[], object], repeat: int, before: Callable[[], None] = lambda: None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        before()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time Stage 3 + 4, optionally against an older revision.")
+    parser.add_argument("--input", type=Path, help="AoW-data-2.csv (default: build Stage 1/2 in memory)")
+    parser.add_argument("--baseline", metavar="REV", help="Also time (and compare with) the stages at this git revision.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per variant; the best is reported.")
+    args = parser.parse_args()
+
+    layout = stage2_rows(args.input)
+    current = run_stages(stage3, stage4, layout)
+    print(f"{len(layout[0])} Stage 2 rows -> {len(current[0])} Stage 4 rows")
+
+    timings: Dict[str, float] = {}
+    if args.baseline:
+        base3 = load_revision(args.baseline, "stage3")
+        base4 = load_revision(args.baseline, "stage4")
+        baseline = run_stages(base3, base4, layout)
+        if baseline != current:
+            raise SystemExit(f"Stage 4 output differs from {args.baseline}")
+        timings[args.baseline] = best_of(lambda: run_stages(base3, base4, layout), args.repeat)
+    timings["current (cold)"] = best_of(lambda: run_stages(stage3, stage4, layout), args.repeat, clear_caches)
+    timings["current (warm)"] = best_of(lambda: run_stages(stage3, stage4, layout), args.repeat)
+
+    print(f"{'variant':<24}{'stage 3+4 ms':>14}")
+    for label, seconds in timings.items():
+        print(f"{label:<24}{seconds * 1000:>14.1f}")
+    if args.baseline:
+        base = timings[args.baseline]
+        for label in ("current (cold)", "current (warm)"):
+            print(f"{label} vs {args.baseline}: {base / timings[label]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Compare the per-field TAE parser that tae_dump_behaviors used to ship with the
+mmap/bulk-struct reader in helpers/tae.py, and check they find the same events.
+
+Usage:
+  python scripts/bench/bench_tae_parse.py
+  python scripts/bench/bench_tae_parse.py --tae-root dump/tae_collected --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+ROOT = Path(__file__).resolve().parents[2]
+HELPERS_DIR = ROOT / "scripts"
+if str(HELPERS_DIR) not in sys.path:
+    sys.path.append(str(HELPERS_DIR))
+
+from helpers.tae import read_tae  # noqa: E402
+
+
+def legacy_parse_tae(path: Path) -> List[dict]:
+    """The original reader: read_bytes plus one unpack_from per header field."""
+
+    def read_i32(data: memoryview, offset: int) -> int:
+        return struct.unpack_from("<i", data, offset)[0]
+
+    def read_i64(data: memoryview, offset: int) -> int:
+        return struct.unpack_from("<q", data, offset)[0]
+
+    def read_u64(data: memoryview, offset: int) -> int:
+        return struct.unpack_from("<Q", data, offset)[0]
+
+    def read_f32(data: memoryview, offset: int) -> float:
+        return struct.unpack_from("<f", data, offset)[0]
+
+    data = memoryview(path.read_bytes())
+    if len(data) < 0xB0 or data[0:4].tobytes() != b"TAE ":
+        return []
+    version = read_i32(data, 0x8)
+    if version not in (0x1000C, 0x1000D):
+        return []
+    anim_count = read_i32(data, 0x54)
+    anims_offset = read_i64(data, 0x58)
+
+    events: List[dict] = []
+    for i in range(anim_count):
+        anim_header = anims_offset + i * 0x10
+        anim_id = read_i64(data, anim_header)
+        anim_offset = read_i64(data, anim_header + 8)
+        if anim_offset <= 0 or anim_offset >= len(data):
+            continue
+        event_headers_offset = read_i64(data, anim_offset + 0x00)
+        event_count = read_i32(data, anim_offset + 0x20)
+        if event_count <= 0:
+            continue
+        if event_headers_offset <= 0 or event_headers_offset + event_count * 0x18 > len(data):
+            continue
+        for ev_idx in range(event_count):
+            hdr = event_headers_offset + ev_idx * 0x18
+            if hdr < 0 or hdr + 0x18 > len(data):
+                break
+            start_time_offset = read_i64(data, hdr + 0x00)
+            end_time_offset = read_i64(data, hdr + 0x08)
+            event_data_offset = read_i64(data, hdr + 0x10)
+            if event_data_offset <= 0 or event_data_offset + 0x18 > len(data):
+                continue
+            event_type = read_u64(data, event_data_offset)
+            if event_type != 304:
+                continue
+            start_time = read_f32(data, start_time_offset) if 0 <= start_time_offset + 4 <= len(data) else None
+            end_time = read_f32(data, end_time_offset) if 0 <= end_time_offset + 4 <= len(data) else None
+            behavior_id = read_i32(data, event_data_offset + 0x14)
+            events.append(
+                {
+                    "tae": path.name,
+                    "anim_id": anim_id,
+                    "start": start_time,
+                    "end": end_time,
+                    "behaviorJudgeId": behavior_id,
+                }
+            )
+    return events
+
+
+def bulk_records(path: Path) -> List[dict]:
+    return read_tae(path).records(path.name)
+
+
+def bulk_arrays(path: Path) -> int:
+    return len(read_tae(path))
+
+
+def bulk_all_types(path: Path) -> int:
+    return len(read_tae(path, event_types=None))
+
+
+STRATEGIES = {
+    "legacy (dicts)": legacy_parse_tae,
+    "bulk (dicts)": bulk_records,
+    "bulk (arrays)": bulk_arrays,
+    "bulk (arrays, all types)": bulk_all_types,
+}
+
+
+def best_of(fn: Callable[[Path], object], files: List[Path], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in files:
+            fn(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark TAE behavior-event extraction.")
+    parser.add_argument(
+        "--tae-root",
+        type=Path,
+        default=ROOT / "PARAM/tae_behavior_map/tae",
+        help="Root directory to search for .tae files (recursively).",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per strategy (best is reported).")
+    args = parser.parse_args()
+
+    files = sorted(args.tae_root.rglob("*.tae"))
+    if not files:
+        raise SystemExit(f"No .tae files found under {args.tae_root}")
+
+    mismatched = [path.name for path in files if legacy_parse_tae(path) != bulk_records(path)]
+    if mismatched:
+        raise SystemExit(f"Readers disagree on {len(mismatched)} files, e.g. {mismatched[:5]}")
+
+    total_mb = sum(path.stat().st_size for path in files) / (1 << 20)
+    print(f"{len(files)} TAE files, {total_mb:.1f} MiB, best of {args.repeat}; readers agree on every file")
+    print(f"{'strategy':<28}{'wall ms':>10}{'MiB/s':>10}")
+    timings = {}
+    for name, fn in STRATEGIES.items():
+        seconds = best_of(fn, files, args.repeat)
+        timings[name] = seconds
+        print(f"{name:<28}{seconds * 1000:>10.1f}{total_mb / seconds:>10.0f}")
+    print(f"bulk (arrays) vs legacy: {timings['legacy (dicts)'] / timings['bulk (arrays)']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
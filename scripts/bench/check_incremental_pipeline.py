@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Check that run_pipeline.py --incremental renders the same AoW-data-5.md (and
+AoW-data-2 rows) as a full run when copy_rows.json moves rows to another
+skill.
+
+Stage 1 rows are built in memory; the rules in copy_rows.json get one extra
+entry copying --name's rows with a "Skill" override of --skill. Stages 2-5
+then run both ways, as run_pipeline.py does, and the first difference is
+printed. The incremental run reads the existing per-skill cache but never
+writes it.
+
+Usage:
+  python scripts/bench/check_incremental_pipeline.py
+  python scripts/bench/check_incremental_pipeline.py --name "Storm Blade - Bullet" --skill "Lion's Claw"
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+HELPERS_DIR = ROOT / "scripts"
+STAGES_DIR = ROOT / "scripts/build_aow"
+for path in (HELPERS_DIR, STAGES_DIR):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+import build_aow_stage1 as stage1  # noqa: E402
+import build_aow_stage2 as stage2  # noqa: E402
+import build_aow_stage3 as stage3  # noqa: E402
+import build_aow_stage4 as stage4  # noqa: E402
+import build_aow_stage5 as stage5  # noqa: E402
+from helpers.force_collapse import load_force_collapse_map  # noqa: E402
+from run_pipeline import csv_rows, incremental_stage, incremental_stage2  # noqa: E402
+
+Rows = List[Dict[str, str]]
+
+
+def full_run(rows1: Rows, fields1: List[str], copy_rows: list) -> Tuple[Rows, List[str]]:
+    force_groups, force_overrides, force_primary = load_force_collapse_map(stage2.FORCE_COLLAPSE_DEFAULT)
+    rows2, fields2, *_ = stage2.transform_with_rules(
+        [dict(row) for row in rows1],
+        fields1,
+        copy_rows=copy_rows,
+        value_blacklist=stage2.load_value_blacklist(stage2.VALUE_BLACKLIST_DEFAULT),
+        force_groups=force_groups,
+        force_overrides=force_overrides,
+        force_primary=force_primary,
+    )
+    rows2 = csv_rows(rows2, fields2)
+    rows3, fields3 = stage3.transform_rows(rows2, fields2)
+    rows4, _ = stage4.transform_rows(csv_rows(rows3, fields3), fields3)
+    return rows2, markdown(rows4)
+
+
+def incremental_run(rows1: Rows, fields1: List[str], copy_rows: list) -> Tuple[Rows, List[str]]:
+    rows2, fields2, *_ = incremental_stage2(rows1, fields1, copy_rows)
+    rows3, fields3, _ = incremental_stage("stage3", stage3, rows2, fields2)
+    rows4, _, _ = incremental_stage("stage4", stage4, rows3, fields3, stage4.COLOR_ENABLED)
+    return rows2, markdown(rows4)
+
+
+def markdown(rows4: Rows) -> List[str]:
+    lines, _ = stage5.build_markdown(rows4, stage5.OUTPUT_DEFAULT, [], {}, {}, False)
+    return lines
+
+
+def first_difference(label: str, full: Sequence[object], incremental: Sequence[object]) -> str:
+    for idx, (want, got) in enumerate(zip(full, incremental)):
+        if want != got:
+            return f"{label} differs at {idx + 1}:\n  full:        {want!r}\n  incremental: {got!r}"
+    return f"{label}: full has {len(full)}, incremental {len(incremental)}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Diff incremental vs full AoW stages 2-5 for a Skill-override copy.")
+    parser.add_argument("--name", default="Storm Blade - Bullet", help="Stage 1 row Name to copy.")
+    parser.add_argument("--skill", default="Lion's Claw", help="Skill the copied rows are moved to.")
+    args = parser.parse_args()
+
+    rows1, _ = stage1.build_all_rows()
+    fields1 = list(stage1.OUTPUT_COLUMNS)
+    rows1 = csv_rows(rows1, fields1)
+    if not any(row.get("Name") == args.name for row in rows1):
+        raise SystemExit(f"No Stage 1 row named {args.name!r}")
+    copy_rows = stage2.load_copy_rows(stage2.COPY_ROWS_DEFAULT)
+    copy_rows.append({"name": args.name, "copies": [{"Skill": args.skill}]})
+
+    start = time.perf_counter()
+    full_rows2, full_md = full_run(rows1, fields1, copy_rows)
+    full_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    inc_rows2, inc_md = incremental_run(rows1, fields1, copy_rows)
+    inc_seconds = time.perf_counter() - start
+
+    print(
+        f"{args.name!r} copied to {args.skill!r}: full {len(full_rows2)} stage 2 rows, "
+        f"{len(full_md)} md lines ({full_seconds:.2f}s); incremental ({inc_seconds:.2f}s)"
+    )
+    problems = []
+    if inc_rows2 != full_rows2:
+        problems.append(first_difference("AoW-data-2 rows", full_rows2, inc_rows2))
+    if inc_md != full_md:
+        problems.append(first_difference("AoW-data-5.md lines", full_md, inc_md))
+    if problems:
+        raise SystemExit("\n".join(problems))
+    print("incremental output matches the full run")
+
+
+if __name__ == "__main__":
+    main()
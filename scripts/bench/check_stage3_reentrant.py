@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Check that build_aow_stage3 can run several pipelines at once: engines for
+two different column layouts (the full Stage 2 output and a copy trimmed to
+one Dmg Type/MV pair) must leave the module's globals untouched, and when run
+concurrently in threads and in worker processes every result must match the
+serial result for its layout.
+
+Stage 2 rows are read from --input when given, otherwise built in memory
+from Stage 1/2 as run_pipeline.py does.
+
+Usage:
+  python scripts/bench/check_stage3_reentrant.py
+  python scripts/bench/check_stage3_reentrant.py --input work/aow_pipeline/AoW-data-2.csv --rounds 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+HELPERS_DIR = ROOT / "scripts"
+STAGES_DIR = ROOT / "scripts/build_aow"
+for path in (HELPERS_DIR, STAGES_DIR):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+import build_aow_stage1 as stage1  # noqa: E402
+import build_aow_stage2 as stage2  # noqa: E402
+import build_aow_stage3 as stage3  # noqa: E402
+from build_aow_stage3 import Stage3Engine, read_rows  # noqa: E402
+from run_pipeline import csv_rows  # noqa: E402
+
+Rows = List[Dict[str, str]]
+Layout = Tuple[Rows, List[str]]
+
+
+def stage2_rows(path: Optional[Path]) -> Layout:
+    if path is not None:
+        return read_rows(path)
+    rows1, _ = stage1.build_all_rows()
+    fields1 = list(stage1.OUTPUT_COLUMNS)
+    rows2, fields2, *_ = stage2.transform_rows(csv_rows(rows1, fields1), fields1)
+    return csv_rows(rows2, fields2), fields2
+
+
+def single_pair_layout(rows: Rows, fieldnames: List[str]) -> Layout:
+    """The same rows with only the first Dmg Type/MV pair, i.e. other agg columns."""
+    dropped = {
+        col
+        for col in fieldnames
+        if (col.startswith("Dmg Type ") or col.startswith("Dmg MV ")) and not col.endswith(" 1")
+    }
+    fields = [col for col in fieldnames if col not in dropped]
+    return [{col: row.get(col, "") for col in fields} for row in rows], fields
+
+
+def module_state(module: types.ModuleType) -> Dict[str, str]:
+    """Plain-data globals of ``module``; a reentrant engine never changes them."""
+    plain = (str, int, float, bool, tuple, list, dict, set, frozenset, type(None))
+    return {
+        name: repr(value)
+        for name, value in vars(module).items()
+        if not name.startswith("__") and isinstance(value, plain)
+    }
+
+
+def run_layout(layout: Layout) -> Rows:
+    rows, fieldnames = layout
+    return Stage3Engine(fieldnames).transform(rows)[0]
+
+
+def check(label: str, results: List[Rows], expected: List[Rows]) -> None:
+    bad = [idx for idx, (got, want) in enumerate(zip(results, expected)) if got != want]
+    if bad:
+        raise SystemExit(f"{label}: {len(bad)} of {len(results)} runs differ from the serial result")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run Stage 3 engines concurrently and compare to serial runs.")
+    parser.add_argument("--input", type=Path, help="AoW-data-2.csv (default: build Stage 1/2 in memory)")
+    parser.add_argument("--rounds", type=int, default=3, help="Runs per layout in each concurrent check.")
+    parser.add_argument("--workers", type=int, default=4, help="Threads / processes per check.")
+    args = parser.parse_args()
+
+    full = stage2_rows(args.input)
+    layouts = [full, single_pair_layout(*full)]
+    pair_counts = [len(Stage3Engine(fields).dmg_pairs) for _, fields in layouts]
+    if pair_counts[0] == pair_counts[1]:
+        raise SystemExit("Stage 2 output has a single Dmg Type/MV pair; layouts would not differ")
+
+    start = time.perf_counter()
+    before = module_state(stage3)
+    serial = [run_layout(layout) for layout in layouts]
+    changed = sorted(name for name, value in module_state(stage3).items() if before.get(name) != value)
+    if changed:
+        raise SystemExit(f"Stage 3 run changed module globals: {', '.join(changed)}")
+    if serial[0] == serial[1]:
+        raise SystemExit("Both layouts collapse to the same rows; the check would not catch leaks")
+    print(
+        f"{len(full[0])} input rows; layouts with {pair_counts[0]} and {pair_counts[1]} Dmg pairs; "
+        f"serial {time.perf_counter() - start:.2f}s"
+    )
+
+    tasks = [layouts[idx % 2] for idx in range(args.rounds * 2)]
+    expected = [serial[idx % 2] for idx in range(args.rounds * 2)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        check("threads", list(pool.map(run_layout, tasks)), expected)
+    print(f"threads: {len(tasks)} interleaved runs match ({time.perf_counter() - start:.2f}s)")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        check("processes", list(pool.map(run_layout, tasks)), expected)
+    print(f"processes: {len(tasks)} runs match ({time.perf_counter() - start:.2f}s)")
+
+    start = time.perf_counter()
+    sharded = [Stage3Engine(fields).transform(rows, jobs=args.workers)[0] for rows, fields in layouts]
+    check("sharded", sharded, serial)
+    print(f"sharded (--jobs {args.workers}): both layouts match ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
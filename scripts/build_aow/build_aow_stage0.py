@@ -1,5 +1,4 @@
 import argparse
-import csv
 import sys
 from pathlib import Path
 
@@ -9,6 +8,8 @@ if str(HELPERS_DIR) not in sys.path:
     sys.path.append(str(HELPERS_DIR))
 
 from helpers.output import format_path_for_console  # noqa: E402
+from helpers.params import load_param, param_inputs  # noqa: E402
+from helpers.stage_manifest import StageManifest, add_manifest_arguments  # noqa: E402
 
 
 GEM_CSV = ROOT / "PARAM/EquipParamGem.csv"
@@ -19,49 +20,43 @@ OUTPUT = ROOT / "docs/skill_names_from_gem_and_behavior.txt"
 
 def load_gem_names() -> set[str]:
     names: set[str] = set()
-    with GEM_CSV.open() as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            name = (row.get("Name") or "").strip()
-            if not name:
-                continue
-            if name.lower().startswith("ash of war"):
-                if ":" in name:
-                    name = name.split(":", 1)[1].strip()
-                else:
-                    name = name[len("ash of war"):].strip()
-            if not name or name.lower().startswith("test gem"):
-                continue
-            names.add(name)
+    for row in load_param(GEM_CSV, columns=("Name",)):
+        name = (row.get("Name") or "").strip()
+        if not name:
+            continue
+        if name.lower().startswith("ash of war"):
+            if ":" in name:
+                name = name.split(":", 1)[1].strip()
+            else:
+                name = name[len("ash of war"):].strip()
+        if not name or name.lower().startswith("test gem"):
+            continue
+        names.add(name)
     return names
 
 
 def load_behavior_names() -> set[str]:
     names: set[str] = set()
-    with BEHAVIOR_CSV.open() as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            name = (row.get("Name") or "").strip()
-            if "[AOW]" not in name:
-                continue
-            if "]" in name:
-                skill = name.split("]", 1)[1].strip()
-            else:
-                skill = name.replace("[AOW]", "").strip()
-            if skill:
-                names.add(skill)
+    for row in load_param(BEHAVIOR_CSV, columns=("Name",)):
+        name = (row.get("Name") or "").strip()
+        if "[AOW]" not in name:
+            continue
+        if "]" in name:
+            skill = name.split("]", 1)[1].strip()
+        else:
+            skill = name.replace("[AOW]", "").strip()
+        if skill:
+            names.add(skill)
     return names
 
 
 def load_swordarts_names() -> set[str]:
     names: set[str] = set()
-    with SWORDARTS_CSV.open() as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            name = (row.get("Name") or "").strip()
-            if not name or name == "%null%":
-                continue
-            names.add(name)
+    for row in load_param(SWORDARTS_CSV, columns=("Name",)):
+        name = (row.get("Name") or "").strip()
+        if not name or name == "%null%":
+            continue
+        names.add(name)
     return names
 
 
@@ -80,7 +75,16 @@ def main() -> None:
         action="store_true",
         help="Show source-only skill sets (Gem/Behavior/SwordArts).",
     )
+    add_manifest_arguments(parser)
     args = parser.parse_args()
+    stage = StageManifest(
+        "stage0",
+        args,
+        inputs=[src for path in (GEM_CSV, BEHAVIOR_CSV, SWORDARTS_CSV) for src in param_inputs(path)],
+        outputs=[args.output],
+    )
+    if stage.up_to_date():
+        return
 
     gem_names = load_gem_names()
     behavior_names = load_behavior_names()
@@ -88,6 +92,7 @@ def main() -> None:
     combined = sorted(gem_names | behavior_names | swordarts_names)
     args.output.parent.mkdir(parents=True, exist_ok=True)
     args.output.write_text("\n".join(combined), encoding="utf-8")
+    stage.record()
 
     path_text = format_path_for_console(args.output, ROOT)
     print(f"Wrote {len(combined)} skills to {path_text}")
@@ -1,6 +1,5 @@
 import argparse
 import csv
-import json
 import re
 import sys
 from collections import OrderedDict, defaultdict
@@ -18,19 +17,40 @@ from helpers.diff import (  # noqa: E402
     report_row_deltas,
 )
 from helpers.output import format_path_for_console  # noqa: E402
-ATTACK_DATA_CSV = ROOT / "docs/(1.16.1)-Ashes-of-War-Attack-Data.csv"
-POISE_MV_CSV = ROOT / "docs/(1.16.1)-Poise-Damage-MVs.csv"
-EQUIP_PARAM_GEM_CSV = ROOT / "PARAM/EquipParamGem.csv"
+from helpers.params import load_param, param_inputs  # noqa: E402
+from helpers.reference import (  # noqa: E402
+    ATTACK_DATA_CSV,
+    CATEGORY_POISE_JSON,
+    EQUIP_PARAM_GEM_CSV,
+    POISE_MV_CSV,
+    SKILL_ATTR_SCALING_JSON,
+    load_reference,
+)
+from helpers.stage_manifest import StageManifest, add_manifest_arguments  # noqa: E402
 EQUIP_PARAM_WEAPON_CSV = ROOT / "PARAM/EquipParamWeapon.csv"
 SP_EFFECT_PARAM_CSV = ROOT / "PARAM/SpEffectParam.csv"
-CATEGORY_POISE_JSON = ROOT / "docs/weapon_categories_poise.json"
 SKILL_LIST_TXT = ROOT / "docs/skill_names_from_gem_and_behavior.txt"
-SKILL_ATTR_SCALING_JSON = ROOT / "work/aow_pipeline/skill_attr_scaling.json"
 DEFAULT_OUTPUT = ROOT / "work/aow_pipeline/AoW-data-1.csv"
 
 IGNORED_PREFIXES = {"Slow", "Var1", "Var2"}
 
 CATEGORY_FLAG_PREFIX = "canMountWep_"
+WEAPON_STATUS_COLUMNS = (
+    "spEffectBehaviorId0",
+    "spEffectBehaviorId1",
+    "spEffectBehaviorId2",
+)
+WEAPON_BASE_COLUMNS = (
+    "Name",
+    "disableGemAttr",
+    "atkAttribute",
+    "atkAttribute2",
+    "attackBasePhysics",
+    "attackBaseMagic",
+    "attackBaseFire",
+    "attackBaseThunder",
+    "attackBaseDark",
+) + WEAPON_STATUS_COLUMNS
 OUTPUT_COLUMNS = [
     "Name",
     "Skill",
@@ -82,7 +102,7 @@ OUTPUT_COLUMNS = [
 def load_category_flags() -> Tuple[
     Dict[str, Dict[str, float]], Dict[str, float]
 ]:
-    data = json.loads(CATEGORY_POISE_JSON.read_text())
+    data = load_reference().categories
     flag_to_info: Dict[str, Dict[str, float]] = {}
     name_to_poise: Dict[str, float] = {}
     for flag, payload in data.items():
@@ -113,24 +133,111 @@ def base_skill_name(name: str) -> str:
 def load_skill_names() -> List[str]:
     if not SKILL_LIST_TXT.exists():
         return []
-    names = [
-        line.strip()
-        for line in SKILL_LIST_TXT.read_text().splitlines()
-        if line.strip()
-    ]
+    return parse_skill_names(SKILL_LIST_TXT.read_text())
+
+
+def parse_skill_names(text: str) -> List[str]:
+    names = [line.strip() for line in text.splitlines() if line.strip()]
     # Sort by length desc for longest-match search.
     names.sort(key=len, reverse=True)
     return names
 
 
-def resolve_skill_from_list(name: str, skill_names: List[str]) -> str:
+# Characters the skill-name pattern accepts around a match (besides whitespace
+# and the start/end of the name).
+SKILL_LEFT_BOUNDARY = frozenset("[(-")
+SKILL_RIGHT_BOUNDARY = frozenset("])-")
+
+
+class SkillNameMatcher:
+    """
+    Aho-Corasick automaton over the canonical skill names, built once.
+
+    ``find(text)`` returns the skill the old per-name regex loop returned:
+    the first name in list order (longest first, see ``load_skill_names``)
+    that occurs case-insensitively in ``text`` with whitespace, a bracket,
+    a parenthesis, a dash or the start/end of the text on either side. All
+    occurrences of all names are found in one pass, and the lowest list index
+    whose boundaries hold wins. Non-ASCII text falls back to the regexes,
+    whose Unicode case folding ``str.lower`` does not reproduce exactly.
+    """
+
+    def __init__(self, skill_names: List[str]) -> None:
+        self.skill_names = list(skill_names)
+        self._lengths = [len(name) for name in self.skill_names]
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for priority, name in enumerate(self.skill_names):
+            node = 0
+            for ch in name.lower():
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                node = nxt
+            outputs[node].append(priority)
+
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for node in queue:
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                fail[nxt] = goto[state].get(ch, 0)
+                outputs[nxt] = sorted(outputs[nxt] + outputs[fail[nxt]])
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+        self._patterns: Optional[List[re.Pattern]] = None
+
+    def _regex_find(self, text: str) -> Optional[str]:
+        if self._patterns is None:
+            self._patterns = [
+                re.compile(rf"(?i)(^|[\s\[\(-]){re.escape(skill)}(?=$|[\s\]\)-])")
+                for skill in self.skill_names
+            ]
+        for skill, pattern in zip(self.skill_names, self._patterns):
+            if pattern.search(text):
+                return skill
+        return None
+
+    def find(self, text: str) -> Optional[str]:
+        if not text.isascii():
+            return self._regex_find(text)
+        goto, fail, outputs, lengths = self._goto, self._fail, self._outputs, self._lengths
+        lowered = text.lower()
+        end = len(text)
+        best: Optional[int] = None
+        node = 0
+        for idx, ch in enumerate(lowered):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for priority in outputs[node]:
+                if best is not None and priority >= best:
+                    break
+                after = idx + 1
+                if after != end and not (text[after] in SKILL_RIGHT_BOUNDARY or text[after].isspace()):
+                    continue
+                start = after - lengths[priority]
+                if start and not (text[start - 1] in SKILL_LEFT_BOUNDARY or text[start - 1].isspace()):
+                    continue
+                best = priority
+                break
+        return None if best is None else self.skill_names[best]
+
+
+def resolve_skill_from_list(name: str, skill_matcher: SkillNameMatcher) -> str:
     prefix, remainder = extract_prefix(name)
     target = remainder if prefix and prefix in IGNORED_PREFIXES else name
     working = strip_weapon_prefix(target)
-    for skill in skill_names:
-        pattern = rf"(?i)(^|[\s\[\(-]){re.escape(skill)}(?=$|[\s\]\)-])"
-        if re.search(pattern, working):
-            return skill
+    skill = skill_matcher.find(working)
+    if skill is not None:
+        return skill
     return base_skill_name(target)
 
 
@@ -310,17 +417,15 @@ def detect_tick(name: str) -> int:
 
 def load_sp_effect_names() -> Dict[str, str]:
     effects: Dict[str, str] = {}
-    with SP_EFFECT_PARAM_CSV.open() as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            raw_name = (row.get("Name") or "").strip()
-            if not raw_name:
-                continue
-            clean = raw_name.split("-", 1)[0].strip()
-            clean = re.sub(r"^\[[^\]]+\]\s*", "", clean)
-            if clean == "Thiollier's Hidden Needle":
-                clean = "Sleep"
-            effects[str(row.get("ID", "")).strip()] = clean
+    for row in load_param(SP_EFFECT_PARAM_CSV, columns=("ID", "Name")):
+        raw_name = (row.get("Name") or "").strip()
+        if not raw_name:
+            continue
+        clean = raw_name.split("-", 1)[0].strip()
+        clean = re.sub(r"^\[[^\]]+\]\s*", "", clean)
+        if clean == "Thiollier's Hidden Needle":
+            clean = "Sleep"
+        effects[str(row.get("ID", "")).strip()] = clean
     return effects
 
 
@@ -328,37 +433,36 @@ def load_weapon_base_stats(
     sp_effect_names: Dict[str, str]
 ) -> Dict[str, Dict[str, str]]:
     stats: Dict[str, Dict[str, str]] = {}
-    with EQUIP_PARAM_WEAPON_CSV.open() as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            name = (row.get("Name") or "").strip()
-            if not name:
+    weapons = load_param(EQUIP_PARAM_WEAPON_CSV, columns=WEAPON_BASE_COLUMNS)
+    for row in weapons:
+        name = (row.get("Name") or "").strip()
+        if not name:
+            continue
+        key = name.lower()
+        status_effects: List[str] = []
+        for col in WEAPON_STATUS_COLUMNS:
+            raw_id = (row.get(col) or "").strip()
+            if not raw_id or raw_id == "-1":
                 continue
-            key = name.lower()
-            status_effects: List[str] = []
-            for col in ("spEffectBehaviorId0", "spEffectBehaviorId1", "spEffectBehaviorId2"):
-                raw_id = (row.get(col) or "").strip()
-                if not raw_id or raw_id == "-1":
-                    continue
-                effect_name = sp_effect_names.get(raw_id, "").strip()
-                if effect_name and effect_name not in status_effects:
-                    status_effects.append(effect_name)
-            stats[key] = {
-                "disable_gem_attr": row.get("disableGemAttr", "") or "0",
-                "atk_attribute": row.get("atkAttribute", "") or "-",
-                "atk_attribute_2": row.get("atkAttribute2", "") or "-",
-                "phys": row.get("attackBasePhysics", "") or "-",
-                "magic": row.get("attackBaseMagic", "") or "-",
-                "fire": row.get("attackBaseFire", "") or "-",
-                "ltng": row.get("attackBaseThunder", "") or "-",
-                "holy": row.get("attackBaseDark", "") or "-",
-                "status_effects": status_effects,
-            }
+            effect_name = sp_effect_names.get(raw_id, "").strip()
+            if effect_name and effect_name not in status_effects:
+                status_effects.append(effect_name)
+        stats[key] = {
+            "disable_gem_attr": row.get("disableGemAttr", "") or "0",
+            "atk_attribute": row.get("atkAttribute", "") or "-",
+            "atk_attribute_2": row.get("atkAttribute2", "") or "-",
+            "phys": row.get("attackBasePhysics", "") or "-",
+            "magic": row.get("attackBaseMagic", "") or "-",
+            "fire": row.get("attackBaseFire", "") or "-",
+            "ltng": row.get("attackBaseThunder", "") or "-",
+            "holy": row.get("attackBaseDark", "") or "-",
+            "status_effects": status_effects,
+        }
     return stats
 
 
 def build_gem_mount_map(
-    flag_to_info: Dict[str, Dict[str, float]], skill_names: List[str]
+    flag_to_info: Dict[str, Dict[str, float]], skill_matcher: SkillNameMatcher
 ) -> Tuple[Dict[str, List[str]], Dict[str, str]]:
     """
     Map canonical skill -> list of weapon category names, and canonical skill
@@ -369,52 +473,38 @@ def build_gem_mount_map(
     flag_order = [
         flag for flag in flag_to_info if flag.startswith(CATEGORY_FLAG_PREFIX)
     ]
-    with EQUIP_PARAM_GEM_CSV.open() as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            raw_name = (row.get("Name") or "").strip()
-            if not raw_name:
-                continue
-            clean_name = raw_name
-            if clean_name.lower().startswith("ash of war:"):
-                clean_name = clean_name.split(":", 1)[1].strip()
-            resolved = resolve_skill_from_list(clean_name, skill_names)
-            canon = resolved.lower()
-            attr_val = (row.get("defaultWepAttr") or "").strip()
-            if attr_val:
-                existing_attr = skill_attr_map.get(canon, "")
-                # Prefer non-zero/non-empty attrs over zeros/defaults.
-                if not existing_attr or existing_attr == "0":
-                    skill_attr_map[canon] = attr_val
-            mount_text_id = (row.get("mountWepTextId") or "").strip()
-            if mount_text_id == "-1" or mount_text_id == "":
-                continue
-            mounts: List[str] = []
-            for flag in flag_order:
-                if row.get(flag, "").strip() == "1":
-                    mounts.append(flag_to_info[flag]["name"])
-            if mounts:
-                existing = mount_map.setdefault(canon, [])
-                for m in mounts:
-                    if m not in existing:
-                        existing.append(m)
+    for gem in load_reference().gem_mounts:
+        raw_name = gem.name.strip()
+        if not raw_name:
+            continue
+        clean_name = raw_name
+        if clean_name.lower().startswith("ash of war:"):
+            clean_name = clean_name.split(":", 1)[1].strip()
+        resolved = resolve_skill_from_list(clean_name, skill_matcher)
+        canon = resolved.lower()
+        attr_val = gem.default_attr
+        if attr_val:
+            existing_attr = skill_attr_map.get(canon, "")
+            # Prefer non-zero/non-empty attrs over zeros/defaults.
+            if not existing_attr or existing_attr == "0":
+                skill_attr_map[canon] = attr_val
+        if gem.mount_text_id == "-1" or gem.mount_text_id == "":
+            continue
+        mounts: List[str] = []
+        for flag in flag_order:
+            if flag in gem.flags:
+                mounts.append(flag_to_info[flag]["name"])
+        if mounts:
+            existing = mount_map.setdefault(canon, [])
+            for m in mounts:
+                if m not in existing:
+                    existing.append(m)
     return mount_map, skill_attr_map
 
 
 def load_poise_lookup() -> Dict[str, str]:
     """Map weapon name (case-insensitive) -> Base poise string."""
-    lookup: Dict[str, str] = {}
-    with POISE_MV_CSV.open() as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            weapon = (row.get("Weapon") or "").strip()
-            base = (row.get("Base") or "").strip()
-            if not weapon:
-                continue
-            key = weapon.lower()
-            if key not in lookup:
-                lookup[key] = base
-    return lookup
+    return load_reference().poise_base_text
 
 
 def fmt_poise(val: str) -> str:
@@ -458,21 +548,7 @@ def avg_stat(values: List[str]) -> str:
 
 
 def load_skill_attr_scaling() -> Dict[str, str]:
-    if not SKILL_ATTR_SCALING_JSON.exists():
-        return {}
-    try:
-        data = json.loads(SKILL_ATTR_SCALING_JSON.read_text())
-    except json.JSONDecodeError:
-        return {}
-    mapping: Dict[str, str] = {}
-    for key, payload in data.items():
-        stat = "-"
-        if isinstance(payload, dict):
-            stat_raw = payload.get("stat")
-            if isinstance(stat_raw, str):
-                stat = stat_raw.strip() or "-"
-        mapping[str(key).strip()] = stat
-    return mapping
+    return load_reference().skill_attr_scaling
 
 
 def resolve_skill_attr_stat(
@@ -488,225 +564,223 @@ def build_rows(
     mount_map: Dict[str, List[str]],
     category_poise: Dict[str, float],
     poise_lookup: Dict[str, str],
-    skill_names: List[str],
+    skill_matcher: SkillNameMatcher,
     weapon_base_stats: Dict[str, Dict[str, str]],
     skill_attr_map: Dict[str, str],
     skill_attr_scaling: Dict[str, str],
 ) -> Tuple[List[OrderedDict], Dict[str, List[str]]]:
     rows: List[OrderedDict] = []
     warnings: Dict[str, List[str]] = defaultdict(list)
-    with ATTACK_DATA_CSV.open() as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            raw_name = (row.get("Name") or "").strip()
-            if not raw_name:
-                continue
-            prefix = weapon_prefix(raw_name)
-            if prefix and prefix in IGNORED_PREFIXES:
-                prefix = ""
-            unique_weapon = (row.get("Unique Skill Weapon") or "").strip()
-            skill = resolve_skill_from_list(raw_name, skill_names)
-            canonical = skill.lower()
-            skill_attr_stat = resolve_skill_attr_stat(
-                canonical, skill_attr_map, skill_attr_scaling
+    for row in load_reference().attack_rows():
+        raw_name = (row.get("Name") or "").strip()
+        if not raw_name:
+            continue
+        prefix = weapon_prefix(raw_name)
+        if prefix and prefix in IGNORED_PREFIXES:
+            prefix = ""
+        unique_weapon = (row.get("Unique Skill Weapon") or "").strip()
+        skill = resolve_skill_from_list(raw_name, skill_matcher)
+        canonical = skill.lower()
+        skill_attr_stat = resolve_skill_attr_stat(
+            canonical, skill_attr_map, skill_attr_scaling
+        )
+        fp_flag = parse_fp_flag(raw_name)
+        part = infer_part(raw_name, matched_skill=skill)
+        follow_up = detect_follow_up(raw_name)
+        hand = detect_hand(raw_name)
+        charged = detect_charged(raw_name)
+        step = detect_step(raw_name)
+        bullet_flag = detect_bullet(raw_name)
+        tick_flag = detect_tick(raw_name)
+        if bullet_flag and part == "Hit":
+            part = "Bullet"
+
+        weapon_list: List[str] = []
+        poise_list: List[str] = []
+        weapon_source = ""
+        wep_disable_attr = (
+            wep_phys
+        ) = wep_magic = wep_fire = wep_ltng = wep_holy = "-"
+        wep_atk_attr = wep_atk_attr2 = "-"
+        status_by_weapon: List[str] = []
+
+        if unique_weapon:
+            weapon_source = "unique"
+            weapon_list = (
+                parse_unique_weapon_variants(unique_weapon)
+                or [unique_weapon]
             )
-            fp_flag = parse_fp_flag(raw_name)
-            part = infer_part(raw_name, matched_skill=skill)
-            follow_up = detect_follow_up(raw_name)
-            hand = detect_hand(raw_name)
-            charged = detect_charged(raw_name)
-            step = detect_step(raw_name)
-            bullet_flag = detect_bullet(raw_name)
-            tick_flag = detect_tick(raw_name)
-            if bullet_flag and part == "Hit":
-                part = "Bullet"
-
-            weapon_list: List[str] = []
-            poise_list: List[str] = []
-            weapon_source = ""
-            wep_disable_attr = (
-                wep_phys
-            ) = wep_magic = wep_fire = wep_ltng = wep_holy = "-"
-            wep_atk_attr = wep_atk_attr2 = "-"
-            status_by_weapon: List[str] = []
-
-            if unique_weapon:
-                weapon_source = "unique"
-                weapon_list = (
-                    parse_unique_weapon_variants(unique_weapon)
-                    or [unique_weapon]
-                )
-                disable_values: List[str] = []
-                phys_values: List[str] = []
-                magic_values: List[str] = []
-                fire_values: List[str] = []
-                ltng_values: List[str] = []
-                holy_values: List[str] = []
-                status_values: List[str] = []
-                atk_attr_values: List[str] = []
-                atk_attr2_values: List[str] = []
-
-                for weapon_name in weapon_list:
-                    poise_val = poise_lookup.get(weapon_name.lower())
-                    if poise_val is None:
-                        for candidate in expand_weapon_names(weapon_name):
-                            poise_val = poise_lookup.get(candidate.lower())
-                            if poise_val is not None:
-                                break
-                    if poise_val is None:
-                        for candidate in expand_weapon_names(weapon_name):
-                            fallback = category_poise.get(candidate)
-                            if fallback is not None:
-                                poise_val = str(fallback)
-                                warnings["unique_poise_from_category"].append(
-                                    weapon_name
-                                )
-                                break
-                    if poise_val is None:
-                        warnings["missing_poise"].append(weapon_name)
-                        poise_list.append(None)
-                    else:
-                        poise_list.append(poise_val)
-
-                    stats = weapon_base_stats.get(weapon_name.lower())
-                    if not stats:
-                        status_by_weapon.append("-")
-                        continue
-                    disable_flag = stats.get("disable_gem_attr", "-")
-                    atk_attr_values.append(stats.get("atk_attribute", "-"))
-                    atk_attr2_values.append(stats.get("atk_attribute_2", "-"))
-                    disable_values.append(disable_flag)
-                    phys_values.append(stats.get("phys", "-"))
-                    magic_values.append(stats.get("magic", "-"))
-                    fire_values.append(stats.get("fire", "-"))
-                    ltng_values.append(stats.get("ltng", "-"))
-                    holy_values.append(stats.get("holy", "-"))
-                    effects = stats.get("status_effects", [])
-                    per_weapon_effects: List[str] = []
-                    for effect in effects:
-                        if effect not in status_values:
-                            status_values.append(effect)
-                        if effect not in per_weapon_effects:
-                            per_weapon_effects.append(effect)
-                    if str(disable_flag).strip() == "1":
-                        if per_weapon_effects:
-                            status_by_weapon.append(" | ".join(per_weapon_effects))
-                        else:
-                            status_by_weapon.append("None")
-                    else:
-                        status_by_weapon.append("-")
+            disable_values: List[str] = []
+            phys_values: List[str] = []
+            magic_values: List[str] = []
+            fire_values: List[str] = []
+            ltng_values: List[str] = []
+            holy_values: List[str] = []
+            status_values: List[str] = []
+            atk_attr_values: List[str] = []
+            atk_attr2_values: List[str] = []
+
+            for weapon_name in weapon_list:
+                poise_val = poise_lookup.get(weapon_name.lower())
+                if poise_val is None:
+                    for candidate in expand_weapon_names(weapon_name):
+                        poise_val = poise_lookup.get(candidate.lower())
+                        if poise_val is not None:
+                            break
+                if poise_val is None:
+                    for candidate in expand_weapon_names(weapon_name):
+                        fallback = category_poise.get(candidate)
+                        if fallback is not None:
+                            poise_val = str(fallback)
+                            warnings["unique_poise_from_category"].append(
+                                weapon_name
+                            )
+                            break
+                if poise_val is None:
+                    warnings["missing_poise"].append(weapon_name)
+                    poise_list.append(None)
+                else:
+                    poise_list.append(poise_val)
 
-                if disable_values:
-                    if len(set(disable_values)) == 1:
-                        wep_disable_attr = disable_values[0]
-                    else:
-                        wep_disable_attr = " | ".join(disable_values)
-                        warnings["mixed_disable_attr"].append(unique_weapon)
-                if atk_attr_values:
-                    if len(set(atk_attr_values)) == 1:
-                        wep_atk_attr = atk_attr_values[0]
-                    else:
-                        wep_atk_attr = " | ".join(atk_attr_values)
-                if atk_attr2_values:
-                    if len(set(atk_attr2_values)) == 1:
-                        wep_atk_attr2 = atk_attr2_values[0]
+                stats = weapon_base_stats.get(weapon_name.lower())
+                if not stats:
+                    status_by_weapon.append("-")
+                    continue
+                disable_flag = stats.get("disable_gem_attr", "-")
+                atk_attr_values.append(stats.get("atk_attribute", "-"))
+                atk_attr2_values.append(stats.get("atk_attribute_2", "-"))
+                disable_values.append(disable_flag)
+                phys_values.append(stats.get("phys", "-"))
+                magic_values.append(stats.get("magic", "-"))
+                fire_values.append(stats.get("fire", "-"))
+                ltng_values.append(stats.get("ltng", "-"))
+                holy_values.append(stats.get("holy", "-"))
+                effects = stats.get("status_effects", [])
+                per_weapon_effects: List[str] = []
+                for effect in effects:
+                    if effect not in status_values:
+                        status_values.append(effect)
+                    if effect not in per_weapon_effects:
+                        per_weapon_effects.append(effect)
+                if str(disable_flag).strip() == "1":
+                    if per_weapon_effects:
+                        status_by_weapon.append(" | ".join(per_weapon_effects))
                     else:
-                        wep_atk_attr2 = " | ".join(atk_attr2_values)
-                wep_phys = avg_stat(phys_values)
-                wep_magic = avg_stat(magic_values)
-                wep_fire = avg_stat(fire_values)
-                wep_ltng = avg_stat(ltng_values)
-                wep_holy = avg_stat(holy_values)
-            elif prefix:
-                weapon_source = "prefix"
-                weapon_list = [prefix]
-                poise_val = category_poise.get(prefix)
-                if poise_val is None:
-                    warnings["missing_prefix_poise"].append(prefix)
-                    poise_list = [None]
+                        status_by_weapon.append("None")
                 else:
-                    poise_list = [str(poise_val)]
-            else:
-                categories = mount_map.get(canonical, [])
-                if categories:
-                    weapon_source = "category"
-                    weapon_list = categories
-                    for cat in categories:
-                        poise_val = category_poise.get(cat)
-                        if poise_val is None:
-                            warnings["missing_category_poise"].append(cat)
-                            poise_list.append(None)
-                        else:
-                            poise_list.append(str(poise_val))
+                    status_by_weapon.append("-")
+
+            if disable_values:
+                if len(set(disable_values)) == 1:
+                    wep_disable_attr = disable_values[0]
+                else:
+                    wep_disable_attr = " | ".join(disable_values)
+                    warnings["mixed_disable_attr"].append(unique_weapon)
+            if atk_attr_values:
+                if len(set(atk_attr_values)) == 1:
+                    wep_atk_attr = atk_attr_values[0]
+                else:
+                    wep_atk_attr = " | ".join(atk_attr_values)
+            if atk_attr2_values:
+                if len(set(atk_attr2_values)) == 1:
+                    wep_atk_attr2 = atk_attr2_values[0]
                 else:
-                    warnings["missing_mounts"].append(skill)
+                    wep_atk_attr2 = " | ".join(atk_attr2_values)
+            wep_phys = avg_stat(phys_values)
+            wep_magic = avg_stat(magic_values)
+            wep_fire = avg_stat(fire_values)
+            wep_ltng = avg_stat(ltng_values)
+            wep_holy = avg_stat(holy_values)
+        elif prefix:
+            weapon_source = "prefix"
+            weapon_list = [prefix]
+            poise_val = category_poise.get(prefix)
+            if poise_val is None:
+                warnings["missing_prefix_poise"].append(prefix)
+                poise_list = [None]
+            else:
+                poise_list = [str(poise_val)]
+        else:
+            categories = mount_map.get(canonical, [])
+            if categories:
+                weapon_source = "category"
+                weapon_list = categories
+                for cat in categories:
+                    poise_val = category_poise.get(cat)
+                    if poise_val is None:
+                        warnings["missing_category_poise"].append(cat)
+                        poise_list.append(None)
+                    else:
+                        poise_list.append(str(poise_val))
+            else:
+                warnings["missing_mounts"].append(skill)
 
-            if not weapon_list:
-                weapon_source = "missing"
-                weapon_list = ["Unmapped"]
-                poise_list = ["-"]
+        if not weapon_list:
+            weapon_source = "missing"
+            weapon_list = ["Unmapped"]
+            poise_list = ["-"]
 
-            weapon_field = " | ".join(weapon_list).strip()
-            poise_field = (
-                align_join(poise_list, len(weapon_list)) if weapon_list else ""
-            )
-            wep_status_field = "-"
-            if weapon_source == "unique" and status_by_weapon:
-                if all(val == "None" for val in status_by_weapon):
-                    wep_status_field = "None"
-                elif all(val == "-" for val in status_by_weapon):
-                    wep_status_field = "-"
-                elif len(status_by_weapon) == 1:
-                    wep_status_field = status_by_weapon[0]
-                else:
-                    wep_status_field = " | ".join(status_by_weapon)
-
-            out = OrderedDict()
-            out["Name"] = raw_name
-            out["Skill"] = skill
-            out["Part"] = part
-            out["Follow-up"] = follow_up
-            out["Hand"] = hand
-            out["FP"] = fp_flag
-            out["Charged"] = charged
-            out["Step"] = step
-            out["Bullet"] = bullet_flag
-            out["Tick"] = tick_flag
-            out["Weapon Source"] = weapon_source
-            out["Weapon"] = weapon_field
-            out["Weapon Poise"] = poise_field
-            out["Disable Gem Attr"] = wep_disable_attr
-            out["atkAttribute"] = wep_atk_attr
-            out["atkAttribute2"] = wep_atk_attr2
-            out["Wep Phys"] = wep_phys
-            out["Wep Magic"] = wep_magic
-            out["Wep Fire"] = wep_fire
-            out["Wep Ltng"] = wep_ltng
-            out["Wep Holy"] = wep_holy
-            out["Phys MV"] = row.get("Phys MV", "")
-            out["Magic MV"] = row.get("Magic MV", "")
-            out["Fire MV"] = row.get("Fire MV", "")
-            out["Ltng MV"] = row.get("Ltng MV", "")
-            out["Holy MV"] = row.get("Holy MV", "")
-            out["Status MV"] = row.get("Status MV", "")
-            out["Wep Status"] = wep_status_field
-            out["Weapon Buff MV"] = row.get("Weapon Buff MV", "")
-            out["Poise Dmg MV"] = row.get("Poise Dmg MV", "")
-            out["PhysAtkAttribute"] = row.get("PhysAtkAttribute", "")
-            out["AtkPhys"] = row.get("AtkPhys", "")
-            out["AtkMag"] = row.get("AtkMag", "")
-            out["AtkFire"] = row.get("AtkFire", "")
-            out["AtkLtng"] = row.get("AtkLtng", "")
-            out["AtkHoly"] = row.get("AtkHoly", "")
-            out["AtkSuperArmor"] = row.get("AtkSuperArmor", "")
-            out["isAddBaseAtk"] = row.get("isAddBaseAtk", "")
-            out["Overwrite Scaling"] = row.get("Overwrite Scaling", "")
-            out["Skill Attr"] = skill_attr_stat
-            out["subCategory1"] = row.get("subCategory1", "")
-            out["subCategory2"] = row.get("subCategory2", "")
-            out["subCategory3"] = row.get("subCategory3", "")
-            out["subCategory4"] = row.get("subCategory4", "")
-            rows.append(out)
+        weapon_field = " | ".join(weapon_list).strip()
+        poise_field = (
+            align_join(poise_list, len(weapon_list)) if weapon_list else ""
+        )
+        wep_status_field = "-"
+        if weapon_source == "unique" and status_by_weapon:
+            if all(val == "None" for val in status_by_weapon):
+                wep_status_field = "None"
+            elif all(val == "-" for val in status_by_weapon):
+                wep_status_field = "-"
+            elif len(status_by_weapon) == 1:
+                wep_status_field = status_by_weapon[0]
+            else:
+                wep_status_field = " | ".join(status_by_weapon)
+
+        out = OrderedDict()
+        out["Name"] = raw_name
+        out["Skill"] = skill
+        out["Part"] = part
+        out["Follow-up"] = follow_up
+        out["Hand"] = hand
+        out["FP"] = fp_flag
+        out["Charged"] = charged
+        out["Step"] = step
+        out["Bullet"] = bullet_flag
+        out["Tick"] = tick_flag
+        out["Weapon Source"] = weapon_source
+        out["Weapon"] = weapon_field
+        out["Weapon Poise"] = poise_field
+        out["Disable Gem Attr"] = wep_disable_attr
+        out["atkAttribute"] = wep_atk_attr
+        out["atkAttribute2"] = wep_atk_attr2
+        out["Wep Phys"] = wep_phys
+        out["Wep Magic"] = wep_magic
+        out["Wep Fire"] = wep_fire
+        out["Wep Ltng"] = wep_ltng
+        out["Wep Holy"] = wep_holy
+        out["Phys MV"] = row.get("Phys MV", "")
+        out["Magic MV"] = row.get("Magic MV", "")
+        out["Fire MV"] = row.get("Fire MV", "")
+        out["Ltng MV"] = row.get("Ltng MV", "")
+        out["Holy MV"] = row.get("Holy MV", "")
+        out["Status MV"] = row.get("Status MV", "")
+        out["Wep Status"] = wep_status_field
+        out["Weapon Buff MV"] = row.get("Weapon Buff MV", "")
+        out["Poise Dmg MV"] = row.get("Poise Dmg MV", "")
+        out["PhysAtkAttribute"] = row.get("PhysAtkAttribute", "")
+        out["AtkPhys"] = row.get("AtkPhys", "")
+        out["AtkMag"] = row.get("AtkMag", "")
+        out["AtkFire"] = row.get("AtkFire", "")
+        out["AtkLtng"] = row.get("AtkLtng", "")
+        out["AtkHoly"] = row.get("AtkHoly", "")
+        out["AtkSuperArmor"] = row.get("AtkSuperArmor", "")
+        out["isAddBaseAtk"] = row.get("isAddBaseAtk", "")
+        out["Overwrite Scaling"] = row.get("Overwrite Scaling", "")
+        out["Skill Attr"] = skill_attr_stat
+        out["subCategory1"] = row.get("subCategory1", "")
+        out["subCategory2"] = row.get("subCategory2", "")
+        out["subCategory3"] = row.get("subCategory3", "")
+        out["subCategory4"] = row.get("subCategory4", "")
+        rows.append(out)
     return rows, warnings
 
 
@@ -719,6 +793,36 @@ def write_csv(rows: List[OrderedDict], output_path: Path) -> None:
             writer.writerow(row)
 
 
+def build_all_rows(
+    skill_names: Optional[List[str]] = None,
+) -> Tuple[List[OrderedDict], Dict[str, List[str]]]:
+    """Load every stage 1 input and build the AoW-data-1 rows."""
+    if skill_names is None:
+        skill_names = load_skill_names()
+    skill_matcher = SkillNameMatcher(skill_names)
+    flag_to_info, category_poise = load_category_flags()
+    skill_attr_scaling = load_skill_attr_scaling()
+    mount_map, skill_attr_map = build_gem_mount_map(flag_to_info, skill_matcher)
+    poise_lookup = load_poise_lookup()
+    sp_effect_names = load_sp_effect_names()
+    weapon_base_stats = load_weapon_base_stats(sp_effect_names)
+    return build_rows(
+        mount_map,
+        category_poise,
+        poise_lookup,
+        skill_matcher,
+        weapon_base_stats,
+        skill_attr_map,
+        skill_attr_scaling,
+    )
+
+
+def print_warnings(warnings: Dict[str, List[str]]) -> None:
+    for kind, items in warnings.items():
+        uniq = sorted(set(items))
+        print(f"Warning: {kind} ({len(uniq)}) -> {', '.join(uniq)}")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Build AoW-data-1.csv from source CSVs."
@@ -729,26 +833,30 @@ def main() -> None:
         default=DEFAULT_OUTPUT,
         help="Path to write AoW-data-1.csv (default: docs/AoW-data-1.csv)",
     )
+    add_manifest_arguments(parser)
     args = parser.parse_args()
+    stage = StageManifest(
+        "stage1",
+        args,
+        inputs=[
+            SKILL_LIST_TXT,
+            ATTACK_DATA_CSV,
+            POISE_MV_CSV,
+            *param_inputs(EQUIP_PARAM_GEM_CSV),
+            *param_inputs(EQUIP_PARAM_WEAPON_CSV),
+            *param_inputs(SP_EFFECT_PARAM_CSV),
+            CATEGORY_POISE_JSON,
+            SKILL_ATTR_SCALING_JSON,
+        ],
+        outputs=[args.output],
+    )
+    if stage.up_to_date():
+        return
 
-    skill_names = load_skill_names()
-    flag_to_info, category_poise = load_category_flags()
-    skill_attr_scaling = load_skill_attr_scaling()
-    mount_map, skill_attr_map = build_gem_mount_map(flag_to_info, skill_names)
-    poise_lookup = load_poise_lookup()
-    sp_effect_names = load_sp_effect_names()
-    weapon_base_stats = load_weapon_base_stats(sp_effect_names)
+    rows, warnings = build_all_rows()
     before_rows = load_rows_by_key(args.output, ["Name"])
-    rows, warnings = build_rows(
-        mount_map,
-        category_poise,
-        poise_lookup,
-        skill_names,
-        weapon_base_stats,
-        skill_attr_map,
-        skill_attr_scaling,
-    )
     write_csv(rows, args.output)
+    stage.record()
 
     path_text = format_path_for_console(args.output, ROOT)
     print(f"Wrote {len(rows)} rows to {path_text}")
@@ -759,10 +867,7 @@ def main() -> None:
         key_fields=["Name"],
         align_columns=True,
     )
-    if warnings:
-        for kind, items in warnings.items():
-            uniq = sorted(set(items))
-            print(f"Warning: {kind} ({len(uniq)}) -> {', '.join(uniq)}")
+    print_warnings(warnings)
 
 
 if __name__ == "__main__":
@@ -20,6 +20,7 @@ from helpers.force_collapse import (  # noqa: E402
     load_force_collapse_map,
 )
 from helpers.output import format_path_for_console  # noqa: E402
+from helpers.stage_manifest import StageManifest, add_manifest_arguments  # noqa: E402
 INPUT_DEFAULT = ROOT / "work/aow_pipeline/AoW-data-1.csv"
 OUTPUT_DEFAULT = ROOT / "work/aow_pipeline/AoW-data-2.csv"
 FORCE_COLLAPSE_DEFAULT = ROOT / "work/aow_pipeline/force_collapse_pairs.json"
@@ -42,6 +43,10 @@ GROUP_KEYS = [
 ]
 
 DROP_COLUMNS = {"Name", "Tick", "AtkId"}
+# Optional row position set by run_pipeline.py --incremental, so partitions
+# collapsed separately can be put back in full-run order: copies follow every
+# input row, and a collapsed row keeps the position of its group's first row.
+ORDER_FIELD = "_order"
 STANCE_SUPERARMOR_COL = "AtkSuperArmor"
 RENAME_MAP = {
     "Weapon Poise": "Wep Poise Range",
@@ -197,6 +202,8 @@ def apply_row_copies(
                             )
                             unknown_warned.add(warn_key)
                     new_row[col] = str(val)
+                if ORDER_FIELD in base_row:
+                    new_row[ORDER_FIELD] = len(rows) + len(added)
                 added.append(new_row)
                 added_count += 1
         notes.append(f"{name}: added {added_count} copied row(s)")
@@ -485,6 +492,8 @@ def collapse_rows(
             grouped[key]["_stance_super"] = parse_super(
                 working_row.get(STANCE_SUPERARMOR_COL, "")
             )
+            if ORDER_FIELD in working_row:
+                grouped[key][ORDER_FIELD] = working_row[ORDER_FIELD]
             # Normalize numeric seeds to floats when possible.
             for col in numeric_columns:
                 num = parse_float(grouped[key].get(col, ""))
@@ -709,6 +718,8 @@ def collapse_rows(
                 base_row[col] = stance_dmg
             else:
                 base_row[col] = val
+        if ORDER_FIELD in agg:
+            base_row[ORDER_FIELD] = agg[ORDER_FIELD]
         pending_rows.append((base_row, entries))
 
     # Ensure we always emit at least one Dmg Type/MV column.
@@ -746,6 +757,8 @@ def collapse_rows(
                 out_row[col] = fmt_number(val)
             else:
                 out_row[col] = val
+        if ORDER_FIELD in base_row:
+            out_row[ORDER_FIELD] = base_row[ORDER_FIELD]
         output_rows.append(out_row)
 
     return output_rows, final_output_columns, warnings, sorted(forced_seen)
@@ -759,6 +772,64 @@ def read_rows(path: Path) -> Tuple[List[Dict[str, str]], List[str]]:
     return rows, fieldnames
 
 
+def transform_rows(
+    rows: List[Dict[str, str]],
+    fieldnames: List[str],
+    force_collapse_path: Path = FORCE_COLLAPSE_DEFAULT,
+    value_blacklist_path: Path = VALUE_BLACKLIST_DEFAULT,
+    copy_rows_path: Path = COPY_ROWS_DEFAULT,
+) -> Tuple[List[Dict[str, str]], List[str], List[str], List[str], List[str]]:
+    """
+    Apply row copies and the stage 2 value blacklist, then collapse. Returns
+    output rows, output columns, copy notes, warnings and forced groups.
+    """
+    copy_rows = load_copy_rows(copy_rows_path)
+    value_blacklist = load_value_blacklist(value_blacklist_path)
+    force_groups, force_overrides, force_primary = load_force_collapse_map(
+        force_collapse_path
+    )
+    return transform_with_rules(
+        rows,
+        fieldnames,
+        copy_rows=copy_rows,
+        value_blacklist=value_blacklist,
+        force_groups=force_groups,
+        force_overrides=force_overrides,
+        force_primary=force_primary,
+    )
+
+
+def transform_with_rules(
+    rows: List[Dict[str, str]],
+    fieldnames: List[str],
+    *,
+    copy_rows: List[Dict[str, Any]],
+    value_blacklist: Mapping[str, Mapping[str, List[str]]],
+    force_groups: Mapping[str, str],
+    force_overrides: Mapping[str, Dict[str, str]],
+    force_primary: Mapping[str, str],
+) -> Tuple[List[Dict[str, str]], List[str], List[str], List[str], List[str]]:
+    """`transform_rows` with the copy/blacklist/force-collapse rules already loaded."""
+    rows, copy_notes, copy_warnings = apply_row_copies(
+        rows, fieldnames, copy_rows
+    )
+    apply_value_blacklist(rows, value_blacklist, stage_key="2")
+    output_rows, output_columns, warnings, forced_groups = collapse_rows(
+        rows,
+        fieldnames,
+        force_groups=force_groups,
+        force_overrides=force_overrides,
+        force_primary=force_primary,
+    )
+    return (
+        output_rows,
+        output_columns,
+        copy_notes,
+        copy_warnings + warnings,
+        forced_groups,
+    )
+
+
 def write_csv(
     rows: List[Dict[str, str]], fieldnames: List[str], output_path: Path
 ) -> None:
@@ -804,28 +875,28 @@ def main() -> None:
         default=COPY_ROWS_DEFAULT,
         help="Path to copy_rows.json",
     )
+    add_manifest_arguments(parser)
     args = parser.parse_args()
-
-    copy_rows = load_copy_rows(args.copy_rows)
-    value_blacklist = load_value_blacklist(args.value_blacklist)
-    force_groups, force_overrides, force_primary = load_force_collapse_map(
-        args.force_collapse
+    stage = StageManifest(
+        "stage2",
+        args,
+        inputs=[args.input, args.force_collapse, args.value_blacklist, args.copy_rows],
+        outputs=[args.output],
     )
+    if stage.up_to_date():
+        return
+
     before_rows = load_rows_by_key(args.output, GROUP_KEYS)
     rows, fieldnames = read_rows(args.input)
-    rows, copy_notes, copy_warnings = apply_row_copies(
-        rows, fieldnames, copy_rows
-    )
-    apply_value_blacklist(rows, value_blacklist, stage_key="2")
-    output_rows, output_columns, warnings, forced_groups = collapse_rows(
+    output_rows, output_columns, copy_notes, warnings, forced_groups = transform_rows(
         rows,
         fieldnames,
-        force_groups=force_groups,
-        force_overrides=force_overrides,
-        force_primary=force_primary,
+        force_collapse_path=args.force_collapse,
+        value_blacklist_path=args.value_blacklist,
+        copy_rows_path=args.copy_rows,
     )
-    warnings = copy_warnings + warnings
     write_csv(output_rows, output_columns, args.output)
+    stage.record()
 
     path_text = format_path_for_console(args.output, ROOT)
     print(f"Wrote {len(output_rows)} rows to {path_text}")
@@ -836,6 +907,12 @@ def main() -> None:
         key_fields=GROUP_KEYS,
         align_columns=True,
     )
+    print_notes(copy_notes, forced_groups, warnings)
+
+
+def print_notes(
+    copy_notes: List[str], forced_groups: List[str], warnings: List[str]
+) -> None:
     if copy_notes:
         print(f"Copied rows ({len(copy_notes)}):")
         for note in copy_notes:
@@ -2,6 +2,7 @@ import argparse
 import csv
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple, NamedTuple
 
@@ -15,7 +16,16 @@ from helpers.diff import (  # noqa: E402
     load_rows_by_key,
     report_row_deltas,
 )
+from helpers.numeric_text import (  # noqa: E402
+    fmt_number,
+    format_range,
+    shape_with_ranges,
+    split_numbers,
+    split_ranges,
+    zeros_only,
+)
 from helpers.output import format_path_for_console  # noqa: E402
+from helpers.stage_manifest import StageManifest, add_manifest_arguments  # noqa: E402
 
 INPUT_DEFAULT = ROOT / "work/aow_pipeline/AoW-data-2.csv"
 OUTPUT_DEFAULT = ROOT / "work/aow_pipeline/AoW-data-3.csv"
@@ -39,7 +49,7 @@ DROP_COLUMNS = {
     "Wep Holy",
 }
 
-AGG_COLS_BASE = [
+AGG_COLS_BASE = (
     "Status MV",
     "Weapon Buff MV",
     "Stance Dmg",
@@ -48,11 +58,13 @@ AGG_COLS_BASE = [
     "AtkFire",
     "AtkLtng",
     "AtkHoly",
-]
-AGG_COLS = list(AGG_COLS_BASE)
-SUPPORTING_COLS = list(AGG_COLS_BASE)
-SUPPORT_SUM_COLS = list(AGG_COLS_BASE)
+)
+SUPPORTING_COLS = AGG_COLS_BASE
+SUPPORT_SUM_COLS = AGG_COLS_BASE
 SLOT_KEY_FIELD = "_slot_keys"
+# Input position of the row (or first row of the cluster) a row came from, so
+# shards collapsed in parallel can be put back in serial order.
+ORDER_FIELD = "_order"
 
 
 def dtype_key_values(row: Dict[str, str], dtype_cols: List[str]) -> Tuple[str, ...]:
@@ -105,13 +117,6 @@ def unique_join(values: List[str], sep: str = " | ") -> str:
     return sep.join(ordered)
 
 
-def zeros_only(text: str) -> bool:
-    nums = re.findall(r"-?\d+(?:\.\d+)?", text or "")
-    if not nums:
-        return False
-    return all(float(n) == 0 for n in nums)
-
-
 def normalize_wep_status(value: str) -> str:
     text = (value or "").strip()
     return text if text else "-"
@@ -126,39 +131,20 @@ def status_merge_key(value: str) -> str:
     return "None" if normalized == "None" else "__ANY_STATUS__"
 
 
-def rebuild_from_tokens(tokens: List[tuple[str, str]], numbers: List[str]) -> str:
-    rebuilt: List[str] = []
-    num_idx = 0
-    for kind, val in tokens:
-        if kind == "num":
-            if num_idx < len(numbers):
-                rebuilt.append(numbers[num_idx])
-            num_idx += 1
-        else:
-            rebuilt.append(val)
-    return "".join(rebuilt)
-
-
 def merge_supporting_column(base_val: str, donor_val: str) -> Tuple[str, str]:
     """
     Transfer non-zero numeric tokens from donor_val into base_val when both
     share the same numeric arrangement. Tokens pulled into the base are set
     to zero in the donor; donor is then collapsed to "-" when it is all zeros.
     """
-    base_tokens = tokenize_with_ranges(base_val or "")
-    donor_tokens = tokenize_with_ranges(donor_val or "")
-    base_nums = [val for kind, val in base_tokens if kind == "num"]
-    donor_nums = [val for kind, val in donor_tokens if kind == "num"]
-    if len(base_nums) != len(donor_nums):
-        return base_val, donor_val
-    if shape_with_ranges(base_val or "")[0] != shape_with_ranges(donor_val or "")[0]:
+    base = split_ranges(base_val or "")
+    donor = split_ranges(donor_val or "")
+    if base.count != donor.count or base.shape != donor.shape:
         return base_val, donor_val
 
     new_base_nums: List[str] = []
     new_donor_nums: List[str] = []
-    for b, d in zip(base_nums, donor_nums):
-        b_range = parse_range_value(b)
-        d_range = parse_range_value(d)
+    for b, d, b_range, d_range in zip(base.numbers, donor.numbers, base.ranges, donor.ranges):
         b_zero = b_range == (0.0, 0.0)
         d_zero = d_range == (0.0, 0.0)
         if b_zero and not d_zero:
@@ -168,20 +154,13 @@ def merge_supporting_column(base_val: str, donor_val: str) -> Tuple[str, str]:
             new_base_nums.append(b)
             new_donor_nums.append(d)
 
-    new_base = rebuild_from_tokens(base_tokens, new_base_nums)
-    new_donor = rebuild_from_tokens(donor_tokens, new_donor_nums)
+    new_base = base.render(new_base_nums)
+    new_donor = donor.render(new_donor_nums)
     if zeros_only(new_donor):
         new_donor = "-"
     return new_base, new_donor
 
 
-def fmt_number(value: float) -> str:
-    if value.is_integer():
-        return str(int(value))
-    text = f"{value:.3f}".rstrip("0").rstrip(".")
-    return text
-
-
 def normalize_overwrite(value: str) -> str:
     text = (value or "").strip()
     if text in {"", "-", "null"}:
@@ -189,80 +168,6 @@ def normalize_overwrite(value: str) -> str:
     return text
 
 
-def tokenize_numeric(text: str) -> List[tuple[str, str]]:
-    parts = re.split(r"(-?\d+(?:\.\d+)?)", text or "")
-    tokens: List[tuple[str, str]] = []
-    for idx, part in enumerate(parts):
-        if part == "":
-            continue
-        tokens.append(("num" if idx % 2 == 1 else "sep", part))
-    return tokens
-
-
-RANGE_TOKEN = re.compile(r"-?\d+(?:\.\d+)?(?:-?\d+(?:\.\d+)?)?")
-
-
-def parse_range_value(value: str) -> Tuple[float, float]:
-    text = (value or "").strip()
-    m = re.fullmatch(r"(-?\d+(?:\.\d+)?)(?:-(-?\d+(?:\.\d+)?))?", text)
-    if m:
-        first = float(m.group(1))
-        second = float(m.group(2)) if m.group(2) is not None else first
-        return (first, second) if first <= second else (second, first)
-    nums = [float(n) for n in re.findall(r"-?\d+(?:\.\d+)?", text)]
-    if not nums:
-        return 0.0, 0.0
-    return (min(nums), max(nums))
-
-
-def tokenize_with_ranges(text: str) -> List[tuple[str, str]]:
-    """
-    Tokenize a string, treating number ranges (e.g., 6-18) as a single token
-    so we can compare shapes even when some weapons render ranges and others
-    render single values.
-    """
-    tokens: List[tuple[str, str]] = []
-    cursor = 0
-    src = text or ""
-    for match in RANGE_TOKEN.finditer(src):
-        start, end = match.span()
-        if start > cursor:
-            tokens.append(("sep", src[cursor:start]))
-        tokens.append(("num", match.group(0)))
-        cursor = end
-    if cursor < len(src):
-        tokens.append(("sep", src[cursor:]))
-    if not tokens:
-        tokens.append(("sep", ""))
-    return tokens
-
-
-def shape_with_ranges(text: str) -> Tuple[tuple[str, ...], int]:
-    tokens = tokenize_with_ranges(text)
-    pattern: List[str] = []
-    count = 0
-    for kind, val in tokens:
-        if kind == "num":
-            pattern.append("{n}")
-            count += 1
-        else:
-            pattern.append(val)
-    return tuple(pattern), count
-
-
-def shape(text: str) -> Tuple[tuple[str, ...], int]:
-    tokens = tokenize_numeric(text)
-    pattern: List[str] = []
-    count = 0
-    for kind, val in tokens:
-        if kind == "num":
-            pattern.append("{n}")
-            count += 1
-        else:
-            pattern.append(val)
-    return tuple(pattern), count
-
-
 def sum_numeric_strings(current: str, incoming: str) -> str:
     """
     Sum numeric tokens when two values occupy the same FP/Charged/Step slot.
@@ -278,22 +183,13 @@ def sum_numeric_strings(current: str, incoming: str) -> str:
     if cur == "-":
         return inc
 
-    cur_tokens = tokenize_numeric(cur)
-    inc_tokens = tokenize_numeric(inc)
-    cur_nums = [float(val) for kind, val in cur_tokens if kind == "num"]
-    inc_nums = [float(val) for kind, val in inc_tokens if kind == "num"]
-
-    if cur_nums and len(cur_nums) == len(inc_nums):
-        summed = [fmt_number(a + b) for a, b in zip(cur_nums, inc_nums)]
-        rebuilt: List[str] = []
-        idx = 0
-        for kind, val in cur_tokens:
-            if kind == "num":
-                rebuilt.append(summed[idx])
-                idx += 1
-            else:
-                rebuilt.append(val)
-        return "".join(rebuilt)
+    cur_parsed = split_numbers(cur)
+    inc_parsed = split_numbers(inc)
+
+    if cur_parsed.count and cur_parsed.count == inc_parsed.count:
+        return cur_parsed.render(
+            [fmt_number(a + b) for (a, _), (b, _) in zip(cur_parsed.ranges, inc_parsed.ranges)]
+        )
 
     try:
         return fmt_number(float(cur) + float(inc))
@@ -306,13 +202,10 @@ def zero_like_shape(value: str) -> str:
     Build a zero-valued string with the same numeric token layout as the input,
     preserving separators so later sums can succeed.
     """
-    tokens = tokenize_numeric(value or "")
-    if not tokens:
+    parsed = split_numbers(value or "")
+    if not parsed.tokens:
         return "0"
-    rebuilt: List[str] = []
-    for kind, val in tokens:
-        rebuilt.append("0" if kind == "num" else val)
-    return "".join(rebuilt)
+    return parsed.render(["0"] * parsed.count)
 
 
 def sum_support_values(current: str, incoming: str) -> str:
@@ -434,13 +327,6 @@ def build_step_layout(rows: List[Dict[str, str]]) -> StepLayout:
     )
 
 
-def fmt_number(value: float) -> str:
-    if value.is_integer():
-        return str(int(value))
-    text = f"{value:.3f}".rstrip("0").rstrip(".")
-    return text
-
-
 def collapse_weapons(
     rows: List[Dict[str, str]],
     agg_cols: List[str],
@@ -467,9 +353,9 @@ def collapse_weapons(
     def row_signature(row: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
         sig_items: List[Tuple[str, str]] = []
         for k, v in row.items():
-            if k in AGG_COLS or k in {"Weapon", "Weapon Source", "Wep Status"}:
+            if k in agg_cols or k in {"Weapon", "Weapon Source", "Wep Status"}:
                 continue
-            if k == SLOT_KEY_FIELD:
+            if k == SLOT_KEY_FIELD or k == ORDER_FIELD:
                 continue
             if k == "subCategorySum":
                 v = normalize_subcat(v, row.get("Hand", ""))
@@ -514,7 +400,9 @@ def collapse_weapons(
         clusters.setdefault(key, []).append(row)
 
     merged: List[Dict[str, str]] = []
+    bucket_starts: List[Tuple[int, object]] = []
     for key, bucket in clusters.items():
+        bucket_starts.append((len(merged), bucket[0].get(ORDER_FIELD)))
         # Build weapon -> set of shapes to ensure symmetry.
         rows_by_shape_weapon: Dict[Tuple[str, ...], Dict[str, List[Dict[str, str]]]] = {}
         sources_by_weapon: Dict[str, List[str]] = {}
@@ -657,16 +545,12 @@ def collapse_weapons(
             out["Skill Attr"] = base_row.get("Skill Attr", out.get("Skill Attr", ""))
 
             # Merge numeric ranges using token shape of base.
-            token_cache = {col: tokenize_with_ranges(out.get(col, "") or "") for col in agg_cols}
             for col in agg_cols:
-                tokens = token_cache[col]
-                num_positions = [i for i, (k, _) in enumerate(tokens) if k == "num"]
-                all_nums_by_pos: List[List[Tuple[float, float]]] = [[] for _ in num_positions]
+                base = split_ranges(out.get(col, "") or "")
+                all_nums_by_pos: List[List[Tuple[float, float]]] = [[] for _ in range(base.count)]
                 for w_rows in weapon_rows.values():
-                    row = w_rows[0]
-                    row_tokens = tokenize_with_ranges(row.get(col, "") or "")
-                    row_ranges = [parse_range_value(val) for kind, val in row_tokens if kind == "num"]
-                    if len(row_ranges) != len(num_positions):
+                    row_ranges = split_ranges(w_rows[0].get(col, "") or "").ranges
+                    if len(row_ranges) != base.count:
                         continue
                     for idx, val in enumerate(row_ranges):
                         all_nums_by_pos[idx].append(val)
@@ -674,17 +558,8 @@ def collapse_weapons(
                 for vals in all_nums_by_pos:
                     lows = [v[0] for v in vals]
                     highs = [v[1] for v in vals]
-                    mn, mx = min(lows), max(highs)
-                    ranges.append(fmt_number(mn) if mn == mx else f"{fmt_number(mn)}-{fmt_number(mx)}")
-                rebuilt: List[str] = []
-                r_idx = 0
-                for kind, val in tokens:
-                    if kind == "num":
-                        rebuilt.append(ranges[r_idx])
-                        r_idx += 1
-                    else:
-                        rebuilt.append(val)
-                out[col] = "".join(rebuilt)
+                    ranges.append(format_range(min(lows), max(highs)))
+                out[col] = base.render(ranges)
 
             for col in agg_cols:
                 if zeros_only(out.get(col, "")):
@@ -692,6 +567,14 @@ def collapse_weapons(
 
             merged.append(out)
 
+    # Every row emitted for a cluster sorts with the cluster's first row.
+    bounds = [start for start, _ in bucket_starts[1:]] + [len(merged)]
+    for (start, order), end in zip(bucket_starts, bounds):
+        if order is None:
+            continue
+        for row in merged[start:end]:
+            row[ORDER_FIELD] = order
+
     return merged
 
 
@@ -816,10 +699,8 @@ def collapse_rows(
     rows: List[Dict[str, str]],
     layout_map: Dict[Tuple[str, str, str], StepLayout],
     dmg_pairs: List[Tuple[str, str]],
+    agg_cols: List[str],
 ) -> Tuple[List[Dict[str, str]], List[str]]:
-    agg_cols = list(AGG_COLS_BASE) + [mv for _, mv in dmg_pairs]
-    global AGG_COLS
-    AGG_COLS = agg_cols
     clusters: Dict[Tuple[str, ...], List[Dict[str, str]]] = {}
     dtype_cols = [type_col for type_col, _ in dmg_pairs] or ["Dmg Type"]
     for row in rows:
@@ -889,6 +770,8 @@ def collapse_rows(
         )
         layout = layout_map.get(layout_key) or build_step_layout(rowset)
         out[SLOT_KEY_FIELD] = build_slot_coverage(rowset)
+        if ORDER_FIELD in base:
+            out[ORDER_FIELD] = base[ORDER_FIELD]
 
         for type_col, _ in dmg_pairs:
             value = next(
@@ -943,19 +826,68 @@ def collapse_rows(
     return merged_rows, output_fields
 
 
+def shard_by_skill(rows: List[Dict[str, str]], shards: int) -> List[List[Dict[str, str]]]:
+    """
+    Split rows into at most ``shards`` lists of whole skills (every collapse
+    step keys on Skill), balancing row counts; rows keep their input order.
+    """
+    by_skill: Dict[str, List[Dict[str, str]]] = {}
+    for row in rows:
+        by_skill.setdefault(row.get("Skill", ""), []).append(row)
+    buckets: List[List[Dict[str, str]]] = [[] for _ in range(min(shards, len(by_skill)))]
+    for skill_rows in sorted(by_skill.values(), key=len, reverse=True):
+        min(buckets, key=len).extend(skill_rows)
+    for bucket in buckets:
+        bucket.sort(key=lambda row: row[ORDER_FIELD])
+    return buckets
+
+
+class Stage3Engine:
+    """
+    Stage 3 collapse for one input column layout. The column configuration
+    is fixed when the engine is built and no module state is written, so
+    engines can run side by side in threads, worker processes or a
+    long-lived service.
+    """
+
+    def __init__(self, fieldnames: List[str]) -> None:
+        self.dmg_pairs = find_damage_pairs(fieldnames)
+        self.agg_cols = list(AGG_COLS_BASE) + [mv for _, mv in self.dmg_pairs]
+        self.drop_cols = frozenset(DROP_COLUMNS)
+
+    def collapse(self, rows: List[Dict[str, str]]) -> Tuple[List[Dict[str, str]], List[str]]:
+        """Collapse already-filtered rows (whole skills only)."""
+        layout_map = build_layout_map(rows)
+        return collapse_rows(rows, layout_map, self.dmg_pairs, self.agg_cols)
+
+    def transform(
+        self, rows: List[Dict[str, str]], jobs: int = 1
+    ) -> Tuple[List[Dict[str, str]], List[str]]:
+        filtered_rows: List[Dict[str, str]] = []
+        for idx, row in enumerate(rows):
+            filtered = {k: v for k, v in row.items() if k not in self.drop_cols}
+            filtered[ORDER_FIELD] = idx
+            filtered_rows.append(filtered)
+        shards = shard_by_skill(filtered_rows, jobs) if jobs > 1 else []
+        if len(shards) > 1:
+            with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+                results = list(pool.map(self.collapse, shards))
+            output_fields = results[0][1]
+            collapsed = [row for shard_rows, _ in results for row in shard_rows]
+            # Clusters never span skills, so ordering them by their first input
+            # row reproduces the serial output exactly.
+            collapsed.sort(key=lambda row: row[ORDER_FIELD])
+        else:
+            collapsed, output_fields = self.collapse(filtered_rows)
+        for row in collapsed:
+            row.pop(ORDER_FIELD, None)
+        return collapsed, output_fields
+
+
 def transform_rows(
-    rows: List[Dict[str, str]], fieldnames: List[str]
+    rows: List[Dict[str, str]], fieldnames: List[str], jobs: int = 1
 ) -> Tuple[List[Dict[str, str]], List[str]]:
-    dmg_pairs = find_damage_pairs(fieldnames)
-    drop_cols = set(DROP_COLUMNS)
-    filtered_rows: List[Dict[str, str]] = []
-    for row in rows:
-        filtered_rows.append(
-            {k: v for k, v in row.items() if k not in drop_cols}
-        )
-    layout_map = build_layout_map(filtered_rows)
-    collapsed, output_fields = collapse_rows(filtered_rows, layout_map, dmg_pairs)
-    return collapsed, output_fields
+    return Stage3Engine(fieldnames).transform(rows, jobs)
 
 
 def write_csv(
@@ -985,13 +917,24 @@ def main() -> None:
         default=OUTPUT_DEFAULT,
         help="Path to write AoW-data-3.csv",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes; skills are split across them (output is identical).",
+    )
+    add_manifest_arguments(parser)
     args = parser.parse_args()
+    stage = StageManifest("stage3", args, inputs=[args.input], outputs=[args.output])
+    if stage.up_to_date():
+        return
 
     rows, fieldnames = read_rows(args.input)
-    output_rows, output_columns = transform_rows(rows, fieldnames)
+    output_rows, output_columns = transform_rows(rows, fieldnames, jobs=args.jobs)
     key_fields = [field for field in KEY_FIELDS if field in output_columns]
     before_rows = load_rows_by_key(args.output, key_fields)
     write_csv(output_rows, output_columns, args.output)
+    stage.record()
 
     path_text = format_path_for_console(args.output, ROOT)
     print(f"Wrote {len(output_rows)} rows to {path_text}")
@@ -15,7 +15,9 @@ from helpers.diff import (  # noqa: E402
     load_rows_by_key,
     report_row_deltas,
 )
+from helpers.numeric_text import format_range, split_ranges, zeros_only  # noqa: E402
 from helpers.output import format_path_for_console  # noqa: E402
+from helpers.stage_manifest import StageManifest, add_manifest_arguments  # noqa: E402
 
 INPUT_DEFAULT = ROOT / "work/aow_pipeline/AoW-data-3.csv"
 OUTPUT_DEFAULT = ROOT / "work/aow_pipeline/AoW-data-4.csv"
@@ -132,13 +134,6 @@ def parse_float(value: str) -> float | None:
         return None
 
 
-def zeros_only(text: str) -> bool:
-    nums = re.findall(r"-?\d+(?:\.\d+)?", text or "")
-    if not nums:
-        return False
-    return all(float(n) == 0 for n in nums)
-
-
 def wrap_label(label: str, color: str | None) -> str:
     if not COLOR_ENABLED or not color:
         return label
@@ -301,59 +296,6 @@ def ensure_output_fields(fieldnames: List[str]) -> List[str]:
     return fields
 
 
-RANGE_TOKEN = re.compile(r"-?\d+(?:\.\d+)?(?:-?\d+(?:\.\d+)?)?")
-
-
-def tokenize_with_ranges(text: str) -> List[tuple[str, str]]:
-    tokens: List[tuple[str, str]] = []
-    cursor = 0
-    src = text or ""
-    for match in RANGE_TOKEN.finditer(src):
-        start, end = match.span()
-        if start > cursor:
-            tokens.append(("sep", src[cursor:start]))
-        tokens.append(("num", match.group(0)))
-        cursor = end
-    if cursor < len(src):
-        tokens.append(("sep", src[cursor:]))
-    if not tokens:
-        tokens.append(("sep", ""))
-    return tokens
-
-
-def shape_with_ranges(text: str) -> Tuple[tuple[str, ...], int]:
-    tokens = tokenize_with_ranges(text)
-    pattern: List[str] = []
-    count = 0
-    for kind, _ in tokens:
-        if kind == "num":
-            pattern.append("{n}")
-            count += 1
-        else:
-            pattern.append("sep")
-    return tuple(pattern), count
-
-
-def parse_range_value(value: str) -> Tuple[float, float]:
-    text = (value or "").strip()
-    m = re.fullmatch(r"(-?\d+(?:\.\d+)?)(?:-(-?\d+(?:\.\d+)?))?", text)
-    if m:
-        first = float(m.group(1))
-        second = float(m.group(2)) if m.group(2) is not None else first
-        return (first, second) if first <= second else (second, first)
-    nums = [float(n) for n in re.findall(r"-?\d+(?:\.\d+)?", text)]
-    if not nums:
-        return 0.0, 0.0
-    return (min(nums), max(nums))
-
-
-def fmt_number(value: float) -> str:
-    if value.is_integer():
-        return str(int(value))
-    text = f"{value:.3f}".rstrip("0").rstrip(".")
-    return text
-
-
 def sum_numeric_strings_with_ranges(current: str, incoming: str) -> str | None:
     cur = (current or "").strip()
     inc = (incoming or "").strip()
@@ -362,30 +304,18 @@ def sum_numeric_strings_with_ranges(current: str, incoming: str) -> str | None:
     if not inc:
         return cur
 
-    cur_tokens = tokenize_with_ranges(cur)
-    inc_tokens = tokenize_with_ranges(inc)
-    cur_shape, cur_count = shape_with_ranges(cur)
-    inc_shape, inc_count = shape_with_ranges(inc)
-    if cur_count != inc_count or cur_shape != inc_shape:
+    cur_parsed = split_ranges(cur)
+    inc_parsed = split_ranges(inc)
+    # Only the token kinds must line up; separators come from ``current``.
+    if cur_parsed.count != inc_parsed.count or cur_parsed.kinds != inc_parsed.kinds:
         return None
 
-    cur_ranges = [parse_range_value(val) for kind, val in cur_tokens if kind == "num"]
-    inc_ranges = [parse_range_value(val) for kind, val in inc_tokens if kind == "num"]
-    summed: List[str] = []
-    for (c_low, c_high), (i_low, i_high) in zip(cur_ranges, inc_ranges):
-        low = c_low + i_low
-        high = c_high + i_high
-        summed.append(fmt_number(low) if low == high else f"{fmt_number(low)}-{fmt_number(high)}")
-
-    rebuilt: List[str] = []
-    idx = 0
-    for kind, val in cur_tokens:
-        if kind == "num":
-            rebuilt.append(summed[idx])
-            idx += 1
-        else:
-            rebuilt.append(val)
-    return "".join(rebuilt)
+    return cur_parsed.render(
+        [
+            format_range(c_low + i_low, c_high + i_high)
+            for (c_low, c_high), (i_low, i_high) in zip(cur_parsed.ranges, inc_parsed.ranges)
+        ]
+    )
 
 
 def apply_row_operations(
@@ -602,7 +532,11 @@ def main() -> None:
         action="store_true",
         help="Disable font color tags (default).",
     )
+    add_manifest_arguments(parser)
     args = parser.parse_args()
+    stage = StageManifest("stage4", args, inputs=[args.input], outputs=[args.output])
+    if stage.up_to_date():
+        return
 
     global COLOR_ENABLED
     COLOR_ENABLED = bool(args.color)
@@ -612,6 +546,7 @@ def main() -> None:
     key_fields = [field for field in KEY_FIELDS if field in output_columns]
     before_rows = load_rows_by_key(args.output, key_fields)
     write_csv(output_rows, output_columns, args.output)
+    stage.record()
 
     path_text = format_path_for_console(args.output, ROOT)
     print(f"Wrote {len(output_rows)} rows to {path_text}")
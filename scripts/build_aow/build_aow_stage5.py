@@ -1,10 +1,17 @@
 import argparse
 import csv
+import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Tuple
 import re
 
 ROOT = Path(__file__).resolve().parents[2]
+HELPERS_DIR = ROOT / "scripts"
+if str(HELPERS_DIR) not in sys.path:
+    sys.path.append(str(HELPERS_DIR))
+
+from helpers.stage_manifest import StageManifest, add_manifest_arguments  # noqa: E402
+
 INPUT_DEFAULT = ROOT / "work/aow_pipeline/AoW-data-4.csv"
 OUTPUT_DEFAULT = ROOT / "work/aow_pipeline/AoW-data-5.md"
 
@@ -338,6 +345,72 @@ def parse_existing(output_path: Path) -> Tuple[List[str], Dict[str, List[str]],
     return preamble, sections, markers
 
 
+def render_section(
+    skill: str, skill_rows: List[Dict[str, str]], marker: str
+) -> List[str]:
+    """Markdown lines for one skill's `###` section, ending with a blank line."""
+    weapon_values = unique_ordered([weapon_value(r) for r in skill_rows])
+    weapon_values = [w for w in weapon_values if w]
+
+    section_lines: List[str] = []
+    heading_parts = ["###"]
+    if marker:
+        heading_parts.append(marker)
+    heading_parts.append(skill)
+    section_lines.append(" ".join(heading_parts))
+    section_lines.append("")
+
+    multi_weapon_labels = [w for w in weapon_values if "|" in w]
+    alias_labels: Dict[str, str] = {}
+    if len(multi_weapon_labels) == 1:
+        alias_labels[multi_weapon_labels[0]] = "All Weapons"
+
+    def emit_blocks(
+        block_rows: List[Dict[str, str]], weapon_label: str | None = None
+    ) -> None:
+        block_has_followups = has_followups(block_rows)
+        blocks = [
+            format_block(row, block_has_followups) for row in block_rows
+        ]
+        merged_blocks = merge_blocks(blocks)
+        if weapon_label:
+            display_label = alias_labels.get(weapon_label, weapon_label)
+            if not merged_blocks:
+                section_lines.append(display_label)
+                return
+            if (
+                len(merged_blocks) == 1
+                and merged_blocks[0]
+                and merged_blocks[0][0].startswith("(")
+            ):
+                section_lines.append(
+                    f"{display_label} {merged_blocks[0][0]}"
+                )
+                section_lines.extend(
+                    indent_lines(merged_blocks[0][1:], 4)
+                )
+            else:
+                section_lines.append(display_label)
+                for block_lines in merged_blocks:
+                    section_lines.extend(indent_lines(block_lines, 4))
+            return
+
+        for block_lines in merged_blocks:
+            section_lines.extend(block_lines)
+
+    if len(weapon_values) > 1:
+        for weapon in weapon_values:
+            weapon_rows = [
+                r for r in skill_rows if weapon_value(r) == weapon
+            ]
+            emit_blocks(weapon_rows, weapon)
+    else:
+        emit_blocks(skill_rows)
+
+    section_lines.append("")
+    return section_lines
+
+
 def build_markdown(
     rows: List[Dict[str, str]],
     output_path: Path,
@@ -345,8 +418,11 @@ def build_markdown(
     existing_sections: Dict[str, List[str]],
     existing_markers: Dict[str, str],
     force: bool,
+    render: Callable[[str, List[Dict[str, str]], str], List[str]] = render_section,
 ) -> Tuple[List[str], Dict[str, List[str]]]:
-    skills_in_order = unique_ordered([row.get("Skill", "") for row in rows])
+    rows_by_skill: Dict[str, List[Dict[str, str]]] = {}
+    for row in rows:
+        rows_by_skill.setdefault(row.get("Skill", ""), []).append(row)
     lines: List[str] = []
     new_sections: Dict[str, List[str]] = {}
 
@@ -355,11 +431,7 @@ def build_markdown(
         if existing_preamble[-1] != "":
             lines.append("")
 
-    for skill in skills_in_order:
-        skill_rows = [r for r in rows if r.get("Skill", "") == skill]
-        weapon_values = unique_ordered([weapon_value(r) for r in skill_rows])
-        weapon_values = [w for w in weapon_values if w]
-
+    for skill, skill_rows in rows_by_skill.items():
         existing_marker = existing_markers.get(skill, "[ ]")
         existing_section = existing_sections.get(skill)
 
@@ -371,103 +443,35 @@ def build_markdown(
             new_sections[skill] = list(existing_section)
             continue
 
-        section_lines: List[str] = []
         marker = existing_marker
         if force and marker == "[x]":
             marker = "[<]"
-        heading_parts = ["###"]
-        if marker:
-            heading_parts.append(marker)
-        heading_parts.append(skill)
-        section_lines.append(" ".join(heading_parts))
-        section_lines.append("")
-
-        multi_weapon_labels = [w for w in weapon_values if "|" in w]
-        alias_labels: Dict[str, str] = {}
-        if len(multi_weapon_labels) == 1:
-            alias_labels[multi_weapon_labels[0]] = "All Weapons"
-
-        def emit_blocks(
-            block_rows: List[Dict[str, str]], weapon_label: str | None = None
-        ) -> None:
-            block_has_followups = has_followups(block_rows)
-            blocks = [
-                format_block(row, block_has_followups) for row in block_rows
-            ]
-            merged_blocks = merge_blocks(blocks)
-            if weapon_label:
-                display_label = alias_labels.get(weapon_label, weapon_label)
-                if not merged_blocks:
-                    section_lines.append(display_label)
-                    return
-                if (
-                    len(merged_blocks) == 1
-                    and merged_blocks[0]
-                    and merged_blocks[0][0].startswith("(")
-                ):
-                    section_lines.append(
-                        f"{display_label} {merged_blocks[0][0]}"
-                    )
-                    section_lines.extend(
-                        indent_lines(merged_blocks[0][1:], 4)
-                    )
-                else:
-                    section_lines.append(display_label)
-                    for block_lines in merged_blocks:
-                        section_lines.extend(indent_lines(block_lines, 4))
-                return
-
-            for block_lines in merged_blocks:
-                section_lines.extend(block_lines)
-
-        if len(weapon_values) > 1:
-            for weapon in weapon_values:
-                weapon_rows = [
-                    r for r in skill_rows if weapon_value(r) == weapon
-                ]
-                emit_blocks(weapon_rows, weapon)
-        else:
-            emit_blocks(skill_rows)
-
-        section_lines.append("")
+        section_lines = render(skill, skill_rows, marker)
         lines.extend(section_lines)
         new_sections[skill] = section_lines
 
     return lines, new_sections
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(
-        description="Stage 5: render AoW-data-4.csv into markdown helper text."
-    )
-    parser.add_argument(
-        "--input",
-        type=Path,
-        default=INPUT_DEFAULT,
-        help="Path to AoW-data-4.csv",
-    )
-    parser.add_argument(
-        "--output",
-        type=Path,
-        default=OUTPUT_DEFAULT,
-        help="Path to write AoW-data-5.md",
-    )
-    parser.add_argument(
-        "--force",
-        action="store_true",
-        help="Force overwrite checked sections, replacing [x] with [<]",
-    )
-    args = parser.parse_args()
-
-    rows, _ = read_rows(args.input)
-    preamble, sections, markers = parse_existing(args.output)
+def write_markdown(
+    rows: List[Dict[str, str]],
+    output_path: Path,
+    force: bool = False,
+    render: Callable[[str, List[Dict[str, str]], str], List[str]] = render_section,
+) -> str:
+    """
+    Render ``rows`` over the existing markdown at ``output_path`` (keeping
+    `[x]` sections unless ``force``), write it, report section changes and
+    return the written text.
+    """
+    preamble, sections, markers = parse_existing(output_path)
     if preamble and sections:
         # Avoid carrying over corrupted or unexpected leading content.
         preamble = []
     old_sections = {k: v for k, v in sections.items()}
 
     lines, new_sections = build_markdown(
-        rows, args.output, preamble, sections, markers, args.force
+        rows, output_path, preamble, sections, markers, force, render
     )
 
     # Ensure consistent EOF: trailing blank line + marker for stable diffs.
@@ -477,8 +481,8 @@ def main() -> None:
     lines.append("")
 
     output_text = "\n".join(lines)
-    args.output.parent.mkdir(parents=True, exist_ok=True)
-    args.output.write_text(output_text, encoding="utf-8")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(output_text, encoding="utf-8")
 
     def normalize_block(block: List[str] | None) -> List[str]:
         if not block:
@@ -498,10 +502,10 @@ def main() -> None:
     total_changes = len(set(changed_skills) | set(removed_skills))
 
     if total_changes == 0:
-        print(f"No markdown changes. Wrote {args.output}")
-        return
+        print(f"No markdown changes. Wrote {output_path}")
+        return output_text
 
-    print(f"Wrote markdown to {args.output} ({total_changes} section changes)")
+    print(f"Wrote markdown to {output_path} ({total_changes} section changes)")
     if total_changes <= 5:
         details = changed_skills + [s for s in removed_skills if s not in changed_skills]
         for skill in details[:5]:
@@ -510,6 +514,40 @@ def main() -> None:
             print(f"\n--- {skill} (before) ---\n{before}")
             print(f"+++ {skill} (after)  ---\n{after}")
 
+    return output_text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Stage 5: render AoW-data-4.csv into markdown helper text."
+    )
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=INPUT_DEFAULT,
+        help="Path to AoW-data-4.csv",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=OUTPUT_DEFAULT,
+        help="Path to write AoW-data-5.md",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Force overwrite checked sections, replacing [x] with [<]",
+    )
+    add_manifest_arguments(parser)
+    args = parser.parse_args()
+    stage = StageManifest("stage5", args, inputs=[args.input], outputs=[args.output])
+    if stage.up_to_date():
+        return
+
+    rows, _ = read_rows(args.input)
+    write_markdown(rows, args.output, args.force)
+    stage.record()
+
 
 if __name__ == "__main__":
     main()
@@ -1,9 +1,16 @@
 import argparse
 import json
+import sys
 from pathlib import Path
 from typing import Dict, List
 
 ROOT = Path(__file__).resolve().parents[2]
+HELPERS_DIR = ROOT / "scripts"
+if str(HELPERS_DIR) not in sys.path:
+    sys.path.append(str(HELPERS_DIR))
+
+from helpers.stage_manifest import StageManifest, add_manifest_arguments  # noqa: E402
+
 MD_DEFAULT = ROOT / "work/aow_pipeline/AoW-data-5.md"
 INPUT_JSON_DEFAULT = ROOT / "work/responses/skill.json"
 OUTPUT_JSON_DEFAULT = ROOT / "work/responses/ready/skill.json"
@@ -14,7 +21,12 @@ def load_md_blocks(path: Path) -> Dict[str, str]:
     Parse the AoW-data-5 markdown into a mapping of skill name -> formatted text
     without the leading "### {skill}" header.
     """
-    lines = path.read_text(encoding="utf-8").splitlines()
+    return parse_md_blocks(path.read_text(encoding="utf-8"))
+
+
+def parse_md_blocks(text: str) -> Dict[str, str]:
+    """``load_md_blocks`` for markdown already in memory."""
+    lines = text.splitlines()
     blocks: Dict[str, List[str]] = {}
     current_skill: str | None = None
     buffer: List[str] = []
@@ -85,7 +97,11 @@ def main() -> None:
         default=OUTPUT_JSON_DEFAULT,
         help="Path to write ready/skill.json",
     )
+    add_manifest_arguments(parser)
     args = parser.parse_args()
+    stage = StageManifest("stage6", args, inputs=[args.md, args.input], outputs=[args.output])
+    if stage.up_to_date():
+        return
 
     md_blocks = load_md_blocks(args.md)
     ready_entries = json.loads(args.input.read_text(encoding="utf-8"))
@@ -97,6 +113,7 @@ def main() -> None:
         json.dumps(ready_entries, ensure_ascii=False, indent=2),
         encoding="utf-8",
     )
+    stage.record()
 
     print(
         f"Appended markdown stats to {updated_count} skill(s); "
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Run AoW stages 0-6 in one process, handing rows from stage to stage in memory
+instead of writing AoW-data-1..4.csv and parsing them back.
+
+Each stage's transform is imported from its module, so the outputs match
+`make stages`: the skill list (stage 0), AoW-data-5.md (stage 5) and
+ready/skill.json (stage 6) are always written; the intermediate CSVs (and
+their row-delta reports) only with --write-csv.
+
+With --incremental, stages 2-5 run per skill: each skill's input rows (and the
+copy/force-collapse rules naming it) are fingerprinted, and only skills whose
+fingerprint changed are recomputed; the rest come from work/.cache/aow_pipeline/.
+Stage 2 results are put back in full-run row order, so AoW-data-2.csv,
+AoW-data-5.md and ready/skill.json come out the same as a full run
+(scripts/bench/check_incremental_pipeline.py checks this for a copy that moves
+rows to another skill). Rows in AoW-data-3..4.csv are grouped by skill instead
+of interleaved, so use a full run when those CSVs must match `make stages`.
+
+Usage:
+  python scripts/build_aow/run_pipeline.py
+  python scripts/build_aow/run_pipeline.py --incremental
+  python scripts/build_aow/run_pipeline.py --write-csv
+  python scripts/build_aow/run_pipeline.py --color --force
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+HELPERS_DIR = ROOT / "scripts"
+if str(HELPERS_DIR) not in sys.path:
+    sys.path.append(str(HELPERS_DIR))
+
+import build_aow_stage0 as stage0  # noqa: E402
+import build_aow_stage1 as stage1  # noqa: E402
+import build_aow_stage2 as stage2  # noqa: E402
+import build_aow_stage3 as stage3  # noqa: E402
+import build_aow_stage4 as stage4  # noqa: E402
+import build_aow_stage5 as stage5  # noqa: E402
+import build_aow_stage6 as stage6  # noqa: E402
+from helpers import numeric_text  # noqa: E402
+from helpers.diff import load_rows_by_key, report_row_deltas  # noqa: E402
+from helpers.force_collapse import load_force_collapse_map  # noqa: E402
+from helpers.output import format_path_for_console  # noqa: E402
+from helpers.skill_cache import SkillCache, partition_rows  # noqa: E402
+
+STAGE_CSVS = {
+    1: stage2.INPUT_DEFAULT,
+    2: stage3.INPUT_DEFAULT,
+    3: stage4.INPUT_DEFAULT,
+    4: stage5.INPUT_DEFAULT,
+}
+
+
+def csv_rows(rows: Iterable[Mapping[str, object]], fieldnames: Sequence[str]) -> List[Dict[str, str]]:
+    """
+    Rows exactly as the next stage would read them back from the CSV: only
+    ``fieldnames``, in that order, with every value as text ("" for missing).
+    """
+    out: List[Dict[str, str]] = []
+    for row in rows:
+        out.append({field: "" if row.get(field) is None else str(row.get(field)) for field in fieldnames})
+    return out
+
+
+def materialize(
+    stage: int, rows: List[Dict[str, str]], fieldnames: List[str], key_fields: Sequence[str]
+) -> None:
+    """Write AoW-data-<stage>.csv and report deltas, as the standalone stage does."""
+    path = STAGE_CSVS[stage]
+    key_fields = [field for field in key_fields if field in fieldnames]
+    before_rows = load_rows_by_key(path, key_fields)
+    stage2.write_csv(rows, fieldnames, path)
+    print(f"Wrote {len(rows)} rows to {format_path_for_console(path, ROOT)}")
+    if key_fields:
+        report_row_deltas(
+            before_rows=before_rows,
+            after_rows=rows,
+            fieldnames=fieldnames,
+            key_fields=key_fields,
+            align_columns=True,
+        )
+
+
+def stage2_partitions(
+    rows: List[Dict[str, str]],
+    copy_rows: List[Dict[str, Any]],
+    force_groups: Mapping[str, str],
+    force_overrides: Mapping[str, Dict[str, str]],
+) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Stage 1 rows split into the units stage 2 can collapse independently: one
+    per Skill, except that skills tied together by a force-collapse group, or
+    by a copy/override that moves rows to another Skill, share a partition.
+    """
+    by_skill = partition_rows(rows)
+    parent = {skill: skill for skill in by_skill}
+
+    def find(skill: str) -> str:
+        while parent[skill] != skill:
+            parent[skill] = parent[parent[skill]]
+            skill = parent[skill]
+        return skill
+
+    def union(skills: Iterable[str]) -> None:
+        roots = [find(skill) for skill in skills if skill in parent]
+        for root in roots[1:]:
+            parent[root] = roots[0]
+
+    name_skill = {row.get("Name", ""): row.get("Skill", "") for row in rows}
+    members: Dict[str, List[str]] = {}
+    for name, group_id in force_groups.items():
+        members.setdefault(group_id, []).append(name)
+    for group_id, names in members.items():
+        skills = [name_skill[name] for name in names if name in name_skill]
+        target = force_overrides.get(group_id, {}).get("Skill")
+        union(skills + ([target] if target and skills else []))
+    for entry in copy_rows:
+        skill = name_skill.get(entry["name"])
+        for overrides in entry["copies"]:
+            if skill is not None and overrides.get("Skill"):
+                union([skill, overrides["Skill"]])
+
+    partitions: Dict[str, List[Dict[str, str]]] = {}
+    for row in rows:
+        partitions.setdefault(find(row.get("Skill", "")), []).append(row)
+    return partitions
+
+
+def copy_positions(rows: List[Dict[str, str]], copy_rows: List[Dict[str, Any]]) -> List[Tuple[int, int]]:
+    """
+    (base row position, copy position) for every row `stage2.apply_row_copies`
+    adds to ``rows`` in a full run, in the order it adds them.
+    """
+    by_name: Dict[str, List[int]] = {}
+    for idx, row in enumerate(rows):
+        by_name.setdefault(row.get("Name", ""), []).append(idx)
+    slots: List[Tuple[int, int]] = []
+    for entry in copy_rows:
+        for _ in entry["copies"]:
+            for base in by_name.get(entry["name"], []):
+                slots.append((base, len(rows) + len(slots)))
+    return slots
+
+
+def incremental_stage2(
+    rows1: List[Dict[str, str]],
+    fields1: List[str],
+    copy_rows: Optional[List[Dict[str, Any]]] = None,
+) -> Tuple[List[Dict[str, str]], List[str], List[str], List[str], List[str], SkillCache]:
+    """
+    Stage 2 per partition; returns what `stage2.transform_rows` returns plus the
+    cache. Partition results are spliced back in full-run order: by the position
+    of each collapsed row's first input row, copies counting as appended after
+    all Stage 1 rows. ``copy_rows`` defaults to stage 2's copy_rows.json.
+    """
+    if copy_rows is None:
+        copy_rows = stage2.load_copy_rows(stage2.COPY_ROWS_DEFAULT)
+    value_blacklist = stage2.load_value_blacklist(stage2.VALUE_BLACKLIST_DEFAULT)
+    force_groups, force_overrides, force_primary = load_force_collapse_map(
+        stage2.FORCE_COLLAPSE_DEFAULT
+    )
+    stage_rules = {"2": value_blacklist.get("2", {})}
+    cache = SkillCache("stage2", Path(stage2.__file__))
+    known_names = {row.get("Name", "") for row in rows1}
+    # Copies of unknown names only produce warnings; report them once.
+    _, _, warnings = stage2.apply_row_copies(
+        [], fields1, [entry for entry in copy_rows if entry["name"] not in known_names]
+    )
+    position = {id(row): idx for idx, row in enumerate(rows1)}
+    copy_slots = copy_positions(rows1, copy_rows)
+    results = []
+    for part in stage2_partitions(rows1, copy_rows, force_groups, force_overrides).values():
+        # Full-run position of each row the partition's transform sees: its own
+        # rows, then the copies made from them.
+        positions = [position[id(row)] for row in part]
+        members = set(positions)
+        positions.extend(pos for base, pos in copy_slots if base in members)
+        names = {row.get("Name", "") for row in part}
+        copies = [entry for entry in copy_rows if entry["name"] in names]
+        groups = {name: gid for name, gid in force_groups.items() if name in names}
+        group_ids = set(groups.values())
+        overrides = {gid: val for gid, val in force_overrides.items() if gid in group_ids}
+        primary = {gid: val for gid, val in force_primary.items() if gid in group_ids}
+        key = cache.key(part, fields1, copies, stage_rules, groups, overrides, primary)
+        result = cache.get(key)
+        if result is None:
+            out_rows, out_cols, notes, part_warnings, forced = stage2.transform_with_rules(
+                [{**row, stage2.ORDER_FIELD: idx} for idx, row in enumerate(part)],
+                fields1,
+                copy_rows=copies,
+                value_blacklist=stage_rules,
+                force_groups=groups,
+                force_overrides=overrides,
+                force_primary=primary,
+            )
+            result = cache.put(
+                key,
+                {
+                    "rows": csv_rows(out_rows, out_cols),
+                    "order": [row[stage2.ORDER_FIELD] for row in out_rows],
+                    "columns": out_cols,
+                    "notes": notes,
+                    "warnings": part_warnings,
+                    "forced": forced,
+                },
+            )
+        results.append((positions, result))
+
+    if results:
+        # Partitions only differ in how many Dmg Type/MV pairs they need; a
+        # full run emits the widest layout and leaves the extra pairs blank.
+        fields2 = max((result["columns"] for _, result in results), key=len)
+    else:
+        fields2 = stage2.transform_with_rules(
+            [],
+            fields1,
+            copy_rows=[],
+            value_blacklist={},
+            force_groups={},
+            force_overrides={},
+            force_primary={},
+        )[1]
+    spliced: List[Tuple[int, Dict[str, str]]] = []
+    copy_notes: List[str] = []
+    forced_groups: List[str] = []
+    for positions, result in results:
+        rows = csv_rows(result["rows"], fields2)
+        spliced.extend((positions[local], row) for local, row in zip(result["order"], rows))
+        copy_notes.extend(result["notes"])
+        warnings.extend(result["warnings"])
+        forced_groups.extend(result["forced"])
+    spliced.sort(key=lambda item: item[0])
+    rows2 = [row for _, row in spliced]
+    return rows2, fields2, copy_notes, warnings, sorted(forced_groups), cache
+
+
+def incremental_stage(
+    name: str,
+    module: Any,
+    rows: List[Dict[str, str]],
+    fieldnames: List[str],
+    *extra: Any,
+) -> Tuple[List[Dict[str, str]], List[str], SkillCache]:
+    """Run ``module.transform_rows`` per Skill, reusing cached skills."""
+    # Stages 3 and 4 keep their number parsing in helpers/numeric_text.py.
+    cache = SkillCache(name, [Path(module.__file__), Path(numeric_text.__file__)])
+    results = []
+    for part in partition_rows(rows).values():
+        key = cache.key(part, fieldnames, *extra)
+        result = cache.get(key)
+        if result is None:
+            out_rows, out_cols = module.transform_rows([dict(row) for row in part], fieldnames)
+            result = cache.put(key, {"rows": csv_rows(out_rows, out_cols), "columns": out_cols})
+        results.append(result)
+    out_fields: List[str] = []
+    for result in results:
+        out_fields.extend(col for col in result["columns"] if col not in out_fields)
+    if not results:
+        out_fields = module.transform_rows([], fieldnames)[1]
+    out_rows: List[Dict[str, str]] = []
+    for result in results:
+        out_rows.extend(csv_rows(result["rows"], out_fields))
+    return out_rows, out_fields, cache
+
+
+def cached_renderer(
+    cache: SkillCache,
+) -> Callable[[str, List[Dict[str, str]], str], List[str]]:
+    """Stage 5 section renderer that reuses sections whose skill rows are unchanged."""
+
+    def render(skill: str, skill_rows: List[Dict[str, str]], marker: str) -> List[str]:
+        key = cache.key(skill, skill_rows, marker)
+        lines = cache.get(key)
+        if lines is None:
+            lines = cache.put(key, stage5.render_section(skill, skill_rows, marker))
+        return lines
+
+    return render
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run AoW stages 0-6 in one process without intermediate CSV round-trips."
+    )
+    parser.add_argument(
+        "--write-csv",
+        action="store_true",
+        help="Also write AoW-data-1..4.csv (with row-delta reports).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Recompute stages 2-5 only for skills whose inputs changed.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Stage 3: worker processes to split skills across (output is identical).",
+    )
+    parser.add_argument(
+        "--color",
+        action="store_true",
+        help="Stage 4: enable font color tags in generated text columns.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Stage 5: force overwrite checked sections, replacing [x] with [<]",
+    )
+    parser.add_argument(
+        "--md",
+        type=Path,
+        default=stage5.OUTPUT_DEFAULT,
+        help="Path to write AoW-data-5.md",
+    )
+    parser.add_argument(
+        "--input-json",
+        type=Path,
+        default=stage6.INPUT_JSON_DEFAULT,
+        help="Stage 6: path to source skill.json",
+    )
+    parser.add_argument(
+        "--output-json",
+        type=Path,
+        default=stage6.OUTPUT_JSON_DEFAULT,
+        help="Stage 6: path to write ready/skill.json",
+    )
+    args = parser.parse_args()
+
+    timings: List[tuple] = []
+    clock = time.perf_counter()
+
+    def lap(label: str) -> None:
+        nonlocal clock
+        now = time.perf_counter()
+        timings.append((label, now - clock))
+        clock = now
+
+    # Stage 0: canonical skill list (also a checked-in reference file).
+    combined = sorted(
+        stage0.load_gem_names()
+        | stage0.load_behavior_names()
+        | stage0.load_swordarts_names()
+    )
+    skill_text = "\n".join(combined)
+    stage0.OUTPUT.parent.mkdir(parents=True, exist_ok=True)
+    stage0.OUTPUT.write_text(skill_text, encoding="utf-8")
+    print(f"Wrote {len(combined)} skills to {format_path_for_console(stage0.OUTPUT, ROOT)}")
+    lap("stage0")
+
+    rows1, warnings1 = stage1.build_all_rows(stage1.parse_skill_names(skill_text))
+    fields1 = list(stage1.OUTPUT_COLUMNS)
+    rows1 = csv_rows(rows1, fields1)
+    if args.write_csv:
+        materialize(1, rows1, fields1, ["Name"])
+    stage1.print_warnings(warnings1)
+    lap("stage1")
+
+    caches: List[SkillCache] = []
+    if args.incremental:
+        rows2, fields2, copy_notes, warnings2, forced_groups, cache = incremental_stage2(rows1, fields1)
+        caches.append(cache)
+    else:
+        rows2, fields2, copy_notes, warnings2, forced_groups = stage2.transform_rows(rows1, fields1)
+        rows2 = csv_rows(rows2, fields2)
+    if args.write_csv:
+        materialize(2, rows2, fields2, stage2.GROUP_KEYS)
+    stage2.print_notes(copy_notes, forced_groups, warnings2)
+    lap("stage2")
+
+    if args.incremental:
+        rows3, fields3, cache = incremental_stage("stage3", stage3, rows2, fields2)
+        caches.append(cache)
+    else:
+        rows3, fields3 = stage3.transform_rows(rows2, fields2, jobs=args.jobs)
+        rows3 = csv_rows(rows3, fields3)
+    if args.write_csv:
+        materialize(3, rows3, fields3, stage3.KEY_FIELDS)
+    lap("stage3")
+
+    stage4.COLOR_ENABLED = args.color
+    if args.incremental:
+        rows4, fields4, cache = incremental_stage("stage4", stage4, rows3, fields3, args.color)
+        caches.append(cache)
+    else:
+        rows4, fields4 = stage4.transform_rows(rows3, fields3)
+        rows4 = csv_rows(rows4, fields4)
+    if args.write_csv:
+        materialize(4, rows4, fields4, stage4.KEY_FIELDS)
+    lap("stage4")
+
+    if args.incremental:
+        cache = SkillCache("stage5", Path(stage5.__file__))
+        md_text = stage5.write_markdown(rows4, args.md, args.force, cached_renderer(cache))
+        caches.append(cache)
+    else:
+        md_text = stage5.write_markdown(rows4, args.md, args.force)
+    lap("stage5")
+
+    ready_entries = json.loads(args.input_json.read_text(encoding="utf-8"))
+    updated_count = stage6.apply_md_to_ready(stage6.parse_md_blocks(md_text), ready_entries)
+    args.output_json.parent.mkdir(parents=True, exist_ok=True)
+    args.output_json.write_text(
+        json.dumps(ready_entries, ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    print(
+        f"Appended markdown stats to {updated_count} skill(s); "
+        f"wrote output to {args.output_json}"
+    )
+    lap("stage6")
+
+    for cache in caches:
+        cache.save()
+    if caches:
+        print("Incremental: " + ", ".join(f"{cache.path.stem} {cache.summary()}" for cache in caches))
+    total = sum(seconds for _, seconds in timings)
+    print("Stage times: " + ", ".join(f"{label} {seconds:.2f}s" for label, seconds in timings) + f" (total {total:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ import json
 from pathlib import Path
 import re
 
+from helpers.job_journal import JOURNAL_PATH, JobJournal
+
 PENDING = Path('work/responses/pending')
 READY = Path('work/responses/ready')
 ARCHIVE = Path('work/responses/archive')
@@ -47,6 +49,10 @@ def try_fix_json(text: str):
 def main():
     moved = 0
     skipped_overwrite = 0
+    salvaged = 0
+    # Failed run_plan jobs whose output is repaired here become "salvaged",
+    # so run_plan --resume does not run them again.
+    journal = JobJournal(JOURNAL_PATH) if JOURNAL_PATH.exists() else None
     for f in list(PENDING.glob('*.json')):
         text = f.read_text(encoding='utf-8', errors='ignore')
         data = try_fix_json(text)
@@ -61,9 +67,16 @@ def main():
             skipped_overwrite += 1
             continue
         target.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+        if journal is not None:
+            key = journal.job_for_output(f)
+            if key is not None and journal.jobs[key].state == 'failed':
+                journal.record(key, 'salvaged', output=str(target))
+                salvaged += 1
         f.unlink()  # remove pending file
         moved += 1
     print(f"Cleaned and moved {moved} pending JSON files to ready")
+    if salvaged:
+        print(f"Marked {salvaged} failed jobs as salvaged in {JOURNAL_PATH}")
     if skipped_overwrite:
         print(f"Skipped {skipped_overwrite} files because a ready file already exists (no overwrite performed)")
 
@@ -10,7 +10,14 @@ import math
 import re
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, Iterable, List, Sequence, Set, Tuple
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Sequence, Set, Tuple
+
+from helpers.reference import ATTACK_DATA_CSV, load_reference
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional (only --numpy needs it)
+    np = None
 
 # Colour constants match docs/definitions.md
 COLOR_GOLD = "#E0B985"
@@ -114,6 +121,14 @@ def parse_args() -> argparse.Namespace:
             " keeping any existing entries in the output file."
         ),
     )
+    parser.add_argument(
+        "--numpy",
+        action="store_true",
+        help=(
+            "Parse the numeric columns into NumPy arrays and compute element picks and stance"
+            " scaling in batch (same output; needs numpy)."
+        ),
+    )
     parser.add_argument(
         "--append-preserve-latest",
         action="store_true",
@@ -282,19 +297,95 @@ def pick_mv_element(row: Dict[str, str]) -> Tuple[str, float]:
     return "", 0.0
 
 
+class RowNumbers(NamedTuple):
+    """The numeric cells of one attack-sheet row, as the line builders read them."""
+
+    mv_element: str
+    mv_value: float
+    # One per ELEMENT_BASE_COLUMNS entry; None when the cell is not a number.
+    base_values: Tuple[float | None, ...]
+    has_base_damage: bool
+    status: float | None
+    poise: float
+    super_armor: float
+
+
+def cell_float(raw: str | None) -> float | None:
+    try:
+        return float(raw or 0)
+    except ValueError:
+        return None
+
+
+def row_numbers(row: Dict[str, str]) -> RowNumbers:
+    element, mv_value = pick_mv_element(row)
+    poise = cell_float(row.get("Poise Dmg MV", ""))
+    super_armor = cell_float(row.get("AtkSuperArmor", ""))
+    return RowNumbers(
+        mv_element=element,
+        mv_value=mv_value,
+        base_values=tuple(cell_float(row.get(column, "")) for _, column in ELEMENT_BASE_COLUMNS),
+        has_base_damage=has_base_damage(row),
+        status=cell_float(row.get("Status MV", "")),
+        poise=0.0 if poise is None else poise,
+        super_armor=0.0 if super_armor is None else super_armor,
+    )
+
+
+def batch_row_numbers(rows: Sequence[Dict[str, str]]) -> List[RowNumbers]:
+    """
+    row_numbers() for every row at once: each numeric column is parsed into a
+    float array (NaN for cells float() rejects) and the element pick and
+    base-damage check run over whole columns. Requires NumPy.
+    """
+
+    def columns(names: Sequence[str]) -> "np.ndarray":
+        parsed = [[cell_float(row.get(name, "")) for name in names] for row in rows]
+        return np.array(
+            [[np.nan if v is None else v for v in cells] for cells in parsed], dtype=float
+        ).reshape(len(rows), len(names))
+
+    mv = np.nan_to_num(columns([column for _, column in MV_COLUMNS]), nan=0.0)
+    # argmax returns the first maximum, matching pick_mv_element's scan order.
+    mv_idx = mv.argmax(axis=1)
+    mv_max = mv[np.arange(len(rows)), mv_idx]
+    base = columns([column for _, column in ELEMENT_BASE_COLUMNS])
+    has_base = (np.nan_to_num(base, nan=0.0) > 0).any(axis=1)
+    status, poise, super_armor = columns(["Status MV", "Poise Dmg MV", "AtkSuperArmor"]).T
+
+    elements = [element for element, _ in MV_COLUMNS]
+    out: List[RowNumbers] = []
+    for elem_idx, mv_value, base_row, has_base_row, status_val, poise_val, super_val in zip(
+        mv_idx.tolist(),
+        mv_max.tolist(),
+        base.tolist(),
+        has_base.tolist(),
+        status.tolist(),
+        np.nan_to_num(poise, nan=0.0).tolist(),
+        np.nan_to_num(super_armor, nan=0.0).tolist(),
+    ):
+        out.append(
+            RowNumbers(
+                mv_element=elements[elem_idx] if mv_value > 0 else "",
+                mv_value=mv_value if mv_value > 0 else 0.0,
+                base_values=tuple(None if math.isnan(v) else v for v in base_row),
+                has_base_damage=has_base_row,
+                status=None if math.isnan(status_val) else status_val,
+                poise=poise_val,
+                super_armor=super_val,
+            )
+        )
+    return out
+
+
 def build_bullet_lines(
-    row: Dict[str, str], label: str | None
+    row: Dict[str, str], label: str | None, numbers: RowNumbers
 ) -> List[Dict[str, object]]:
     lines: List[Dict[str, object]] = []
     phase, is_lacking = parse_label(label)
     suffix = scaling_suffix(normalize_scaling(row.get("Overwrite Scaling", "")))
-    for element, column in ELEMENT_BASE_COLUMNS:
-        raw = row.get(column, "") or "0"
-        try:
-            value = float(raw)
-        except ValueError:
-            continue
-        if value <= 0:
+    for (element, _), value in zip(ELEMENT_BASE_COLUMNS, numbers.base_values):
+        if value is None or value <= 0:
             continue
         lines.append(
             {
@@ -313,10 +404,10 @@ def build_bullet_lines(
 
 
 def build_weapon_lines(
-    row: Dict[str, str], label: str | None
+    row: Dict[str, str], label: str | None, numbers: RowNumbers
 ) -> List[Dict[str, object]]:
     phase, is_lacking = parse_label(label)
-    element, value = pick_mv_element(row)
+    element, value = numbers.mv_element, numbers.mv_value
     if value <= 0:
         return []
     suffix = scaling_suffix(normalize_scaling(row.get("Overwrite Scaling", "")))
@@ -336,14 +427,10 @@ def build_weapon_lines(
 
 
 def build_status_multiplier_lines(
-    row: Dict[str, str], label: str | None
+    row: Dict[str, str], label: str | None, numbers: RowNumbers
 ) -> List[Dict[str, object]]:
-    raw = row.get("Status MV", "") or "0"
-    try:
-        value = float(raw)
-    except ValueError:
-        return []
-    if value <= 0:
+    value = numbers.status
+    if value is None or value <= 0:
         return []
     phase, is_lacking = parse_label(label)
     multiplier = value / 100.0
@@ -365,20 +452,12 @@ def build_status_multiplier_lines(
 def build_stance_lines(
     row: Dict[str, str],
     label: str | None,
+    numbers: RowNumbers,
     stance_base: float | None = None,
     stance_categories: List[Dict[str, object]] | None = None,
 ) -> List[Dict[str, object]]:
-    raw = row.get("Poise Dmg MV", "") or "0"
-    try:
-        value = float(raw)
-    except ValueError:
-        value = 0.0
-
-    super_raw = row.get("AtkSuperArmor", "") or "0"
-    try:
-        super_armor = float(super_raw)
-    except ValueError:
-        super_armor = 0.0
+    value = numbers.poise
+    super_armor = numbers.super_armor
     if value <= 0 and super_armor <= 0:
         return []
 
@@ -404,61 +483,6 @@ def build_stance_lines(
     ]
 
 
-def load_unique_poise_bases(path: Path) -> Dict[str, float]:
-    base_map: Dict[str, float] = {}
-    with path.open() as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            weapon = (row.get("Weapon") or "").strip().lower()
-            if not weapon:
-                continue
-            try:
-                base = float(row.get("Base") or 0)
-            except ValueError:
-                continue
-            base_map[weapon] = base
-    return base_map
-
-
-def load_aow_categories(
-    equip_path: Path,
-    category_map: Dict[str, Dict[str, object]],
-    base_poise_map: Dict[str, float] | None = None,
-) -> Dict[str, List[Dict[str, object]]]:
-    mapping: Dict[str, List[Dict[str, object]]] = defaultdict(list)
-    cat_keys = set(category_map.keys())
-    with equip_path.open() as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                mount_text = int(row.get("mountWepTextId", "0"))
-            except ValueError:
-                mount_text = -1
-            if mount_text == -1:
-                continue
-            name = (row.get("Name") or "").replace("Ash of War:", "").strip()
-            if not name:
-                continue
-            key_name = name.lower()
-            for cat_key in cat_keys:
-                if row.get(cat_key, "0") == "1":
-                    poise_val = category_map[cat_key]["poise"]
-                    if (poise_val is None or poise_val == "") and base_poise_map is not None:
-                        fallback = base_poise_map.get(
-                            str(category_map[cat_key].get("name", "")).lower()
-                        )
-                        if fallback is not None:
-                            poise_val = fallback
-                    mapping[key_name].append(
-                        {
-                            "key": cat_key,
-                            "name": category_map[cat_key]["name"],
-                            "poise": poise_val,
-                        }
-                    )
-    return mapping
-
-
 def merge_duplicate_rows(rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
     grouped: Dict[str, List[Dict[str, str]]] = defaultdict(list)
     for row in rows:
@@ -594,21 +618,77 @@ def find_aow_categories(
     return None
 
 
+def name_tokens(text: str) -> FrozenSet[str]:
+    return frozenset(tok for tok in re.split(r"[^a-z0-9]+", text.lower()) if len(tok) >= 3)
+
+
+class CategoryIndex:
+    """
+    Weapon categories per skill, narrowed to a row's weapon label. Category
+    names are lowercased and split into their "/" parts and >=3-char tokens
+    once; results are memoized per (skill, weapon label).
+    """
+
+    def __init__(self, aow_categories: Dict[str, List[Dict[str, object]]]) -> None:
+        self.aow_categories = aow_categories
+        # Category name -> (lowercase name, name and "/" parts, tokens).
+        self.names: Dict[str, Tuple[str, FrozenSet[str], FrozenSet[str]]] = {}
+        for cats in aow_categories.values():
+            for cat in cats:
+                name = str(cat.get("name", ""))
+                if name not in self.names:
+                    lower = name.lower()
+                    parts = frozenset(p.strip() for p in lower.split("/")) | {lower}
+                    self.names[name] = (lower, parts, name_tokens(lower))
+        self.memo: Dict[Tuple[str, str], List[Dict[str, object]] | None] = {}
+
+    def lookup(self, skill_name: str, weapon_label: str) -> List[Dict[str, object]] | None:
+        key = (skill_name, weapon_label)
+        if key not in self.memo:
+            self.memo[key] = self._resolve(skill_name, weapon_label)
+        return self.memo[key]
+
+    def _resolve(self, skill_name: str, weapon_label: str) -> List[Dict[str, object]] | None:
+        stance_categories = find_aow_categories(skill_name, self.aow_categories)
+        if not stance_categories or not weapon_label:
+            return stance_categories
+        label_lower = weapon_label.lower()
+        indexed = [(cat, self.names[str(cat.get("name", ""))]) for cat in stance_categories]
+        # Exact name or one of its "/" parts, then substring either way, then
+        # any shared >=3-char token.
+        filtered = [cat for cat, (_, parts, _) in indexed if label_lower in parts]
+        if not filtered:
+            filtered = [
+                cat
+                for cat, (lower, _, _) in indexed
+                if label_lower in lower or lower in label_lower
+            ]
+        if not filtered:
+            label_tokens = name_tokens(label_lower)
+            if label_tokens:
+                filtered = [cat for cat, (_, _, tokens) in indexed if label_tokens & tokens]
+        return filtered or stance_categories
+
+
 def build_lines_for_row(
     row: Dict[str, str],
     stance_base: float | None,
     stance_categories: List[Dict[str, object]] | None,
+    numbers: RowNumbers | None = None,
 ) -> List[Dict[str, object]]:
-    weapon_lines = build_weapon_lines(row, row.get("label"))
+    if numbers is None:
+        numbers = row_numbers(row)
+    weapon_lines = build_weapon_lines(row, row.get("label"), numbers)
     bullet_lines = (
-        build_bullet_lines(row, row.get("label"))
-        if (row.get("isAddBaseAtk", "").upper() == "TRUE" or has_base_damage(row))
+        build_bullet_lines(row, row.get("label"), numbers)
+        if (row.get("isAddBaseAtk", "").upper() == "TRUE" or numbers.has_base_damage)
         else []
     )
-    status_lines = build_status_multiplier_lines(row, row.get("label"))
+    status_lines = build_status_multiplier_lines(row, row.get("label"), numbers)
     stance_lines = build_stance_lines(
         row,
         row.get("label"),
+        numbers,
         stance_base=stance_base,
         stance_categories=stance_categories,
     )
@@ -805,6 +885,7 @@ def apply_stance_scaling(
     super_lacking_values: List[float],
     factors: List[float],
     present_flags: List[bool],
+    use_numpy: bool = False,
 ) -> Tuple[List[object], List[object]]:
     lacking_src = lacking_values if lacking_values else [0] * max(1, len(values))
     super_src = super_values if super_values else [0] * max(1, len(values))
@@ -817,29 +898,46 @@ def apply_stance_scaling(
         super_lacking_src.extend([0] * (len(lacking_src) - len(super_lacking_src)))
 
     max_len_local = max(len(values), len(lacking_src))
-    combined_vals: List[object] = []
-    combined_lacks: List[object] = []
-    for idx in range(max_len_local):
-        base_val = values[idx] if idx < len(values) else 0
-        base_super = super_src[idx] if idx < len(super_src) else 0
-        scaled = [
-            (base_val if base_val is not None else 0) * f + base_super for f in factors
-        ]
-        mn, mx = min(scaled), max(scaled)
-        combined_vals.append((mn, mx) if abs(mx - mn) > 1e-9 else mn)
 
-        lack_val = lacking_src[idx] if idx < len(lacking_src) else 0
-        lack_super = super_lacking_src[idx] if idx < len(super_lacking_src) else 0
-        scaled_lack = [
-            (lack_val if lack_val is not None else 0) * f + lack_super for f in factors
+    def padded(seq: Sequence[object]) -> List[object]:
+        return [
+            (seq[idx] if seq[idx] is not None else 0) if idx < len(seq) else 0
+            for idx in range(max_len_local)
         ]
-        mn_l, mx_l = min(scaled_lack), max(scaled_lack)
-        combined_lacks.append((mn_l, mx_l) if abs(mx_l - mn_l) > 1e-9 else mn_l)
 
+    scale = scale_stance_ranges_numpy if use_numpy else scale_stance_ranges
+    combined_vals = scale(padded(values), padded(super_src), factors)
+    combined_lacks = scale(padded(lacking_src), padded(super_lacking_src), factors)
     return combined_vals, combined_lacks
 
 
-def build_line_entries(entries: List[Dict[str, object]]) -> List[Dict[str, object]]:
+def scale_stance_ranges(
+    values: Sequence[float], supers: Sequence[float], factors: Sequence[float]
+) -> List[object]:
+    """value * factor + super for every factor, as min or (min, max) per slot."""
+    out: List[object] = []
+    for value, super_armor in zip(values, supers):
+        scaled = [value * f + super_armor for f in factors]
+        mn, mx = min(scaled), max(scaled)
+        out.append((mn, mx) if abs(mx - mn) > 1e-9 else mn)
+    return out
+
+
+def scale_stance_ranges_numpy(
+    values: Sequence[float], supers: Sequence[float], factors: Sequence[float]
+) -> List[object]:
+    """scale_stance_ranges over a slots x factors array."""
+    scaled = np.outer(np.asarray(values, dtype=float), np.asarray(factors, dtype=float))
+    scaled += np.asarray(supers, dtype=float)[:, None]
+    return [
+        (mn, mx) if abs(mx - mn) > 1e-9 else mn
+        for mn, mx in zip(scaled.min(axis=1).tolist(), scaled.max(axis=1).tolist())
+    ]
+
+
+def build_line_entries(
+    entries: List[Dict[str, object]], use_numpy: bool = False
+) -> List[Dict[str, object]]:
     order = {"physical": 0, "elemental": 1, "status": 2, "stance": 3}
 
     hash_groups: Dict[str, List[Dict[str, object]]] = defaultdict(list)
@@ -1002,6 +1100,7 @@ def build_line_entries(entries: List[Dict[str, object]]) -> List[Dict[str, objec
                 super_lacking_values,
                 factors,
                 present_flags,
+                use_numpy=use_numpy,
             )
             def all_zero(seq: List[object]) -> bool:
                 def is_zero(v):
@@ -1784,6 +1883,9 @@ def main() -> None:
     args = parse_args()
     input_path = Path(args.input)
     output_path = Path(args.output)
+    use_numpy = args.numpy
+    if use_numpy and np is None:
+        raise SystemExit("--numpy needs the 'numpy' package (pip install numpy).")
 
     only_skills = load_only_skills(args.only_skills, args.only_skills_file)
     only_filter = make_only_filter(only_skills)
@@ -1791,95 +1893,60 @@ def main() -> None:
     ready_names = load_ready_names(Path(args.ready_path), args.ready_only)
     ready_filter = make_ready_filter(ready_names)
 
-    unique_poise_bases = load_unique_poise_bases(
-        Path("docs/(1.16.1)-Poise-Damage-MVs.csv")
-    )
-    weapon_category_map = json.loads(
-        Path("docs/weapon_categories_poise.json").read_text()
-    )
-    aow_categories = load_aow_categories(
-        Path("PARAM/EquipParamGem.csv"), weapon_category_map, unique_poise_bases
-    )
+    reference = load_reference()
+    unique_poise_bases = reference.poise_bases
+    category_index = CategoryIndex(reference.aow_categories)
+
+    if input_path.resolve() == ATTACK_DATA_CSV:
+        input_rows = reference.attack_rows()
+    else:
+        with input_path.open(newline="") as csv_file:
+            input_rows = list(csv.DictReader(csv_file))
 
     grouped_variants: Dict[Tuple[str, str], Dict[str, object]] = {}
-    with input_path.open(newline="") as csv_file:
-        reader = csv.DictReader(csv_file)
-        merged_rows = merge_duplicate_rows(list(reader))
-        for row in merged_rows:
-            weapon_prefix, name_wo_prefix = extract_weapon_prefix(row["Name"])
-            unique_weapon = (row.get("Unique Skill Weapon") or "").strip()
-            weapon_label = unique_weapon or (weapon_prefix or "")
-
-            base_no_hash_raw, hash_id = strip_hash_variant(name_wo_prefix)
-            base_name, label = split_skill_name(base_no_hash_raw)
-            base_name, hand_mode = extract_hand_mode(base_name)
-            base_no_hash = base_name
-
-            stance_base = None
-            stance_categories = None
-            if unique_weapon:
-                stance_base = unique_poise_bases.get(unique_weapon.lower())
-            else:
-                stance_categories = find_aow_categories(base_no_hash, aow_categories)
-                if stance_categories and weapon_label:
-                    label_lower = weapon_label.lower()
-                    filtered = []
-                    for cat in stance_categories:
-                        name = str(cat.get("name", ""))
-                        parts = [p.strip().lower() for p in name.split("/")]
-                        if label_lower == name.lower() or label_lower in parts:
-                            filtered.append(cat)
-                    if not filtered:
-                        fuzzy = [
-                            cat
-                            for cat in stance_categories
-                            if label_lower in str(cat.get("name", "")).lower()
-                            or str(cat.get("name", "")).lower() in label_lower
-                        ]
-                        filtered = fuzzy
-                    if not filtered:
-                        label_tokens = {
-                            tok
-                            for tok in re.split(r"[^a-z0-9]+", label_lower)
-                            if len(tok) >= 3
-                        }
-                        if label_tokens:
-                            filtered = []
-                            for cat in stance_categories:
-                                cat_tokens = {
-                                    tok
-                                    for tok in re.split(
-                                        r"[^a-z0-9]+", str(cat.get("name", "")).lower()
-                                    )
-                                    if len(tok) >= 3
-                                }
-                                if label_tokens & cat_tokens:
-                                    filtered.append(cat)
-                    if filtered:
-                        stance_categories = filtered
-
-            row = dict(row)
-            row["label"] = label
-            row["hash_id"] = hash_id
-            row["hand_mode"] = hand_mode
-
-            lines = build_lines_for_row(row, stance_base, stance_categories)
-            if not lines:
-                continue
+    merged_rows = merge_duplicate_rows(input_rows)
+    numbers_by_row = (
+        batch_row_numbers(merged_rows) if use_numpy else [None] * len(merged_rows)
+    )
+    for row, numbers in zip(merged_rows, numbers_by_row):
+        weapon_prefix, name_wo_prefix = extract_weapon_prefix(row["Name"])
+        unique_weapon = (row.get("Unique Skill Weapon") or "").strip()
+        weapon_label = unique_weapon or (weapon_prefix or "")
+
+        base_no_hash_raw, hash_id = strip_hash_variant(name_wo_prefix)
+        base_name, label = split_skill_name(base_no_hash_raw)
+        base_name, hand_mode = extract_hand_mode(base_name)
+        base_no_hash = base_name
+
+        stance_base = None
+        stance_categories = None
+        if unique_weapon:
+            stance_base = unique_poise_bases.get(unique_weapon.lower())
+        else:
+            stance_categories = category_index.lookup(base_no_hash, weapon_label)
 
-            key = (canonical_skill_name(base_no_hash), weapon_label)
-            entry = grouped_variants.setdefault(
-                key,
-                {
-                    "raw_name": base_no_hash,
-                    "weapon": weapon_label,
-                    "lines": [],
-                    "is_unique": bool(unique_weapon),
-                },
-            )
-            entry["lines"].extend(lines)
-            if hand_mode and not entry.get("hand_mode"):
-                entry["hand_mode"] = hand_mode
+        row = dict(row)
+        row["label"] = label
+        row["hash_id"] = hash_id
+        row["hand_mode"] = hand_mode
+
+        lines = build_lines_for_row(row, stance_base, stance_categories, numbers)
+        if not lines:
+            continue
+
+        key = (canonical_skill_name(base_no_hash), weapon_label)
+        entry = grouped_variants.setdefault(
+            key,
+            {
+                "raw_name": base_no_hash,
+                "weapon": weapon_label,
+                "lines": [],
+                "is_unique": bool(unique_weapon),
+            },
+        )
+        entry["lines"].extend(lines)
+        if hand_mode and not entry.get("hand_mode"):
+            entry["hand_mode"] = hand_mode
 
     variant_entries: List[Dict[str, object]] = []
     for (_, weapon_label), data in grouped_variants.items():
@@ -1893,7 +1960,7 @@ def main() -> None:
             {
                 "name": data["raw_name"],
                 "weapon": weapon_label,
-                "lines": build_line_entries(data["lines"]),
+                "lines": build_line_entries(data["lines"], use_numpy=use_numpy),
                 "is_charged": bool(
                     re.search(r"\s+charged$", data["raw_name"], flags=re.IGNORECASE)
                 ),
@@ -0,0 +1,204 @@
+"""
+Precomputed join graph between the params behavior_lookup and skill_dump walk.
+
+Building it scans each table once; afterwards every hop is a dict lookup or a
+bisect instead of a pass over all rows:
+
+    graph = load_behavior_graph()
+    graph.skill("1043")                  # ("1043", "0"): swordArtsParamId, variation
+    graph.behavior_ids("0", [430, 440])  # BehaviorParam_PC IDs with a refId
+    graph.magic_refs("1043")             # Magic refId* slots starting with "1043"
+    graph.bullet("2250")                 # BulletEdges(atk_id="30200921", sp_effects=["1730", "1731"])
+
+The graph is persisted as JSON next to the PARAM cache and rebuilt whenever
+one of its source tables (CSV or regulation.bin) changes size or mtime.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from helpers.params import CACHE_DIR, PARAM_DIR, REGULATION_BIN, load_param, param_source
+
+GRAPH_VERSION = 1
+
+# BehaviorParam_PC.refType / Magic.refCategory{n} -> referenced table.
+REF_TABLES = {"0": "AtkParam_Pc", "1": "Bullet", "2": "SpEffectParam"}
+
+SOURCE_TABLES = ("BehaviorParam_PC", "Magic", "Bullet", "EquipParamWeapon", "EquipParamGem")
+MAGIC_REF_SLOTS = range(1, 11)
+BULLET_SP_EFFECT_COLUMNS = ("spEffectId0", "spEffectId1", "spEffectId2", "spEffectId3", "spEffectId4")
+
+
+class MagicRef(NamedTuple):
+    magic_id: str
+    slot: int
+    ref: str
+    category: Optional[str]
+
+
+class BulletEdges(NamedTuple):
+    atk_id: Optional[str]
+    sp_effects: List[str]
+
+
+def bullet_sp_effects(row: Mapping[str, str]) -> List[str]:
+    ids: List[str] = []
+    for key in BULLET_SP_EFFECT_COLUMNS:
+        val = row.get(key)
+        if val and val not in ("-1", "0"):
+            ids.append(val)
+    return ids
+
+
+class BehaviorGraph:
+    def __init__(self, data: dict) -> None:
+        self.data = data
+        self._behaviors: Dict[str, List[str]] = data["behaviors"]
+        # (ref text, magic row position, slot, magic ID, category), sorted by ref.
+        self._magic_refs: List[list] = data["magic_refs"]
+        self._magic_keys = [entry[0] for entry in self._magic_refs]
+        self._bullets: Dict[str, list] = data["bullets"]
+        self._gems: Dict[str, str] = data["gems"]
+        self._weapons_by_id: Dict[str, list] = data["weapons_by_id"]
+        self._weapons_by_sword_arts: Dict[str, list] = data["weapons_by_sword_arts"]
+
+    @classmethod
+    def build(cls, param_dir: Path = PARAM_DIR) -> "BehaviorGraph":
+        behavior_rows = load_param(
+            "BehaviorParam_PC", param_dir, columns=("ID", "variationId", "behaviorJudgeId", "refType", "refId")
+        )
+        magic_rows = load_param("Magic", param_dir)
+        bullet_rows = load_param("Bullet", param_dir, columns=("ID", "atkId_Bullet", *BULLET_SP_EFFECT_COLUMNS))
+        weapon_rows = load_param(
+            "EquipParamWeapon", param_dir, columns=("ID", "swordArtsParamId", "behaviorVariationId")
+        )
+        gem_rows = load_param("EquipParamGem", param_dir, columns=("ID", "swordArtsParamId"))
+
+        behaviors: Dict[str, List[str]] = {}
+        bullet_ids = set()
+        for row in behavior_rows:
+            if row.get("refId") in (None, "-1"):
+                continue
+            behaviors.setdefault(f"{row['variationId']}:{row['behaviorJudgeId']}", []).append(row["ID"])
+            if row.get("refType") == "1":
+                bullet_ids.add(row["refId"])
+
+        magic_refs: List[list] = []
+        ref_columns = [(slot, f"refId{slot}", f"refCategory{slot}") for slot in MAGIC_REF_SLOTS]
+        for pos, row in enumerate(magic_rows):
+            for slot, ref_col, cat_col in ref_columns:
+                rid = row.get(ref_col)
+                if not rid or rid == "-1":
+                    continue
+                category = row.get(cat_col)
+                magic_refs.append([rid, pos, slot, row.get("ID"), category])
+                if category == "1":
+                    bullet_ids.add(rid)
+        magic_refs.sort(key=lambda entry: entry[0])
+
+        bullets: Dict[str, list] = {}
+        for bullet_id in sorted(bullet_ids):
+            bullet = bullet_rows.get(bullet_id)
+            if bullet is not None:
+                bullets[bullet_id] = [bullet.get("atkId_Bullet"), bullet_sp_effects(bullet)]
+
+        gems = {row["ID"]: row.get("swordArtsParamId") for row in gem_rows}
+        weapons_by_id: Dict[str, list] = {}
+        weapons_by_sword_arts: Dict[str, list] = {}
+        for pos, row in enumerate(weapon_rows):
+            entry = [pos, row.get("swordArtsParamId"), row.get("behaviorVariationId")]
+            weapons_by_id.setdefault(row.get("ID"), entry)
+            weapons_by_sword_arts.setdefault(row.get("swordArtsParamId"), entry)
+
+        return cls(
+            {
+                "version": GRAPH_VERSION,
+                "behaviors": behaviors,
+                "magic_refs": magic_refs,
+                "bullets": bullets,
+                "gems": gems,
+                "weapons_by_id": weapons_by_id,
+                "weapons_by_sword_arts": weapons_by_sword_arts,
+            }
+        )
+
+    def behavior_ids(self, variation: str, judges: Iterable[object]) -> List[str]:
+        """BehaviorParam_PC IDs (with a refId) for ``variation`` and any of ``judges``, sorted by numeric ID."""
+        ids: List[str] = []
+        for judge in dict.fromkeys(str(j) for j in judges):
+            ids.extend(self._behaviors.get(f"{variation}:{judge}", []))
+        return sorted(ids, key=int)
+
+    def magic_refs(self, prefix: str) -> List[MagicRef]:
+        """Magic refId{1..10} slots whose ID starts with ``prefix``, in row/slot order."""
+        lo = bisect_left(self._magic_keys, prefix)
+        hi = lo
+        while hi < len(self._magic_keys) and self._magic_keys[hi].startswith(prefix):
+            hi += 1
+        hits = sorted(self._magic_refs[lo:hi], key=lambda entry: (entry[1], entry[2]))
+        return [MagicRef(magic_id, slot, ref, category) for ref, _, slot, magic_id, category in hits]
+
+    def bullet(self, bullet_id: Optional[str]) -> Optional[BulletEdges]:
+        """Atk/SpEffect edges of a referenced Bullet; None when the Bullet row does not exist."""
+        edges = self._bullets.get(bullet_id) if bullet_id is not None else None
+        return BulletEdges(*edges) if edges is not None else None
+
+    def skill(self, skill_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        (swordArtsParamId, behaviorVariationId) for a skill ID: an Ash of War
+        (EquipParamGem.ID) has variation "0"; otherwise the first weapon whose
+        ID or swordArtsParamId matches; otherwise (skill_id, None).
+        """
+        if skill_id in self._gems:
+            return self._gems[skill_id], "0"
+        candidates = [
+            entry
+            for entry in (self._weapons_by_id.get(skill_id), self._weapons_by_sword_arts.get(skill_id))
+            if entry is not None
+        ]
+        if candidates:
+            _, sword_arts, variation = min(candidates, key=lambda entry: entry[0])
+            return sword_arts, variation or None
+        return skill_id, None
+
+
+def _sources_key(param_dir: Path) -> str:
+    stamps = []
+    for name in SOURCE_TABLES:
+        path = param_source(name, param_dir, REGULATION_BIN)
+        try:
+            stat = path.stat()
+        except OSError:
+            stamps.append([name, str(path), -1, -1])
+            continue
+        stamps.append([name, str(path), stat.st_size, stat.st_mtime_ns])
+    return hashlib.sha1(json.dumps([GRAPH_VERSION, stamps]).encode("utf-8")).hexdigest()
+
+
+def load_behavior_graph(param_dir: Path = PARAM_DIR, cache_dir: Optional[Path] = CACHE_DIR) -> BehaviorGraph:
+    """The graph for ``param_dir``, from ``cache_dir`` when its sources are unchanged."""
+    cache_path: Optional[Path] = None
+    if cache_dir is not None:
+        cache_path = cache_dir / f"behavior_graph-{_sources_key(Path(param_dir))[:20]}.json"
+        try:
+            data = json.loads(cache_path.read_text(encoding="utf-8"))
+            if data.get("version") == GRAPH_VERSION:
+                return BehaviorGraph(data)
+        except (OSError, ValueError):
+            pass
+    graph = BehaviorGraph.build(param_dir)
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_suffix(f".tmp{os.getpid()}")
+            tmp.write_text(json.dumps(graph.data), encoding="utf-8")
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass
+    return graph
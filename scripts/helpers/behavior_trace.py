@@ -0,0 +1,142 @@
+"""
+Structured Magic / BehaviorParam_PC chain traces (the JSON side of
+behavior_lookup), shared by its batch mode and the param query daemon.
+
+Every hop goes through ``helpers.behavior_graph``; each chain record carries
+the Atk/Bullet it ends in and whether it looks like a dummy/VFX helper
+(Bullet ``atkAttribute=254`` or ``isAttackSFX=0``, AtkParam_Pc
+``atkAttribute=254``; see csv_skill_extraction_notes.md):
+
+    tables = load_tables()
+    trace_skill(tables, {"id": 1043, "name": "..."}, judges=[430, 440])
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Iterable, List, Mapping, NamedTuple, Optional
+
+from helpers.behavior_graph import REF_TABLES, BehaviorGraph, load_behavior_graph
+from helpers.params import PARAM_DIR, ROOT, ParamTable, load_param
+
+SKILLS_FILE = ROOT / "work/responses/ready/skill.json"
+
+DUMMY_ATK_ATTRIBUTE = "254"
+ATK_COLUMNS = ("atkPhys", "atkMag", "atkFire", "atkThun", "atkDark", "atkStam", "atkAttribute", "atkType")
+
+
+class Tables(NamedTuple):
+    graph: BehaviorGraph
+    behavior: ParamTable
+    bullet: ParamTable
+    atk: ParamTable
+    spe: ParamTable
+
+
+def load_tables(param_dir: Path = PARAM_DIR) -> Tables:
+    return Tables(
+        graph=load_behavior_graph(param_dir),
+        behavior=load_param("BehaviorParam_PC", param_dir),
+        bullet=load_param("Bullet", param_dir),
+        atk=load_param("AtkParam_Pc", param_dir),
+        spe=load_param("SpEffectParam", param_dir),
+    )
+
+
+def dummy_reasons(bullet: Optional[Mapping[str, str]], atk: Optional[Mapping[str, str]]) -> List[str]:
+    reasons: List[str] = []
+    if bullet is not None:
+        if bullet.get("atkAttribute") == DUMMY_ATK_ATTRIBUTE:
+            reasons.append(f"bullet.atkAttribute={DUMMY_ATK_ATTRIBUTE}")
+        if bullet.get("isAttackSFX") == "0":
+            reasons.append("bullet.isAttackSFX=0")
+    if atk is not None and atk.get("atkAttribute") == DUMMY_ATK_ATTRIBUTE:
+        reasons.append(f"atk.atkAttribute={DUMMY_ATK_ATTRIBUTE}")
+    return reasons
+
+
+def atk_record(atk_id: Optional[str], atk: Optional[Mapping[str, str]]) -> Optional[dict]:
+    if atk is None:
+        return None
+    return {"id": atk_id, **{key: atk.get(key) for key in ATK_COLUMNS}}
+
+
+def chain_record(tables: Tables, ref_type: Optional[str], ref_id: Optional[str]) -> dict:
+    """Follow one refType/refCategory + refId hop into Atk/Bullet/SpEffect and flag dummies."""
+    label = REF_TABLES.get(ref_type or "", "unknown")
+    record: dict = {"table": label, "refId": ref_id, "found": False}
+    bullet = atk = None
+    if label == "AtkParam_Pc":
+        atk = tables.atk.get(ref_id)
+        record["found"] = atk is not None
+        record["atk"] = atk_record(ref_id, atk)
+    elif label == "Bullet":
+        bullet = tables.bullet.get(ref_id)
+        edges = tables.graph.bullet(ref_id)
+        if bullet is not None and edges is not None:
+            atk = tables.atk.get(edges.atk_id)
+            record["found"] = True
+            record["bullet"] = {
+                "atkId": edges.atk_id,
+                "hitBullet": bullet.get("HitBulletID"),
+                "life": bullet.get("life"),
+                "dist": bullet.get("dist"),
+                "atkAttribute": bullet.get("atkAttribute"),
+                "isAttackSFX": bullet.get("isAttackSFX"),
+            }
+            record["atk"] = atk_record(edges.atk_id, atk)
+            record["spEffects"] = [sid for sid in edges.sp_effects if tables.spe.get(sid) is not None]
+    elif label == "SpEffectParam":
+        record["found"] = tables.spe.get(ref_id) is not None
+    reasons = dummy_reasons(bullet, atk)
+    record["dummy"] = bool(reasons)
+    if reasons:
+        record["dummyReasons"] = reasons
+    return record
+
+
+def magic_chains(tables: Tables, prefix: str) -> List[dict]:
+    """Chains of every Magic refId{n} slot starting with ``prefix`` (a swordArtsParamId)."""
+    return [
+        {"magicId": magic_id, "slot": slot, **chain_record(tables, cat, rid)}
+        for magic_id, slot, rid, cat in tables.graph.magic_refs(prefix)
+    ]
+
+
+def behavior_chains(tables: Tables, variation: str, judges: Iterable[object]) -> List[dict]:
+    """Chains of the BehaviorParam_PC rows for ``variation`` and any of ``judges``."""
+    chains: List[dict] = []
+    for row_id in tables.graph.behavior_ids(variation, judges):
+        row = tables.behavior.get(row_id)
+        chains.append(
+            {
+                "behaviorParamPcId": row_id,
+                "judge": row.get("behaviorJudgeId"),
+                **chain_record(tables, row.get("refType"), row.get("refId")),
+            }
+        )
+    return chains
+
+
+def trace_skill(tables: Tables, skill: Mapping[str, object], judges: Iterable[object]) -> dict:
+    """Magic and BehaviorParam_PC chains for one skill.json entry, with its trace time."""
+    start = time.perf_counter()
+    skill_id = str(skill.get("id"))
+    sword_arts_id, variation = tables.graph.skill(skill_id)
+    variation = variation or "0"
+
+    magic = magic_chains(tables, sword_arts_id) if sword_arts_id else []
+    behaviors = behavior_chains(tables, variation, judges)
+    chains = magic + behaviors
+    return {
+        "id": skill_id,
+        "name": skill.get("name"),
+        "swordArtsParamId": sword_arts_id,
+        "variation": variation,
+        "chains": len(chains),
+        "dummyChains": sum(1 for chain in chains if chain["dummy"]),
+        "magic": magic,
+        "behaviors": behaviors,
+        "ms": round((time.perf_counter() - start) * 1000, 3),
+    }
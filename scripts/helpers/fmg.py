@@ -0,0 +1,37 @@
+"""
+Read exported FMG XMLs (WitchyBND ``*.fmg.xml``) into ``{text ID: text}`` maps.
+
+    texts = load_fmg_dir()           # vanilla/item-msgbnd-dcx by default
+    texts["ArtsName"][103]           # "Spinning Slash"
+
+Placeholder entries (empty or ``%null%``) are dropped.
+"""
+
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict
+
+from helpers.params import ROOT
+
+FMG_DIR = ROOT / "vanilla/item-msgbnd-dcx"
+FMG_SUFFIX = ".fmg.xml"
+
+
+def read_fmg(path: Path) -> Dict[int, str]:
+    entries: Dict[int, str] = {}
+    for node in ET.parse(path).getroot().iter("text"):
+        text = node.text
+        if not text or text == "%null%":
+            continue
+        try:
+            entries[int(node.attrib["id"])] = text
+        except (KeyError, ValueError):
+            continue
+    return entries
+
+
+def load_fmg_dir(root: Path = FMG_DIR) -> Dict[str, Dict[int, str]]:
+    """Every ``*.fmg.xml`` under ``root``, keyed by FMG name (e.g. "ArtsName")."""
+    return {path.name[: -len(FMG_SUFFIX)]: read_fmg(path) for path in sorted(Path(root).glob(f"*{FMG_SUFFIX}"))}
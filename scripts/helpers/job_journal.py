@@ -0,0 +1,134 @@
+"""
+Append-only journal of plan-run jobs, for resuming run_plan.py.
+
+Each line of the JSONL file is one state change, fsynced before the run
+moves on, so a killed run loses at most the line being written:
+
+    {"at": 1760000000.0, "key": "ARM001_batch_0001#3f2a9c01de", "state": "failed",
+     "attempt": 1, "seconds": 41.2, "output": "work/responses/pending/...", "reason": "exit 1"}
+
+States are queued, running, succeeded, failed and salvaged (clean_pending.py
+repaired a failed job's output). Replaying the file gives each job's latest
+state and attempt count; ``run_plan.py --resume`` skips finished jobs and
+retries failed or interrupted ones once their exponential backoff has passed:
+
+    journal = JobJournal(JOURNAL_PATH)
+    state = journal.jobs.get(key)
+    if state is None or state.state not in FINISHED:
+        await asyncio.sleep(max(0.0, retry_at(state, base=30) - time.time()))
+
+A job's key is its batch name plus a hash of its item ids, so a regenerated
+plan that reuses batch names never matches records of different items.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+JOURNAL_PATH = Path("work/run_journal.jsonl")
+STATES = ("queued", "running", "succeeded", "failed", "salvaged")
+FINISHED = frozenset({"succeeded", "salvaged"})
+BACKOFF_CAP = 15 * 60.0
+
+
+class JobState(NamedTuple):
+    key: str
+    state: str
+    attempts: int
+    # Unix time of the latest record.
+    at: float
+    seconds: Optional[float] = None
+    output: Optional[str] = None
+    reason: Optional[str] = None
+
+
+def job_key(name: str, ids: Iterable[object]) -> str:
+    digest = hashlib.sha1(",".join(str(i) for i in ids).encode("utf-8")).hexdigest()[:10]
+    return f"{name}#{digest}"
+
+
+def backoff(attempts: int, base: float, cap: float = BACKOFF_CAP) -> float:
+    """Seconds to wait before attempt ``attempts + 1``: base, 2*base, 4*base, ..."""
+    if attempts <= 0:
+        return 0.0
+    return min(cap, base * 2 ** (attempts - 1))
+
+
+def retry_at(state: Optional[JobState], base: float, cap: float = BACKOFF_CAP) -> float:
+    """Earliest Unix time a failed job should run again (0 when not failed)."""
+    if state is None or state.state != "failed":
+        return 0.0
+    return state.at + backoff(state.attempts, base, cap)
+
+
+def _fold(jobs: Dict[str, JobState], record: Dict) -> None:
+    key = record["key"]
+    prior = jobs.get(key)
+    attempts = max(prior.attempts if prior else 0, int(record.get("attempt") or 0))
+    jobs[key] = JobState(
+        key=key,
+        state=record["state"],
+        attempts=attempts,
+        at=float(record.get("at") or 0.0),
+        seconds=record.get("seconds", prior.seconds if prior else None),
+        output=record.get("output") or (prior.output if prior else None),
+        reason=record.get("reason"),
+    )
+
+
+def replay(path: Path) -> Dict[str, JobState]:
+    """Latest state per job key; a torn final line (killed mid-write) is ignored."""
+    jobs: Dict[str, JobState] = {}
+    try:
+        with Path(path).open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and record.get("state") in STATES and record.get("key"):
+                    _fold(jobs, record)
+    except FileNotFoundError:
+        pass
+    return jobs
+
+
+class JobJournal:
+    def __init__(self, path: Path = JOURNAL_PATH) -> None:
+        self.path = Path(path)
+        self.jobs = replay(self.path)
+
+    def record(self, key: str, state: str, **fields: object) -> None:
+        self.record_many([key], state, **fields)
+
+    def record_many(self, keys: List[str], state: str, **fields: object) -> None:
+        """Append one record per key with a single fsync."""
+        if state not in STATES:
+            raise ValueError(f"unknown job state: {state}")
+        if not keys:
+            return
+        now = time.time()
+        records = [{"at": now, "key": key, "state": state, **fields} for key in keys]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        for record in records:
+            _fold(self.jobs, record)
+
+    def job_for_output(self, output: Path) -> Optional[str]:
+        """The key of the latest job that wrote ``output``, if any."""
+        target = Path(output).resolve()
+        found: Optional[JobState] = None
+        for state in self.jobs.values():
+            if state.output and Path(state.output).resolve() == target:
+                if found is None or state.at >= found.at:
+                    found = state
+        return found.key if found else None
@@ -0,0 +1,150 @@
+"""
+Parsed numeric layouts for AoW stat strings such as ``"12, 15 | 0 [6-18]"``.
+
+Stages 3 and 4 compare layouts and sum values by splitting the same strings
+into separator and number tokens over and over, often re-reading a value an
+earlier step just built. ``NumericText`` is the parsed form of one string:
+its tokens, the numeric tokens as written, their (low, high) values and the
+layout shape. The splitters are memoized by text, so each distinct string is
+tokenized once per process and the sum/merge helpers work on the vectors:
+
+    parsed = split_ranges("12, 15 [6-18]")
+    parsed.numbers     # ("12", "15", "6-18")
+    parsed.ranges      # ((12.0, 12.0), (15.0, 15.0), (6.0, 18.0))
+    parsed.render(["1", "2", "3"])  # "1, 2 [3]"
+
+Rows still carry text: a sum is rendered as soon as it is stored, because
+re-splitting the rendered text is what defines the next step's layout (the
+numbers "5" and "-3" in "5-3" can sum to "6" and "-1", and "6-1" then reads
+back as one range).
+
+``split_numbers`` reads every signed number on its own ("6-18" is 6 and -18);
+``split_ranges`` keeps "6-18" as one range token.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import NamedTuple, Sequence, Tuple
+
+NUMBER = re.compile(r"(-?\d+(?:\.\d+)?)")
+RANGE_TOKEN = re.compile(r"-?\d+(?:\.\d+)?(?:-?\d+(?:\.\d+)?)?")
+RANGE_VALUE = re.compile(r"(-?\d+(?:\.\d+)?)(?:-(-?\d+(?:\.\d+)?))?")
+# Distinct strings per process are in the low thousands; the bound only
+# matters for long-lived processes.
+CACHE_SIZE = 1 << 16
+
+Token = Tuple[str, str]
+
+
+class NumericText(NamedTuple):
+    tokens: Tuple[Token, ...]
+    numbers: Tuple[str, ...]
+    ranges: Tuple[Tuple[float, float], ...]
+    # Separators with "{n}" in place of each number.
+    shape: Tuple[str, ...]
+
+    @property
+    def count(self) -> int:
+        return len(self.numbers)
+
+    @property
+    def kinds(self) -> Tuple[str, ...]:
+        """The "num"/"sep" sequence, ignoring what the separators say."""
+        return tuple(kind for kind, _ in self.tokens)
+
+    def is_zero(self) -> bool:
+        """True when there is at least one number and every number is 0."""
+        return bool(self.ranges) and all(low == 0 and high == 0 for low, high in self.ranges)
+
+    def render(self, numbers: Sequence[str]) -> str:
+        """The separators with ``numbers`` in place of the numeric tokens."""
+        rebuilt = []
+        num_idx = 0
+        for kind, val in self.tokens:
+            if kind == "num":
+                if num_idx < len(numbers):
+                    rebuilt.append(numbers[num_idx])
+                num_idx += 1
+            else:
+                rebuilt.append(val)
+        return "".join(rebuilt)
+
+
+def _parsed(tokens: Sequence[Token], ranged: bool) -> NumericText:
+    numbers = tuple(val for kind, val in tokens if kind == "num")
+    if ranged:
+        ranges = tuple(parse_range_value(val) for val in numbers)
+    else:
+        ranges = tuple((float(val), float(val)) for val in numbers)
+    shape = tuple("{n}" if kind == "num" else val for kind, val in tokens)
+    return NumericText(tuple(tokens), numbers, ranges, shape)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def split_numbers(text: str) -> NumericText:
+    tokens = []
+    for idx, part in enumerate(NUMBER.split(text or "")):
+        if part == "":
+            continue
+        tokens.append(("num" if idx % 2 == 1 else "sep", part))
+    return _parsed(tokens, ranged=False)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def split_ranges(text: str) -> NumericText:
+    tokens = []
+    cursor = 0
+    src = text or ""
+    for match in RANGE_TOKEN.finditer(src):
+        start, end = match.span()
+        if start > cursor:
+            tokens.append(("sep", src[cursor:start]))
+        tokens.append(("num", match.group(0)))
+        cursor = end
+    if cursor < len(src):
+        tokens.append(("sep", src[cursor:]))
+    if not tokens:
+        tokens.append(("sep", ""))
+    return _parsed(tokens, ranged=True)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_range_value(value: str) -> Tuple[float, float]:
+    text = (value or "").strip()
+    m = RANGE_VALUE.fullmatch(text)
+    if m:
+        first = float(m.group(1))
+        second = float(m.group(2)) if m.group(2) is not None else first
+        return (first, second) if first <= second else (second, first)
+    nums = [float(n) for n in NUMBER.findall(text)]
+    if not nums:
+        return 0.0, 0.0
+    return (min(nums), max(nums))
+
+
+def shape_with_ranges(text: str) -> Tuple[Tuple[str, ...], int]:
+    parsed = split_ranges(text)
+    return parsed.shape, parsed.count
+
+
+def zeros_only(text: str) -> bool:
+    return split_numbers(text or "").is_zero()
+
+
+def fmt_number(value: float) -> str:
+    if value.is_integer():
+        return str(int(value))
+    text = f"{value:.3f}".rstrip("0").rstrip(".")
+    return text
+
+
+def format_range(low: float, high: float) -> str:
+    return fmt_number(low) if low == high else f"{fmt_number(low)}-{fmt_number(high)}"
+
+
+def clear_caches() -> None:
+    """Drop memoized parses (benchmarks use this to time cold runs)."""
+    for fn in (split_numbers, split_ranges, parse_range_value):
+        fn.cache_clear()
@@ -0,0 +1,374 @@
+"""
+In-memory PARAM / FMG / behavior-graph query service behind param_daemon.py,
+plus the client side used by param_query.py.
+
+The daemon loads the tables once and answers JSON requests of the form
+``{"op": "<name>", ...arguments}`` with ``{"ok": true, "result": ...}`` or
+``{"ok": false, "error": "..."}``, over either transport:
+
+- Unix socket (default ``work/.cache/param_daemon.sock``): one JSON object per
+  line in each direction; a connection may send any number of requests.
+- Localhost HTTP: ``GET /<op>?arg=value`` or ``POST /<op>`` with a JSON body.
+
+Operations (see ``ParamService.query_*``): ping, tables, row, find, join,
+skill, trace, behavior, magic, text, search, shutdown.
+
+    service = ParamService()
+    service.dispatch({"op": "row", "table": "Bullet", "id": 2250})
+    query({"op": "trace", "skill": 1043, "judges": [430]})   # from a client
+"""
+
+from __future__ import annotations
+
+import http.server
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from helpers.behavior_trace import Tables, behavior_chains, load_tables, magic_chains, trace_skill
+from helpers.fmg import FMG_DIR, load_fmg_dir
+from helpers.params import PARAM_DIR, REGULATION_BIN, ROOT, ParamTable, load_param
+
+SOCKET_PATH = ROOT / "work/.cache/param_daemon.sock"
+DEFAULT_PORT = 8765
+
+# Loaded at startup on top of the trace tables, so the first lookup is warm too.
+PRELOAD_TABLES = ("Magic", "EquipParamWeapon", "EquipParamGem", "SwordArtsParam")
+SEARCH_LIMIT = 50
+
+
+class QueryError(ValueError):
+    """A request the service cannot answer (unknown op, bad or missing argument)."""
+
+
+def _id_list(value: object) -> List[str]:
+    """Accept [430, 440], "430,440" or "430 440"."""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value]
+    return [part for part in str(value).replace(",", " ").split() if part]
+
+
+class ParamService:
+    def __init__(
+        self,
+        param_dir: Path = PARAM_DIR,
+        fmg_dir: Optional[Path] = FMG_DIR,
+        behavior_map: Optional[Path] = None,
+        preload: Sequence[str] = PRELOAD_TABLES,
+    ) -> None:
+        self.param_dir = Path(param_dir)
+        self.started = time.time()
+        self.stopping = False
+        self.tables: Tables = load_tables(self.param_dir)
+        self.fmg: Dict[str, Dict[int, str]] = load_fmg_dir(fmg_dir) if fmg_dir and Path(fmg_dir).is_dir() else {}
+        self.behavior_map: Dict[str, List[int]] = (
+            json.loads(Path(behavior_map).read_text(encoding="utf-8")) if behavior_map else {}
+        )
+        self._loaded: Dict[str, ParamTable] = {table.name: table for table in self.tables[1:]}
+        # ParamTable decodes columns and builds indexes lazily; keep that single-threaded.
+        self._lock = threading.Lock()
+        for name in preload:
+            self.table(name)
+
+    def table(self, name: str) -> ParamTable:
+        table = self._loaded.get(name)
+        if table is None:
+            try:
+                table = load_param(name, self.param_dir)
+            except (FileNotFoundError, KeyError) as exc:
+                raise QueryError(f"unknown table {name!r}: {exc}") from None
+            self._loaded[name] = table
+        return table
+
+    def dispatch(self, request: Mapping[str, object]) -> dict:
+        args = dict(request)
+        op = str(args.pop("op", ""))
+        handler: Optional[Callable[..., object]] = getattr(self, f"query_{op}", None)
+        try:
+            if handler is None:
+                raise QueryError(f"unknown op {op!r}")
+            with self._lock:
+                return {"ok": True, "result": handler(**args)}
+        except TypeError as exc:
+            return {"ok": False, "error": f"{op}: {exc}"}
+        except (QueryError, KeyError, ValueError) as exc:
+            return {"ok": False, "error": str(exc)}
+
+    # --- operations ---------------------------------------------------------
+
+    def query_ping(self) -> dict:
+        return {"pid": os.getpid(), "uptime": round(time.time() - self.started, 1), "tables": len(self._loaded)}
+
+    def query_tables(self, available: object = False) -> dict:
+        result: dict = {"loaded": {name: len(table) for name, table in sorted(self._loaded.items())}}
+        if str(available).lower() not in ("", "0", "false", "no"):
+            names = {path.stem for path in self.param_dir.glob("*.csv")}
+            if REGULATION_BIN.exists():
+                from helpers.regulation import Regulation
+
+                names.update(Regulation.open(REGULATION_BIN).table_names())
+            result["available"] = sorted(names)
+        return result
+
+    def query_row(self, table: str, id: object, columns: object = None) -> Optional[dict]:
+        row = self.table(table).get(id)
+        if row is None:
+            return None
+        wanted = _id_list(columns)
+        return {key: row.get(key) for key in wanted} if wanted else dict(row)
+
+    def query_find(self, table: str, column: str, value: object, limit: object = SEARCH_LIMIT) -> List[dict]:
+        param = self.table(table)
+        if column not in param.columns:
+            raise QueryError(f"{table} has no column {column!r}")
+        return [dict(row) for row in param.find(column, value)[: int(limit)]]
+
+    def query_join(self, table: str, id: object, column: str, target: str) -> dict:
+        """Follow ``table[id].column`` as an ID into ``target``."""
+        row = self.table(table).get(id)
+        if row is None:
+            raise QueryError(f"{table}: no row with ID {id}")
+        if column not in row:
+            raise QueryError(f"{table} has no column {column!r}")
+        ref = row.get(column)
+        linked = self.table(target).get(ref)
+        return {"row": dict(row), "ref": ref, "target": dict(linked) if linked is not None else None}
+
+    def query_skill(self, skill: object) -> dict:
+        sword_arts_id, variation = self.tables.graph.skill(str(skill))
+        return {"id": str(skill), "name": self._skill_name(skill), "swordArtsParamId": sword_arts_id, "variation": variation or "0"}
+
+    def query_trace(self, skill: object, judges: object = None) -> dict:
+        judge_ids = _id_list(judges) if judges is not None else self.behavior_map.get(str(skill), [])
+        return trace_skill(self.tables, {"id": skill, "name": self._skill_name(skill)}, judge_ids)
+
+    def query_behavior(self, variation: object, judges: object) -> List[dict]:
+        return behavior_chains(self.tables, str(variation), _id_list(judges))
+
+    def query_magic(self, prefix: object) -> List[dict]:
+        return magic_chains(self.tables, str(prefix))
+
+    def query_text(self, fmg: str, id: object) -> Optional[str]:
+        if fmg not in self.fmg:
+            raise QueryError(f"unknown FMG {fmg!r}")
+        return self.fmg[fmg].get(int(id))
+
+    def query_search(self, text: str, fmg: object = None, table: object = None, limit: object = SEARCH_LIMIT) -> List[dict]:
+        """
+        Case-insensitive substring search over FMG names (every ``*Name`` FMG,
+        or just ``fmg``) or, with ``table``, over that table's Name column.
+        """
+        needle = str(text).lower()
+        limit = int(limit)
+        hits: List[dict] = []
+        if table is not None:
+            param = self.table(str(table))
+            if "Name" not in param.columns:
+                raise QueryError(f"{table} has no Name column")
+            for row in param:
+                if needle in (row.get("Name") or "").lower():
+                    if len(hits) >= limit:
+                        break
+                    hits.append({"table": param.name, "id": row.get("ID"), "text": row.get("Name")})
+            return hits
+        names = [str(fmg)] if fmg is not None else [name for name in self.fmg if name.endswith("Name")]
+        for name in names:
+            for text_id, value in self.fmg.get(name, {}).items():
+                if needle in value.lower():
+                    if len(hits) >= limit:
+                        return hits
+                    hits.append({"fmg": name, "id": text_id, "text": value})
+        return hits
+
+    def query_shutdown(self) -> str:
+        # The transport answers first, then stops its server; see serve().
+        self.stopping = True
+        return "bye"
+
+    def _skill_name(self, skill: object) -> Optional[str]:
+        try:
+            text_id = int(skill)  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            return None
+        return self.fmg.get("ArtsName", {}).get(text_id) or self.fmg.get("GemName", {}).get(text_id)
+
+
+# --- transports ---------------------------------------------------------------
+
+
+class _UnixHandler(socketserver.StreamRequestHandler):
+    server: "_UnixServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+                response = self.server.service.dispatch(request)
+            except ValueError as exc:
+                response = {"ok": False, "error": f"bad request: {exc}"}
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if self.server.service.stopping:
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: Path, service: ParamService) -> None:
+        self.service = service
+        super().__init__(str(path), _UnixHandler)
+
+
+class _HttpHandler(http.server.BaseHTTPRequestHandler):
+    server: "_HttpServer"
+
+    def _respond(self, response: dict) -> None:
+        body = json.dumps(response, ensure_ascii=False).encode("utf-8")
+        self.send_response(200 if response["ok"] else 400)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.server.service.stopping:
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    def do_GET(self) -> None:
+        url = urllib.parse.urlsplit(self.path)
+        request: dict = {key: values[-1] for key, values in urllib.parse.parse_qs(url.query).items()}
+        request["op"] = url.path.strip("/") or "ping"
+        self._respond(self.server.service.dispatch(request))
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as exc:
+            self._respond({"ok": False, "error": f"bad request: {exc}"})
+            return
+        request.setdefault("op", urllib.parse.urlsplit(self.path).path.strip("/"))
+        self._respond(self.server.service.dispatch(request))
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+
+class _HttpServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: ParamService) -> None:
+        self.service = service
+        super().__init__(address, _HttpHandler)
+
+
+def serve(
+    service: ParamService,
+    socket_path: Optional[Path] = SOCKET_PATH,
+    http_port: Optional[int] = None,
+    on_ready: Optional[Callable[[str], None]] = None,
+) -> None:
+    """Serve until a shutdown request (or Ctrl-C) on the Unix socket and/or localhost HTTP."""
+    servers: List[socketserver.BaseServer] = []
+    if socket_path is not None:
+        socket_path = Path(socket_path)
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if socket_path.exists():
+            if _socket_alive(socket_path):
+                raise QueryError(f"a daemon is already listening on {socket_path}")
+            socket_path.unlink()
+        servers.append(_UnixServer(socket_path, service))
+    if http_port is not None:
+        servers.append(_HttpServer(("127.0.0.1", http_port), service))
+    if not servers:
+        raise QueryError("nothing to serve: give a socket path and/or an HTTP port")
+
+    threads = [threading.Thread(target=server.serve_forever, daemon=True) for server in servers]
+    for thread in threads:
+        thread.start()
+    if on_ready is not None:
+        for server in servers:
+            address = server.server_address
+            on_ready(f"http://127.0.0.1:{address[1]}" if isinstance(address, tuple) else str(address))
+    try:
+        # Any server stopping (shutdown op) stops them all.
+        while all(thread.is_alive() for thread in threads):
+            threads[0].join(0.2)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+        if socket_path is not None:
+            try:
+                socket_path.unlink()
+            except OSError:
+                pass
+
+
+# --- client -------------------------------------------------------------------
+
+
+def _socket_alive(path: Path) -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(path))
+        return True
+    except OSError:
+        return False
+
+
+def query(
+    request: Mapping[str, object],
+    socket_path: Path = SOCKET_PATH,
+    http: Optional[str] = None,
+    timeout: float = 30.0,
+) -> dict:
+    """
+    Send one request to a running daemon and return its response. ``http`` is
+    a base URL (``http://127.0.0.1:8765``); otherwise the Unix socket is used.
+    Raises ConnectionError when no daemon answers.
+    """
+    payload = json.dumps(request).encode("utf-8")
+    if http is not None:
+        url = f"{http.rstrip('/')}/{request.get('op', '')}"
+        http_request = urllib.request.Request(url, data=payload, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(http_request, timeout=timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as exc:
+            return json.loads(exc.read())
+        except urllib.error.URLError as exc:
+            raise ConnectionError(f"no param daemon at {http}: {exc.reason}") from None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(socket_path))
+            sock.sendall(payload + b"\n")
+            chunks: List[bytes] = []
+            while not chunks or not chunks[-1].endswith(b"\n"):
+                chunk = sock.recv(1 << 16)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError as exc:
+        raise ConnectionError(f"no param daemon on {socket_path}: {exc}") from None
+    return json.loads(b"".join(chunks))
+
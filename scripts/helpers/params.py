@@ -0,0 +1,524 @@
+"""
+Shared loader for the exported PARAM CSVs.
+
+Each table is parsed once per process into a columnar ``ParamTable`` (one typed
+sequence per column plus an ID index) and persisted to a binary cache keyed by
+the CSV's content hash, so warm loads skip CSV parsing entirely.
+
+Rows are exposed as read-only mappings of column -> original cell text, so code
+written against ``csv.DictReader`` rows keeps working unchanged:
+
+    weapons = load_param("EquipParamWeapon", columns=["swordArtsParamId"])
+    row = weapons.get("1000000")
+    row.get("swordArtsParamId")          # "100" (text, as in the CSV)
+    weapons.column("swordArtsParamId")   # array('i', [...]) typed values
+
+Columns are decoded on first access. The cache stores one segment per column
+and is memory-mapped, so a caller that reads 5 of EquipParamWeapon's 275
+columns only pays for those 5; ``columns=`` decodes the listed ones up front
+and rejects unknown names.
+
+Tables with no exported CSV are read straight out of ``regulation.bin`` (see
+``helpers.regulation``), so ``load_param("SpEffectParam")`` works without an
+export step as long as the Paramdex defs are available.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+ROOT = Path(__file__).resolve().parents[2]
+PARAM_DIR = ROOT / "PARAM"
+CACHE_DIR = ROOT / "work/.cache/params"
+REGULATION_BIN = ROOT / "regulation.bin"
+
+# Bump when the on-disk layout changes so stale caches are ignored.
+CACHE_VERSION = 2
+CACHE_MAGIC = b"PRMC"
+_HEADER = struct.Struct("<4sI")
+
+# Integer columns use the narrowest typecode that holds every value.
+INT_TYPES: Tuple[str, ...] = ("b", "h", "i", "q")
+FLOAT_TYPE = "d"
+STR_TYPE = "s"
+_STR_SEP = "\0"
+
+Column = Union[array, List[str]]
+IdKey = Union[int, str]
+
+
+def _float_text(value: float) -> str:
+    text = repr(value)
+    return text[:-2] if text.endswith(".0") else text
+
+
+def int_array(values: List[int]) -> array:
+    """``values`` in the narrowest INT_TYPES array that holds them all."""
+    if not values:
+        return array("q")
+    lo, hi = min(values), max(values)
+    for code in INT_TYPES:
+        bound = 1 << (array(code).itemsize * 8 - 1)
+        if -bound <= lo and hi < bound:
+            return array(code, values)
+    raise OverflowError("integer column exceeds int64")
+
+
+def _infer_column(values: List[str]) -> Tuple[str, Column]:
+    """
+    Store a column as int/float arrays when every cell round-trips to the
+    exact same text; anything else stays a list of strings.
+    """
+    try:
+        ints = [int(v) for v in values]
+        if all(str(i) == v for i, v in zip(ints, values)):
+            arr = int_array(ints)
+            return arr.typecode, arr
+    except (ValueError, OverflowError):
+        pass
+    try:
+        floats = [float(v) for v in values]
+        if all(_float_text(f) == v for f, v in zip(floats, values)):
+            return FLOAT_TYPE, array(FLOAT_TYPE, floats)
+    except ValueError:
+        pass
+    return STR_TYPE, values
+
+
+def _render_column(kind: str, values: Column) -> List[str]:
+    if kind in INT_TYPES:
+        return [str(v) for v in values]
+    if kind == FLOAT_TYPE:
+        return [_float_text(v) for v in values]
+    return list(values)
+
+
+def _encode_column(kind: str, values: Column) -> bytes:
+    if kind == STR_TYPE:
+        return _STR_SEP.join(values).encode("utf-8")
+    return values.tobytes()  # type: ignore[union-attr]
+
+
+def _decode_column(kind: str, raw: memoryview, row_count: int) -> Column:
+    if kind == STR_TYPE:
+        return str(raw, "utf-8").split(_STR_SEP) if row_count else []
+    values = array(kind)
+    values.frombytes(raw)
+    return values
+
+
+class ParamRow(Mapping[str, str]):
+    """Read-only view of one table row; values are the original cell text."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "ParamTable", index: int) -> None:
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, column: str) -> str:
+        return self._table.text_column(column)[self._index]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.columns)
+
+    def __len__(self) -> int:
+        return len(self._table.columns)
+
+    def __contains__(self, column: object) -> bool:
+        return column in self._table._column_set
+
+    def __repr__(self) -> str:
+        return f"ParamRow({self._table.name}, ID={self.get('ID')})"
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    def value(self, column: str) -> object:
+        """Typed value (int/float/str) for this row."""
+        return self._table.column(column)[self._index]
+
+
+ColumnLoader = Callable[[str], Tuple[str, Column]]
+
+
+class ParamTable:
+    """
+    Columnar PARAM table. Iterating yields ``ParamRow`` views in file order;
+    ``get``/``by_id`` resolve rows through the ID index. Column values come
+    from ``loader`` the first time each column is touched.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        columns: Sequence[str],
+        row_count: int,
+        loader: ColumnLoader,
+    ) -> None:
+        self.name = name
+        self.columns: List[str] = list(columns)
+        self._column_set = frozenset(self.columns)
+        self._row_count = row_count
+        self._loader = loader
+        self._kinds: Dict[str, str] = {}
+        self._data: Dict[str, Column] = {}
+        self._text: Dict[str, List[str]] = {}
+        self._indexes: Dict[str, Dict[str, List[int]]] = {}
+        self._id_index: Optional[Dict[int, int]] = None
+
+    def __len__(self) -> int:
+        return self._row_count
+
+    def __iter__(self) -> Iterator[ParamRow]:
+        for idx in range(self._row_count):
+            yield ParamRow(self, idx)
+
+    def __repr__(self) -> str:
+        return (
+            f"ParamTable({self.name}, rows={self._row_count}, "
+            f"columns={len(self.columns)}, decoded={len(self._data)})"
+        )
+
+    def _decode(self, column: str) -> None:
+        if column not in self._column_set:
+            raise KeyError(column)
+        kind, values = self._loader(column)
+        self._kinds[column] = kind
+        self._data[column] = values
+
+    def require(self, columns: Iterable[str]) -> "ParamTable":
+        """Decode ``columns`` now; raises KeyError naming any unknown ones."""
+        wanted = list(columns)
+        missing = [col for col in wanted if col not in self._column_set]
+        if missing:
+            raise KeyError(f"{self.name}: unknown column(s) {', '.join(missing)}")
+        for column in wanted:
+            if column not in self._data:
+                self._decode(column)
+        return self
+
+    @property
+    def decoded_columns(self) -> List[str]:
+        return [col for col in self.columns if col in self._data]
+
+    def kind(self, column: str) -> str:
+        if column not in self._kinds:
+            self._decode(column)
+        return self._kinds[column]
+
+    def column(self, column: str) -> Column:
+        """Typed values for ``column`` (array for numeric columns)."""
+        values = self._data.get(column)
+        if values is None:
+            self._decode(column)
+            values = self._data[column]
+        return values
+
+    def text_column(self, column: str) -> List[str]:
+        """Cell text for ``column``, rendered once and memoized."""
+        text = self._text.get(column)
+        if text is None:
+            text = _render_column(self.kind(column), self.column(column))
+            self._text[column] = text
+        return text
+
+    def records(self, columns: Sequence[str]) -> Iterator[Tuple[str, ...]]:
+        """Cell-text tuples for ``columns`` in row order (no row objects)."""
+        return zip(*(self.text_column(col) for col in columns))
+
+    def row(self, index: int) -> ParamRow:
+        return ParamRow(self, index)
+
+    def _ids(self) -> Dict[int, int]:
+        if self._id_index is None:
+            ids = self.column("ID")
+            if self.kind("ID") in INT_TYPES:
+                self._id_index = {row_id: idx for idx, row_id in enumerate(ids)}
+            else:
+                self._id_index = {}
+                for idx, raw in enumerate(ids):
+                    try:
+                        self._id_index[int(raw)] = idx
+                    except ValueError:
+                        continue
+        return self._id_index
+
+    def get(self, row_id: Optional[IdKey], default=None) -> Optional[ParamRow]:
+        """Row for ``row_id`` (int or numeric text), mirroring ``dict.get``."""
+        if row_id is None:
+            return default
+        try:
+            key = int(row_id)
+        except (TypeError, ValueError):
+            return default
+        idx = self._ids().get(key)
+        return default if idx is None else ParamRow(self, idx)
+
+    def by_id(self, row_id: IdKey) -> ParamRow:
+        row = self.get(row_id)
+        if row is None:
+            raise KeyError(f"{self.name}: no row with ID {row_id}")
+        return row
+
+    def __contains__(self, row_id: object) -> bool:
+        return self.get(row_id) is not None  # type: ignore[arg-type]
+
+    def index(self, column: str) -> Dict[str, List[int]]:
+        """Cell text -> row indices for ``column`` (built once per column)."""
+        index = self._indexes.get(column)
+        if index is None:
+            index = {}
+            for idx, text in enumerate(self.text_column(column)):
+                index.setdefault(text, []).append(idx)
+            self._indexes[column] = index
+        return index
+
+    def find(self, column: str, value: object) -> List[ParamRow]:
+        """Rows whose ``column`` text equals ``str(value)``."""
+        return [ParamRow(self, idx) for idx in self.index(column).get(str(value), [])]
+
+
+def _parse_csv(text: str) -> Tuple[List[str], List[List[str]], int]:
+    reader = csv.reader(io.StringIO(text, newline=""))
+    header = next(reader, [])
+    # Exports end every header line with a trailing comma. csv.DictReader
+    # reports that as a "" fieldname (every row gets a "" key); nothing reads
+    # it, so it is dropped here and rows have no "" column.
+    while header and header[-1] == "":
+        header.pop()
+    width = len(header)
+    records = [
+        record if len(record) >= width else record + [""] * (width - len(record))
+        for record in reader
+        if record
+    ]
+    cells = [list(col) for col in zip(*records)] if records else [[] for _ in header]
+    return header, cells[:width], len(records)
+
+
+def _table_from_csv(name: str, text: str) -> ParamTable:
+    header, cells, row_count = _parse_csv(text)
+    by_name = dict(zip(header, cells))
+    return ParamTable(
+        name, header, row_count, lambda column: _infer_column(by_name[column])
+    )
+
+
+def _cache_path(cache_dir: Path, name: str, digest: str) -> Path:
+    return cache_dir / f"{name}-{digest[:20]}.v{CACHE_VERSION}.bin"
+
+
+def _source_digest(path: Path, stat: os.stat_result, cache_dir: Path) -> str:
+    """
+    SHA-1 of ``path``. The last digest is remembered next to the cache with
+    the file's size/mtime, so unchanged CSVs are not re-read just to hash.
+    """
+    location = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:8]
+    pointer = cache_dir / f"{path.stem}-{location}.digest"
+    stamp = f"{stat.st_size} {stat.st_mtime_ns}"
+    try:
+        recorded_stamp, digest = pointer.read_text().rsplit(" ", 1)
+        if recorded_stamp == stamp:
+            return digest
+    except (OSError, ValueError):
+        pass
+    digest = hashlib.sha1(path.read_bytes()).hexdigest()
+    try:
+        pointer.parent.mkdir(parents=True, exist_ok=True)
+        pointer.write_text(f"{stamp} {digest}")
+    except OSError:
+        pass
+    return digest
+
+
+def _read_cache(path: Path, name: str) -> Optional[ParamTable]:
+    """
+    Map a cache file and return a table whose columns decode straight from
+    their segment on first access. Returns None for missing/stale files.
+    """
+    try:
+        with path.open("rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        magic, header_len = _HEADER.unpack_from(buf, 0)
+        if magic != CACHE_MAGIC:
+            return None
+        header = json.loads(buf[_HEADER.size:_HEADER.size + header_len])
+        if header.get("version") != CACHE_VERSION:
+            return None
+        columns: List[str] = header["columns"]
+        kinds: Dict[str, str] = header["kinds"]
+        segments: Dict[str, List[int]] = header["segments"]
+        row_count: int = header["rows"]
+        if any(column not in kinds or column not in segments for column in columns):
+            return None
+    except (struct.error, ValueError, KeyError, TypeError, AttributeError):
+        # Truncated, garbled or malformed header: treat as a cache miss.
+        return None
+
+    view = memoryview(buf)
+    base = _HEADER.size + header_len
+
+    def load(column: str) -> Tuple[str, Column]:
+        offset, length = segments[column]
+        start = base + offset
+        kind = kinds[column]
+        return kind, _decode_column(kind, view[start:start + length], row_count)
+
+    return ParamTable(name, columns, row_count, load)
+
+
+def _write_cache(path: Path, table: ParamTable) -> None:
+    blobs: List[bytes] = []
+    segments: Dict[str, Tuple[int, int]] = {}
+    offset = 0
+    for column in table.columns:
+        blob = _encode_column(table.kind(column), table.column(column))
+        segments[column] = (offset, len(blob))
+        blobs.append(blob)
+        offset += len(blob)
+    header = json.dumps(
+        {
+            "version": CACHE_VERSION,
+            "columns": table.columns,
+            "kinds": {col: table.kind(col) for col in table.columns},
+            "rows": len(table),
+            "segments": segments,
+        }
+    ).encode("utf-8")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".tmp{os.getpid()}")
+        with tmp.open("wb") as f:
+            f.write(_HEADER.pack(CACHE_MAGIC, len(header)))
+            f.write(header)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp, path)
+    except OSError:
+        # A read-only checkout still works; it just re-parses next time.
+        pass
+
+
+def resolve_param_path(name_or_path: Union[str, Path], param_dir: Path = PARAM_DIR) -> Path:
+    """Accept "EquipParamWeapon", "EquipParamWeapon.csv" or a full path."""
+    path = Path(name_or_path)
+    if path.suffix.lower() != ".csv":
+        path = path.with_name(path.name + ".csv")
+    if not path.is_absolute() and path.parent == Path("."):
+        path = param_dir / path
+    return path
+
+
+def param_source(
+    name_or_path: Union[str, Path],
+    param_dir: Path = PARAM_DIR,
+    regulation: Optional[Path] = REGULATION_BIN,
+) -> Path:
+    """
+    File ``load_param`` reads the table from: the CSV when it exists,
+    otherwise ``regulation`` (when that exists). Does not check the CSV
+    beyond its existence, so a missing table still resolves to the CSV path.
+    """
+    path = resolve_param_path(name_or_path, param_dir).resolve()
+    if not path.exists() and regulation is not None and Path(regulation).exists():
+        return Path(regulation).resolve()
+    return path
+
+
+def param_inputs(
+    name_or_path: Union[str, Path],
+    param_dir: Path = PARAM_DIR,
+    regulation: Optional[Path] = REGULATION_BIN,
+) -> List[Path]:
+    """
+    Files ``load_param`` output depends on, for content-hash manifests: the
+    CSV, or for a table read from ``regulation`` the regulation plus the
+    Paramdex defs/names and decoder module (``helpers.regulation.regulation_inputs``).
+    """
+    path = param_source(name_or_path, param_dir, regulation)
+    if path.suffix.lower() == ".csv":
+        return [path]
+    from helpers.regulation import regulation_inputs
+
+    return regulation_inputs(resolve_param_path(name_or_path, param_dir).stem, path)
+
+
+_LOADED: Dict[Tuple[str, int, int], ParamTable] = {}
+
+
+def load_param(
+    name_or_path: Union[str, Path],
+    param_dir: Path = PARAM_DIR,
+    *,
+    columns: Optional[Sequence[str]] = None,
+    cache_dir: Optional[Path] = CACHE_DIR,
+    regulation: Optional[Path] = REGULATION_BIN,
+) -> ParamTable:
+    """
+    Load a PARAM CSV as a ParamTable. Repeated calls in one process return the
+    same table; across processes the binary cache in ``cache_dir`` (keyed by
+    the CSV content hash) is used. Pass ``cache_dir=None`` to skip the cache.
+
+    ``columns`` lists the columns the caller needs: they are decoded up front
+    (unknown names raise KeyError) and everything else is decoded lazily on
+    first access.
+
+    When the CSV does not exist the table is decoded from ``regulation``
+    instead; FileNotFoundError is raised only when neither is available
+    (``regulation=None`` restricts loading to CSVs).
+    """
+    name = resolve_param_path(name_or_path, param_dir).stem
+    path = param_source(name_or_path, param_dir, regulation)
+    from_regulation = path.suffix.lower() != ".csv"
+    stat = path.stat()
+    memo_key = (f"{path}#{name}", stat.st_size, stat.st_mtime_ns)
+    table = _LOADED.get(memo_key)
+
+    if table is None and from_regulation:
+        # Imported here: helpers.regulation builds on this module.
+        from helpers.regulation import load_regulation_param
+
+        table = load_regulation_param(name, path, cache_dir=cache_dir)
+        _LOADED[memo_key] = table
+    elif table is None:
+        cache_path: Optional[Path] = None
+        if cache_dir is not None:
+            digest = _source_digest(path, stat, cache_dir)
+            cache_path = _cache_path(cache_dir, name, digest)
+            table = _read_cache(cache_path, name)
+        if table is None:
+            table = _table_from_csv(name, path.read_text(encoding="utf-8-sig"))
+            if cache_path is not None:
+                # The cache holds every column, so a cold load decodes all of
+                # them once; later processes only touch what they read.
+                _write_cache(cache_path, table)
+        _LOADED[memo_key] = table
+
+    if columns is not None:
+        table.require(columns)
+    return table
@@ -0,0 +1,100 @@
+"""
+On-disk archive of batch prompts that stores the shared preamble once.
+
+Every batch prompt is ``preamble + SEPARATOR + delta``: the preamble
+(instructions and formatting rules) is the same for a whole plan run, only
+the delta (output path and items) differs. The archive writes each distinct
+preamble once under ``preambles/<sha1>.txt`` and each batch as a small
+``<name>_prompt.delta.txt`` whose first line names its preamble:
+
+    archive = PromptArchive(Path("work/prompts"))
+    path = archive.write("ARM001_batch_0001", preamble, delta)
+    load_prompt(path) == join_prompt(preamble, delta)   # True
+    print(archive.report())   # prompts written, bytes stored vs full prompts
+
+Preamble files are written atomically and never rewritten, so concurrent
+writers (run_plan.py batches, several runs) can share one archive.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+SEPARATOR = "\n\n"
+HEADER_PREFIX = "# preamble sha1:"
+PREAMBLE_DIR = "preambles"
+
+
+def join_prompt(preamble: str, delta: str) -> str:
+    return preamble + SEPARATOR + delta
+
+
+def preamble_digest(preamble: str) -> str:
+    return hashlib.sha1(preamble.encode("utf-8")).hexdigest()
+
+
+def load_prompt(path: Path) -> str:
+    """The full prompt for a ``*_prompt.delta.txt`` file (or a plain prompt file)."""
+    text = Path(path).read_text(encoding="utf-8")
+    header, sep, delta = text.partition("\n")
+    if not header.startswith(HEADER_PREFIX):
+        return text
+    digest = header[len(HEADER_PREFIX):].strip()
+    preamble_path = Path(path).parent / PREAMBLE_DIR / f"{digest}.txt"
+    return join_prompt(preamble_path.read_text(encoding="utf-8"), delta)
+
+
+def _utf8_len(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+class PromptArchive:
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.prompts = 0
+        # Bytes full prompt files would have taken, and bytes actually written.
+        self.full_bytes = 0
+        self.stored_bytes = 0
+        self._known: set = set()
+
+    def preamble_path(self, digest: str) -> Path:
+        return self.root / PREAMBLE_DIR / f"{digest}.txt"
+
+    def prompt_path(self, name: str) -> Path:
+        return self.root / f"{name}_prompt.delta.txt"
+
+    def _store_preamble(self, preamble: str) -> str:
+        digest = preamble_digest(preamble)
+        if digest in self._known:
+            return digest
+        path = self.preamble_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.tmp{os.getpid()}")
+            tmp.write_text(preamble, encoding="utf-8")
+            os.replace(tmp, path)
+            self.stored_bytes += _utf8_len(preamble)
+        self._known.add(digest)
+        return digest
+
+    def write(self, name: str, preamble: str, delta: str) -> Path:
+        """Archive one prompt as ``<name>_prompt.delta.txt``; returns its path."""
+        digest = self._store_preamble(preamble)
+        path = self.prompt_path(name)
+        body = f"{HEADER_PREFIX}{digest}\n{delta}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(body, encoding="utf-8")
+        self.prompts += 1
+        self.full_bytes += _utf8_len(join_prompt(preamble, delta))
+        self.stored_bytes += _utf8_len(body)
+        return path
+
+    def report(self) -> str:
+        saved = self.full_bytes - self.stored_bytes
+        share = saved / self.full_bytes * 100 if self.full_bytes else 0.0
+        return (
+            f"[prompts] {self.prompts} archived in {self.root}: {self.stored_bytes / 1024:.1f} KB stored "
+            f"vs {self.full_bytes / 1024:.1f} KB as full prompts ({saved / 1024:.1f} KB, {share:.0f}% saved)"
+        )
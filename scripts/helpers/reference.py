@@ -0,0 +1,269 @@
+"""
+Parsed reference data shared by generate_skill_stats.py and AoW Stage 1.
+
+Both read the AoW attack-data sheet, the poise MV sheet, EquipParamGem and
+weapon_categories_poise.json. ``load_reference()`` parses them once into
+prebuilt lookups and persists the result to work/.cache/reference/, so running
+one generator after the other (or either one twice) parses nothing again:
+
+    ref = load_reference()
+    ref.attack_rows()                     # attack-data rows, fresh dicts
+    ref.poise_bases["dagger"]             # 3.0 (last row wins, numeric)
+    ref.poise_base_text["dagger"]         # "3" (first row wins, as written)
+    ref.aow_categories["quickstep"]       # [{"key", "name", "poise"}, ...]
+    ref.gem_mounts                        # one GemMount per EquipParamGem row
+    ref.skill_attr_scaling["1"]           # "Str"
+
+The cache is reused while every source still has the size/mtime it was built
+from, or failing that the same content hash; otherwise it is rebuilt.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from helpers.params import ROOT, load_param, param_inputs
+
+ATTACK_DATA_CSV = ROOT / "docs/(1.16.1)-Ashes-of-War-Attack-Data.csv"
+POISE_MV_CSV = ROOT / "docs/(1.16.1)-Poise-Damage-MVs.csv"
+EQUIP_PARAM_GEM_CSV = ROOT / "PARAM/EquipParamGem.csv"
+CATEGORY_POISE_JSON = ROOT / "docs/weapon_categories_poise.json"
+SKILL_ATTR_SCALING_JSON = ROOT / "work/aow_pipeline/skill_attr_scaling.json"
+CACHE_DIR = ROOT / "work/.cache/reference"
+CACHE_VERSION = 1
+
+Category = Dict[str, object]
+
+
+class GemMount(NamedTuple):
+    """The EquipParamGem columns both generators read, per row."""
+
+    name: str
+    default_attr: str
+    mount_text_id: str
+    # weapon_categories_poise.json keys whose flag is "1", in file order.
+    flags: Tuple[str, ...]
+
+
+def reference_sources() -> Dict[str, Path]:
+    """
+    Every file the reference data depends on. EquipParamGem expands to all of
+    ``param_inputs`` (regulation.bin, Paramdex defs/names and decoder when the
+    table has no CSV), so a def change invalidates the cache.
+    """
+    sources = {
+        "attack_data": ATTACK_DATA_CSV,
+        "poise_mvs": POISE_MV_CSV,
+        "categories": CATEGORY_POISE_JSON,
+        "skill_attr_scaling": SKILL_ATTR_SCALING_JSON,
+    }
+    for path in param_inputs(EQUIP_PARAM_GEM_CSV):
+        sources[f"equip_param_gem:{path.name}"] = path
+    return sources
+
+
+def _stamp(path: Path) -> Optional[str]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return f"{stat.st_size} {stat.st_mtime_ns}"
+
+
+def _digest(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha1(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _read_csv(path: Path) -> Tuple[List[str], List[List[str]]]:
+    with path.open(newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        return header, [row for row in reader]
+
+
+def _poise_maps(path: Path) -> Tuple[Dict[str, float], Dict[str, str]]:
+    values: Dict[str, float] = {}
+    texts: Dict[str, str] = {}
+    with path.open() as f:
+        for row in csv.DictReader(f):
+            weapon = (row.get("Weapon") or "").strip().lower()
+            if not weapon:
+                continue
+            texts.setdefault(weapon, (row.get("Base") or "").strip())
+            try:
+                values[weapon] = float(row.get("Base") or 0)
+            except ValueError:
+                continue
+    return values, texts
+
+
+def _skill_attr_scaling(path: Path) -> Dict[str, str]:
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text())
+    except json.JSONDecodeError:
+        return {}
+    mapping: Dict[str, str] = {}
+    for key, payload in data.items():
+        stat = "-"
+        if isinstance(payload, dict):
+            stat_raw = payload.get("stat")
+            if isinstance(stat_raw, str):
+                stat = stat_raw.strip() or "-"
+        mapping[str(key).strip()] = stat
+    return mapping
+
+
+def _aow_categories(
+    gems: List[GemMount],
+    categories: Dict[str, Category],
+    poise_bases: Dict[str, float],
+) -> Dict[str, List[Category]]:
+    """Ash of War name (lowercase) -> mountable categories with their poise."""
+    mapping: Dict[str, List[Category]] = {}
+    for gem in gems:
+        try:
+            mount_text = int(gem.mount_text_id)
+        except ValueError:
+            mount_text = -1
+        if mount_text == -1:
+            continue
+        name = gem.name.replace("Ash of War:", "").strip()
+        if not name:
+            continue
+        for flag in gem.flags:
+            info = categories[flag]
+            poise_val = info["poise"]
+            if poise_val is None or poise_val == "":
+                fallback = poise_bases.get(str(info.get("name", "")).lower())
+                if fallback is not None:
+                    poise_val = fallback
+            mapping.setdefault(name.lower(), []).append(
+                {"key": flag, "name": info["name"], "poise": poise_val}
+            )
+    return mapping
+
+
+def build_reference_data(sources: Dict[str, Path]) -> Dict[str, object]:
+    """Parse every source into the JSON-serializable bundle ReferenceData wraps."""
+    header, rows = _read_csv(sources["attack_data"])
+    poise_bases, poise_base_text = _poise_maps(sources["poise_mvs"])
+    categories: Dict[str, Category] = json.loads(sources["categories"].read_text())
+    gems: List[GemMount] = []
+    for row in load_param(EQUIP_PARAM_GEM_CSV):
+        gems.append(
+            GemMount(
+                name=row.get("Name") or "",
+                default_attr=(row.get("defaultWepAttr") or "").strip(),
+                mount_text_id=(row.get("mountWepTextId") or "").strip(),
+                flags=tuple(flag for flag in categories if (row.get(flag) or "").strip() == "1"),
+            )
+        )
+    return {
+        "attack_header": header,
+        "attack_rows": rows,
+        "poise_bases": poise_bases,
+        "poise_base_text": poise_base_text,
+        "categories": categories,
+        "gem_mounts": [list(gem) for gem in gems],
+        "aow_categories": _aow_categories(gems, categories, poise_bases),
+        "skill_attr_scaling": _skill_attr_scaling(sources["skill_attr_scaling"]),
+    }
+
+
+class ReferenceData:
+    def __init__(self, data: Dict[str, object]) -> None:
+        self.attack_header: List[str] = data["attack_header"]
+        self._attack_rows: List[List[str]] = data["attack_rows"]
+        self.poise_bases: Dict[str, float] = data["poise_bases"]
+        self.poise_base_text: Dict[str, str] = data["poise_base_text"]
+        self.categories: Dict[str, Category] = data["categories"]
+        self.gem_mounts: List[GemMount] = [
+            GemMount(name, attr, mount, tuple(flags)) for name, attr, mount, flags in data["gem_mounts"]
+        ]
+        self.aow_categories: Dict[str, List[Category]] = data["aow_categories"]
+        self.skill_attr_scaling: Dict[str, str] = data["skill_attr_scaling"]
+
+    def attack_rows(self) -> List[Dict[str, str]]:
+        """Attack-data rows as csv.DictReader would yield them; callers may mutate."""
+        header = self.attack_header
+        return [dict(zip(header, row)) for row in self._attack_rows]
+
+
+def _load_cached(path: Path, sources: Dict[str, Path]) -> Optional[Tuple[Dict[str, object], bool]]:
+    """The cached bundle if its sources are unchanged, and whether stamps need refreshing."""
+    try:
+        cached = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if cached.get("version") != CACHE_VERSION:
+        return None
+    recorded = cached.get("sources", {})
+    if set(recorded) != set(sources):
+        return None
+    restamped = False
+    for key, source in sources.items():
+        stamp, digest = recorded[key]
+        if stamp == _stamp(source):
+            continue
+        if digest is None or digest != _digest(source):
+            return None
+        restamped = True
+    return cached["data"], restamped
+
+
+def _write_cached(path: Path, sources: Dict[str, Path], data: Dict[str, object]) -> None:
+    payload = {
+        "version": CACHE_VERSION,
+        "sources": {key: [_stamp(source), _digest(source)] for key, source in sources.items()},
+        "data": data,
+    }
+    tmp = path.with_name(f"{path.name}.tmp{os.getpid()}")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+_LOADED: Dict[Tuple[Optional[str], ...], ReferenceData] = {}
+
+
+def load_reference(cache_dir: Optional[Path] = CACHE_DIR) -> ReferenceData:
+    """
+    The shared reference data. Repeated calls in one process return the same
+    object while the sources are unchanged; across processes the cache in
+    ``cache_dir`` is used. Pass ``cache_dir=None`` to always parse.
+    """
+    sources = reference_sources()
+    memo_key = tuple(_stamp(path) for path in sources.values())
+    ref = _LOADED.get(memo_key)
+    if ref is not None:
+        return ref
+    data: Optional[Dict[str, object]] = None
+    if cache_dir is not None:
+        path = Path(cache_dir) / "reference.json"
+        cached = _load_cached(path, sources)
+        if cached is not None:
+            data, restamped = cached
+            if restamped:
+                # Same content under a new mtime (e.g. a fresh checkout).
+                _write_cached(path, sources, data)
+        else:
+            data = build_reference_data(sources)
+            _write_cached(path, sources, data)
+    if data is None:
+        data = build_reference_data(sources)
+    ref = ReferenceData(data)
+    _LOADED[memo_key] = ref
+    return ref
@@ -0,0 +1,689 @@
+"""
+Read PARAM tables straight out of Elden Ring's regulation.bin.
+
+regulation.bin is AES-256-CBC encrypted; the plaintext is a DCX container
+(ZSTD for current builds, DFLT for older ones) around a BND4 binder holding
+one ``.param`` file per table. This module decrypts the file, decompresses it
+incrementally (only as far as the requested table), and decodes rows with the
+matching Paramdex paramdef into the same ``ParamTable`` row API that
+``helpers.params`` builds from the exported CSVs:
+
+    reg = Regulation.open()
+    reg.table_names()                       # ["ActionButtonParam", ...]
+    spe = reg.table("SpEffectParam")        # ParamTable, same as load_param
+
+Field layouts are not stored in regulation.bin. Point ``paramdef_dir`` at a
+Paramdex checkout (``Paramdex/ER/Defs``); ``names_dir`` (``Paramdex/ER/Names``)
+fills the Name column, which the game files leave empty.
+
+Decryption needs ``cryptography`` and ZSTD needs ``zstandard`` (or Python
+3.14's ``compression.zstd``); both are imported only when a regulation file is
+actually read.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import re
+import struct
+import xml.etree.ElementTree as ET
+import zlib
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from helpers.params import (
+    CACHE_DIR,
+    REGULATION_BIN,
+    ROOT,
+    Column,
+    ParamTable,
+    _cache_path,
+    _float_text,
+    _infer_column,
+    _read_cache,
+    _source_digest,
+    _write_cache,
+    int_array,
+)
+
+PARAMDEF_DIR = ROOT / "Paramdex/ER/Defs"
+NAMES_DIR = ROOT / "Paramdex/ER/Names"
+
+# Elden Ring regulation.bin key (public; used by every param editor).
+ER_REGULATION_KEY = bytes.fromhex(
+    "99bffc366a6bc8c6f5827d093602d676c42892a01c207fb024d3af4e493fef99"
+)
+
+_READ_CHUNK = 1 << 20
+
+
+class RegulationError(ValueError):
+    """regulation.bin (or a paramdef) does not have the expected layout."""
+
+
+def _decrypt(data: bytes, key: bytes) -> bytes:
+    try:
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise RuntimeError(
+            "Reading an encrypted regulation.bin needs the 'cryptography' package "
+            "(pip install cryptography)."
+        ) from exc
+    if len(data) < 32 or len(data) % 16:
+        raise RegulationError("encrypted regulation.bin must be a multiple of 16 bytes")
+    decryptor = Cipher(algorithms.AES(key), modes.CBC(data[:16])).decryptor()
+    return decryptor.update(data[16:]) + decryptor.finalize()
+
+
+def _zstd_reader(payload: bytes) -> Callable[[int], bytes]:
+    try:
+        from compression import zstd  # type: ignore[import-not-found]  # Python 3.14+
+
+        decompressor = zstd.ZstdDecompressor()
+
+        def read_stdlib(size: int) -> bytes:
+            # The stdlib object has no stream reader; feed it in slices.
+            nonlocal payload
+            out = b""
+            while payload and len(out) < size:
+                chunk, payload = payload[:_READ_CHUNK], payload[_READ_CHUNK:]
+                out += decompressor.decompress(chunk)
+            return out
+
+        return read_stdlib
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise RuntimeError(
+            "regulation.bin uses ZSTD compression; install the 'zstandard' package "
+            "(pip install zstandard)."
+        ) from exc
+    reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(payload))
+    return reader.read
+
+
+def _deflate_reader(payload: bytes) -> Callable[[int], bytes]:
+    decompressor = zlib.decompressobj()
+    pos = 0
+
+    def read(size: int) -> bytes:
+        nonlocal pos
+        out = b""
+        while pos < len(payload) and len(out) < size:
+            out += decompressor.decompress(payload[pos:pos + _READ_CHUNK])
+            pos += _READ_CHUNK
+        if pos >= len(payload):
+            out += decompressor.flush()
+        return out
+
+    return read
+
+
+class _DcxStream:
+    """
+    Incrementally decompressed DCX payload. ``view(start, end)`` only
+    decompresses up to ``end``, so tables near the start of the binder are
+    available without inflating the whole ~50 MB file.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        if data[:4] != b"DCX\0":
+            raise RegulationError("missing DCX header after decryption (wrong key?)")
+        self.size, compressed_size = struct.unpack_from(">II", data, 0x1C)
+        fmt = data[0x28:0x2C]
+        payload = data[0x4C:0x4C + compressed_size]
+        if fmt == b"ZSTD":
+            self._read = _zstd_reader(payload)
+        elif fmt == b"DFLT":
+            self._read = _deflate_reader(payload)
+        else:
+            raise RegulationError(f"unsupported DCX compression {fmt!r}")
+        self._buf = bytearray()
+
+    def view(self, start: int, end: int) -> memoryview:
+        while len(self._buf) < end:
+            chunk = self._read(max(_READ_CHUNK, end - len(self._buf)))
+            if not chunk:
+                raise RegulationError("DCX payload ended early")
+            self._buf += chunk
+        return memoryview(self._buf)[start:end]
+
+
+class _RawStream:
+    def __init__(self, data: bytes) -> None:
+        self._data = memoryview(data)
+        self.size = len(data)
+
+    def view(self, start: int, end: int) -> memoryview:
+        if end > len(self._data):
+            raise RegulationError("binder data ended early")
+        return self._data[start:end]
+
+
+@dataclass(frozen=True)
+class BinderEntry:
+    name: str
+    path: str
+    offset: int
+    size: int
+    id: int
+
+
+def _read_bnd4(stream) -> Tuple[str, Dict[str, BinderEntry]]:
+    """Parse BND4 file headers; returns (binder version, stem -> entry)."""
+    head = stream.view(0, 0x40)
+    if head[:4].tobytes() != b"BND4":
+        raise RegulationError("decompressed regulation is not a BND4 binder")
+    file_count = struct.unpack_from("<i", head, 0x0C)[0]
+    version = head[0x18:0x20].tobytes().rstrip(b"\0").decode("ascii", "replace")
+    header_size, data_start = struct.unpack_from("<qq", head, 0x20)
+    unicode = head[0x30] == 1
+    # Byte 0x0A stores the inverse of the bit-big-endian flag; when that flag
+    # is clear, format and per-file flag bytes are stored bit-reversed.
+    bit_big_endian = head[0x0A] == 0
+    raw_format = head[0x31]
+    keep = bit_big_endian or (raw_format & 0x01 and not raw_format & 0x80)
+    fmt = raw_format if keep else _reverse_bits(raw_format)
+    has_ids = bool(fmt & 0x02)
+    has_names = bool(fmt & 0x0C)
+    long_offsets = bool(fmt & 0x10)
+    has_uncompressed = bool(fmt & 0x20)
+
+    headers = stream.view(0, data_start)
+    entries: Dict[str, BinderEntry] = {}
+    for idx in range(file_count):
+        pos = 0x40 + idx * header_size
+        flags = headers[pos] if bit_big_endian else _reverse_bits(headers[pos])
+        pos += 8
+        size = struct.unpack_from("<q", headers, pos)[0]
+        pos += 8
+        if has_uncompressed:
+            pos += 8
+        if long_offsets:
+            offset = struct.unpack_from("<q", headers, pos)[0]
+            pos += 8
+        else:
+            offset = struct.unpack_from("<I", headers, pos)[0]
+            pos += 4
+        entry_id = -1
+        if has_ids:
+            entry_id = struct.unpack_from("<i", headers, pos)[0]
+            pos += 4
+        path = ""
+        if has_names:
+            name_offset = struct.unpack_from("<I", headers, pos)[0]
+            path = _read_cstring(headers, name_offset, unicode)
+        if flags & 0x01:
+            raise RegulationError(f"{path}: individually compressed binder entries are not supported")
+        stem = re.split(r"[\\/]", path)[-1].rsplit(".", 1)[0] if path else str(entry_id)
+        entries[stem] = BinderEntry(stem, path, offset, size, entry_id)
+    return version, entries
+
+
+def _reverse_bits(value: int) -> int:
+    return int(f"{value:08b}"[::-1], 2)
+
+
+def _read_cstring(buf: memoryview, offset: int, wide: bool) -> str:
+    raw = bytes(buf[offset:offset + 0x400])
+    if wide:
+        end = 0
+        while end + 1 < len(raw) and raw[end:end + 2] != b"\0\0":
+            end += 2
+        return raw[:end].decode("utf-16le")
+    return raw.split(b"\0", 1)[0].decode("shift_jis", "replace")
+
+
+# Paramdef scalar types -> struct codes.
+_SCALAR_CODES = {
+    "s8": "b",
+    "u8": "B",
+    "s16": "h",
+    "u16": "H",
+    "s32": "i",
+    "u32": "I",
+    "b32": "i",
+    "f32": "f",
+    "angle32": "f",
+    "f64": "d",
+}
+_BIT_WIDTHS = {"u8": 8, "s8": 8, "dummy8": 8, "u16": 16, "s16": 16, "u32": 32, "s32": 32, "b32": 32}
+_UNIT_CODES = {8: "B", 16: "H", 32: "I"}
+_DEF_RE = re.compile(
+    r"^\s*(?P<type>\w+)\s+(?P<name>\w+)\s*"
+    r"(?::\s*(?P<bits>\d+))?\s*(?:\[\s*(?P<count>\d+)\s*\])?\s*(?:=.*)?$"
+)
+
+
+@dataclass(frozen=True)
+class ParamField:
+    name: str
+    type: str
+    bits: int = -1
+    count: int = 1
+
+
+@dataclass
+class ParamDef:
+    param_type: str
+    fields: List[ParamField]
+    source: Path
+
+    @classmethod
+    def from_xml(cls, path: Path, reg_version: Optional[int] = None) -> "ParamDef":
+        root = ET.parse(path).getroot()
+        param_type = (root.findtext("ParamType") or "").strip()
+        fields: List[ParamField] = []
+        for node in root.iter("Field"):
+            if reg_version is not None and not _field_in_version(node, reg_version):
+                continue
+            match = _DEF_RE.match(node.get("Def", ""))
+            if not match:
+                raise RegulationError(f"{path.name}: cannot parse field {node.get('Def')!r}")
+            fields.append(
+                ParamField(
+                    name=match["name"],
+                    type=match["type"],
+                    bits=int(match["bits"]) if match["bits"] else -1,
+                    count=int(match["count"]) if match["count"] else 1,
+                )
+            )
+        return cls(param_type, fields, path)
+
+
+def _field_in_version(node: ET.Element, reg_version: int) -> bool:
+    def version(tag: str) -> Optional[int]:
+        raw = node.get(tag) or node.findtext(tag)
+        try:
+            return int(raw) if raw else None
+        except ValueError:
+            return None
+
+    first = version("FirstRegVersion")
+    removed = version("RemovedRegVersion")
+    if first is not None and reg_version < first:
+        return False
+    if removed is not None and reg_version >= removed:
+        return False
+    return True
+
+
+class _RowLayout:
+    """
+    Compiled paramdef: one struct for the whole row plus per-field extractors
+    that turn the unpacked tuples into typed columns. Cell text is the same
+    text Smithbox exports, so tables compare equal to ``PARAM/*.csv``.
+    """
+
+    def __init__(self, paramdef: ParamDef) -> None:
+        codes: List[str] = ["<"]
+        # (column, slot, kind, arg): kind is "value", "float" (struct code),
+        # "bits" (shift, width, signed), "bytes" (dummy8 array) or
+        # "str"/"wstr" (fixed strings).
+        self.extractors: List[Tuple[str, int, str, object]] = []
+        slot = 0
+        bit_width = 0
+        bit_offset = -1
+        for field in paramdef.fields:
+            width = _BIT_WIDTHS.get(field.type)
+            if field.bits > 0 and width is not None:
+                if bit_offset == -1 or width != bit_width or bit_offset + field.bits > bit_width:
+                    codes.append(_UNIT_CODES[width])
+                    slot += 1
+                    bit_width = width
+                    bit_offset = 0
+                signed = field.type.startswith("s")
+                self.extractors.append(
+                    (field.name, slot - 1, "bits", (bit_offset, field.bits, signed))
+                )
+                bit_offset += field.bits
+                continue
+            bit_offset = -1
+            if field.type == "dummy8":
+                codes.append(f"{field.count}s")
+                self.extractors.append((field.name, slot, "bytes", None))
+            elif field.type == "fixstr":
+                codes.append(f"{field.count}s")
+                self.extractors.append((field.name, slot, "str", None))
+            elif field.type == "fixstrW":
+                codes.append(f"{field.count * 2}s")
+                self.extractors.append((field.name, slot, "wstr", None))
+            elif field.type in _SCALAR_CODES:
+                code = _SCALAR_CODES[field.type]
+                if field.count > 1:
+                    raise RegulationError(
+                        f"{paramdef.param_type}.{field.name}: scalar arrays are not supported"
+                    )
+                if code in "fd":
+                    # Unpacked as raw bits so equal values share one rendered text.
+                    codes.append("I" if code == "f" else "Q")
+                    self.extractors.append((field.name, slot, "float", code))
+                else:
+                    codes.append(code)
+                    self.extractors.append((field.name, slot, "value", None))
+            else:
+                raise RegulationError(
+                    f"{paramdef.param_type}.{field.name}: unknown field type {field.type}"
+                )
+            slot += 1
+        self.struct = struct.Struct("".join(codes))
+        self.columns = [name for name, *_ in self.extractors]
+
+    def column(self, column_idx: int, rows: Sequence[tuple]) -> Tuple[str, Column]:
+        """Typed column for ``column_idx``; text matches the CSV export cell for cell."""
+        _, slot, kind, arg = self.extractors[column_idx]
+        if kind == "value":
+            arr = int_array([row[slot] for row in rows])
+            return arr.typecode, arr
+        if kind == "bits":
+            shift, bits, signed = arg  # type: ignore[misc]
+            mask = (1 << bits) - 1
+            values = [(row[slot] >> shift) & mask for row in rows]
+            if signed:
+                values = [v - (1 << bits) if v >> (bits - 1) else v for v in values]
+            arr = int_array(values)
+            return arr.typecode, arr
+        if kind == "float":
+            unpack = struct.Struct("<I" if arg == "f" else "<Q").pack
+            decode = struct.Struct(f"<{arg}").unpack
+            rendered: Dict[int, str] = {}
+            text = []
+            for row in rows:
+                raw = row[slot]
+                cell = rendered.get(raw)
+                if cell is None:
+                    value = decode(unpack(raw))[0]
+                    cell = rendered[raw] = _float32_text(value) if arg == "f" else _float_text(value)
+                text.append(cell)
+            return _infer_column(text)
+        if kind == "bytes":
+            return _infer_column([_bytes_text(row[slot]) for row in rows])
+        if kind == "str":
+            return _infer_column(
+                [row[slot].split(b"\0", 1)[0].decode("shift_jis", "replace") for row in rows]
+            )
+        return _infer_column([_utf16_text(row[slot]) for row in rows])
+
+
+def _bytes_text(raw: bytes) -> str:
+    if len(raw) == 1:
+        return str(raw[0])
+    return "[" + "|".join(str(b) for b in raw) + "]"
+
+
+def _utf16_text(raw: bytes) -> str:
+    text = raw.decode("utf-16le", "replace")
+    return text.split("\0", 1)[0]
+
+
+def _float32_text(value: float) -> str:
+    """Shortest text that round-trips the float32 (how param editors print it)."""
+    if value != value or value in (float("inf"), float("-inf")):
+        return {"nan": "NaN", "inf": "Infinity", "-inf": "-Infinity"}[repr(value)]
+    packed = struct.pack("<f", value)
+    for precision in range(1, 10):
+        text = f"{value:.{precision}g}"
+        if struct.pack("<f", float(text)) == packed:
+            break
+    number = Decimal(text)
+    exponent = number.adjusted()
+    if -5 <= exponent < 15:
+        return format(number, "f")
+    mantissa = format(number.scaleb(-exponent), "f")
+    return f"{mantissa}E{'-' if exponent < 0 else '+'}{abs(exponent):02d}"
+
+
+def _load_names(path: Path) -> Dict[int, str]:
+    names: Dict[int, str] = {}
+    if not path.exists():
+        return names
+    for line in path.read_text(encoding="utf-8").splitlines():
+        row_id, _, name = line.strip().partition(" ")
+        try:
+            names[int(row_id)] = name.strip()
+        except ValueError:
+            continue
+    return names
+
+
+class Regulation:
+    """
+    Random access to the PARAM tables inside a regulation.bin. Nothing past
+    the binder header is decompressed until a table is requested.
+    """
+
+    def __init__(
+        self,
+        data: bytes,
+        *,
+        paramdef_dir: Path = PARAMDEF_DIR,
+        names_dir: Optional[Path] = NAMES_DIR,
+        key: bytes = ER_REGULATION_KEY,
+    ) -> None:
+        if data[:4] == b"BND4":
+            self._stream = _RawStream(data)
+        elif data[:4] == b"DCX\0":
+            self._stream = _DcxStream(data)
+        else:
+            self._stream = _DcxStream(_decrypt(data, key))
+        self.version, self._entries = _read_bnd4(self._stream)
+        self.paramdef_dir = paramdef_dir
+        self.names_dir = names_dir
+        self._defs: Optional[Dict[str, Path]] = None
+
+    @classmethod
+    def open(cls, path: Path = REGULATION_BIN, **kwargs) -> "Regulation":
+        return cls(Path(path).read_bytes(), **kwargs)
+
+    @property
+    def reg_version(self) -> Optional[int]:
+        try:
+            return int(self.version)
+        except ValueError:
+            return None
+
+    def table_names(self) -> List[str]:
+        return sorted(self._entries)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    def param_bytes(self, name: str) -> memoryview:
+        entry = self._entries.get(name)
+        if entry is None:
+            raise KeyError(f"regulation.bin has no param named {name}")
+        return self._stream.view(entry.offset, entry.offset + entry.size)
+
+    def param_type(self, name: str) -> str:
+        data = self.param_bytes(name)
+        return _param_type(data)
+
+    def _paramdef_paths(self) -> Dict[str, Path]:
+        if self._defs is None:
+            self._defs = {}
+            for path in sorted(Path(self.paramdef_dir).glob("*.xml")):
+                try:
+                    param_type = (ET.parse(path).getroot().findtext("ParamType") or "").strip()
+                except ET.ParseError:
+                    continue
+                if param_type:
+                    self._defs.setdefault(param_type, path)
+        return self._defs
+
+    def paramdef_path(self, name: str) -> Path:
+        param_type = self.param_type(name)
+        path = self._paramdef_paths().get(param_type)
+        if path is None:
+            raise FileNotFoundError(
+                f"No paramdef for {name} ({param_type}) in {self.paramdef_dir}; "
+                "check out Paramdex (github.com/soulsmods/Paramdex) at the repo root "
+                f"or export {name}.csv into PARAM/"
+            )
+        return path
+
+    def names_path(self, name: str) -> Optional[Path]:
+        if self.names_dir is None:
+            return None
+        return Path(self.names_dir) / f"{name}.txt"
+
+    def table(self, name: str) -> ParamTable:
+        """Decode ``name`` into a ParamTable (columns render lazily)."""
+        data = self.param_bytes(name)
+        paramdef = ParamDef.from_xml(self.paramdef_path(name), self.reg_version)
+        layout = _RowLayout(paramdef)
+        ids, offsets = _row_headers(data)
+        row_size = _row_size(offsets, data)
+        if row_size is not None and row_size != layout.struct.size:
+            raise RegulationError(
+                f"{name}: paramdef {paramdef.source.name} describes {layout.struct.size}-byte "
+                f"rows but regulation {self.version} stores {row_size}-byte rows"
+            )
+        rows = [layout.struct.unpack_from(data, offset) for offset in offsets]
+        names_path = self.names_path(name)
+        names = _load_names(names_path) if names_path else {}
+        by_column = {column: idx for idx, column in enumerate(layout.columns)}
+
+        def load(column: str) -> Tuple[str, Column]:
+            if column == "ID":
+                arr = int_array(ids)
+                return arr.typecode, arr
+            if column == "Name":
+                return _infer_column([names.get(row_id, "") for row_id in ids])
+            return layout.column(by_column[column], rows)
+
+        return ParamTable(name, ["ID", "Name", *layout.columns], len(ids), load)
+
+
+def _param_type(data: memoryview) -> str:
+    format_2d = data[0x2D]
+    if format_2d & 0x04:
+        offset = struct.unpack_from("<q", data, 0x10)[0]
+        raw = bytes(data[offset:offset + 0x100])
+    else:
+        raw = bytes(data[0x0C:0x2C])
+    return raw.split(b"\0", 1)[0].decode("ascii")
+
+
+def _row_headers(data: memoryview) -> Tuple[List[int], List[int]]:
+    row_count = struct.unpack_from("<H", data, 0x0A)[0]
+    format_2d = data[0x2D]
+    ids: List[int] = []
+    offsets: List[int] = []
+    if format_2d & 0x80:
+        # 64-bit offsets (Elden Ring): int id, pad, int64 data, int64 name.
+        for row_id, _, data_offset, _ in struct.iter_unpack(
+            "<iiqq", data[0x40:0x40 + row_count * 24]
+        ):
+            ids.append(row_id)
+            offsets.append(data_offset)
+    else:
+        start = 0x40 if format_2d & 0x03 else 0x30
+        for row_id, data_offset, _ in struct.iter_unpack(
+            "<iII", data[start:start + row_count * 12]
+        ):
+            ids.append(row_id)
+            offsets.append(data_offset)
+    return ids, offsets
+
+
+def _row_size(offsets: List[int], data: memoryview) -> Optional[int]:
+    gaps = {b - a for a, b in zip(offsets, offsets[1:]) if b > a}
+    return min(gaps) if gaps else None
+
+
+def _dir_signature(directory: Path) -> str:
+    """Cheap fingerprint of a paramdef directory (file names, sizes, mtimes)."""
+    parts = [
+        f"{p.name}:{p.stat().st_size}:{p.stat().st_mtime_ns}"
+        for p in sorted(directory.glob("*.xml"))
+    ]
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _file_digest(path: Optional[Path]) -> str:
+    if path is None or not path.exists():
+        return "-"
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+def regulation_inputs(
+    name: str,
+    regulation: Path = REGULATION_BIN,
+    *,
+    paramdef_dir: Path = PARAMDEF_DIR,
+    names_dir: Optional[Path] = NAMES_DIR,
+) -> List[Path]:
+    """
+    Every file a table decoded from ``regulation`` depends on: the regulation
+    itself, the paramdefs (all of them, as the PARAM cache key does, since
+    picking the right one means decrypting the regulation), the table's names
+    file when there is one, and this module.
+    """
+    inputs = [Path(regulation).resolve(), *sorted(Path(paramdef_dir).glob("*.xml"))]
+    names_path = Path(names_dir) / f"{name}.txt" if names_dir is not None else None
+    if names_path is not None and names_path.exists():
+        inputs.append(names_path)
+    inputs.append(Path(__file__).resolve())
+    return inputs
+
+
+_OPEN: Dict[Tuple[str, int, int], Regulation] = {}
+
+
+def open_regulation(
+    path: Path = REGULATION_BIN,
+    *,
+    paramdef_dir: Path = PARAMDEF_DIR,
+    names_dir: Optional[Path] = NAMES_DIR,
+) -> Regulation:
+    """Regulation for ``path``, opened (and decrypted) once per process."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    key = (str(path), stat.st_size, stat.st_mtime_ns)
+    reg = _OPEN.get(key)
+    if reg is None or reg.paramdef_dir != paramdef_dir or reg.names_dir != names_dir:
+        reg = Regulation.open(path, paramdef_dir=paramdef_dir, names_dir=names_dir)
+        _OPEN[key] = reg
+    return reg
+
+
+def load_regulation_param(
+    name: str,
+    regulation: Path = REGULATION_BIN,
+    *,
+    paramdef_dir: Path = PARAMDEF_DIR,
+    names_dir: Optional[Path] = NAMES_DIR,
+    cache_dir: Optional[Path] = CACHE_DIR,
+) -> ParamTable:
+    """
+    Load one table from regulation.bin. Decoded tables share the PARAM cache:
+    the key combines the regulation, paramdef and names file hashes, so warm
+    loads neither decrypt nor decompress anything.
+    """
+    regulation = Path(regulation).resolve()
+    cache_path: Optional[Path] = None
+    if cache_dir is not None:
+        names_path = Path(names_dir) / f"{name}.txt" if names_dir is not None else None
+        combined = "|".join(
+            (
+                _source_digest(regulation, regulation.stat(), cache_dir),
+                _dir_signature(Path(paramdef_dir)),
+                _file_digest(names_path),
+            )
+        )
+        digest = hashlib.sha1(combined.encode("utf-8")).hexdigest()
+        cache_path = _cache_path(cache_dir, f"{name}@regulation", digest)
+        table = _read_cache(cache_path, name)
+        if table is not None:
+            return table
+
+    reg = open_regulation(regulation, paramdef_dir=paramdef_dir, names_dir=names_dir)
+    table = reg.table(name)
+    if cache_path is not None:
+        _write_cache(cache_path, table)
+    return table
@@ -0,0 +1,297 @@
+"""
+Bounded-concurrency asyncio runner for codex-mcp-wrapper subprocesses.
+
+run_plan.py and run_prompt_queue.py used to start children with Popen and
+poll them once a second, so a slot sat idle for up to a second after each
+run finished. Here a slot is refilled the moment its job completes:
+
+    async def run_one(job):
+        result = await run_process(command_for(job))
+        record(job, result)
+
+    asyncio.run(run_bounded(jobs, run_one, concurrency=5))
+
+Jobs can be delayed without holding a slot: ``ready_at(job)`` gives the
+earliest Unix time a job may start, and a worker that returns ``Retry(at)``
+is queued again until then (run_plan.py's backoff uses both).
+
+Cancelling ``run_bounded`` (Ctrl-C under ``asyncio.run``) cancels every
+in-flight job, and ``run_process`` terminates its child on cancellation
+(then kills it if it does not exit within ``TERMINATE_GRACE`` seconds).
+
+``concurrency`` may also be an ``AdaptiveLimit``, an AIMD controller the
+workers feed with each ``ProcessResult``: the limit grows by one after a
+window of healthy runs and is halved on a timeout, a non-zero exit or a
+rate-limit message in stderr. Every change is logged with its reason.
+Scripts expose it via ``add_concurrency_arguments`` (``--max-concurrency``
+switches from a fixed ``--concurrency`` to adaptive, starting there).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import re
+import time
+from asyncio.subprocess import DEVNULL, PIPE
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, TypeVar, Union
+
+TERMINATE_GRACE = 5.0
+RATE_LIMIT = re.compile(r"rate[ _-]?limit|too many requests|\b429\b|quota exceeded", re.IGNORECASE)
+
+Job = TypeVar("Job")
+Result = TypeVar("Result")
+
+
+class ProcessResult(NamedTuple):
+    returncode: int
+    stdout: str
+    stderr: str
+    # time.monotonic() at launch, and wall time until exit.
+    started: float = 0.0
+    seconds: float = 0.0
+    timed_out: bool = False
+
+
+def _decode(data: Optional[bytes]) -> str:
+    return data.decode("utf-8", errors="replace") if data else ""
+
+
+async def terminate(proc: asyncio.subprocess.Process, grace: float = TERMINATE_GRACE) -> None:
+    """SIGTERM ``proc``, then SIGKILL it if it is still running after ``grace`` seconds."""
+    if proc.returncode is not None:
+        return
+    try:
+        proc.terminate()
+        await asyncio.wait_for(proc.wait(), grace)
+    except ProcessLookupError:
+        return
+    except asyncio.TimeoutError:
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            return
+        await proc.wait()
+
+
+async def run_process(
+    cmd: Sequence[str],
+    capture_stdout: bool = True,
+    capture_stderr: bool = True,
+    timeout: Optional[float] = None,
+) -> ProcessResult:
+    """
+    Run ``cmd`` to completion; uncaptured streams are discarded. A run still
+    going after ``timeout`` seconds is terminated and reported as timed out
+    (its output is dropped).
+    """
+    started = time.monotonic()
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=DEVNULL,
+        stdout=PIPE if capture_stdout else DEVNULL,
+        stderr=PIPE if capture_stderr else DEVNULL,
+    )
+    timed_out = False
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        await terminate(proc)
+        out, err, timed_out = b"", b"", True
+    except BaseException:
+        # Cancelled (or interrupted): do not leave the child running.
+        await asyncio.shield(terminate(proc))
+        raise
+    return ProcessResult(
+        proc.returncode, _decode(out), _decode(err), started, time.monotonic() - started, timed_out
+    )
+
+
+def failure_reason(result: ProcessResult) -> Optional[str]:
+    """Why ``result`` should make an AdaptiveLimit back off, or None."""
+    if result.timed_out:
+        return f"timed out after {result.seconds:.1f}s"
+    for line in result.stderr.splitlines():
+        if RATE_LIMIT.search(line):
+            return f"rate limited: {line.strip()[:80]}"
+    if result.returncode != 0:
+        return f"exit {result.returncode}"
+    return None
+
+
+class LimitChange(NamedTuple):
+    # Seconds since the controller was created.
+    at: float
+    old: int
+    new: int
+    reason: str
+
+
+class AdaptiveLimit:
+    """
+    Additive-increase / multiplicative-decrease concurrency limit.
+
+    A run is healthy when it succeeded and took at most ``latency_factor``
+    times the fastest healthy run seen so far. After ``limit`` healthy runs
+    in a row the limit grows by one (up to ``maximum``); a slow run resets
+    that count. A failed run (see ``failure_reason``) multiplies the limit by
+    ``decrease`` (down to ``minimum``), once per back-off: failures of runs
+    launched before the last decrease were caused by the old limit and are
+    not counted again.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int = 16,
+        decrease: float = 0.5,
+        latency_factor: float = 2.0,
+        log: Optional[Callable[[str], None]] = print,
+    ) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.log = log
+        self.changes: List[LimitChange] = []
+        self.best_seconds: Optional[float] = None
+        self.healthy = 0
+        self.failures = 0
+        self._created = time.monotonic()
+        self._last_decrease = float("-inf")
+
+    def record(self, result: ProcessResult) -> None:
+        reason = failure_reason(result)
+        if reason is not None:
+            self.failures += 1
+            self.healthy = 0
+            if result.started < self._last_decrease:
+                return
+            self._last_decrease = time.monotonic()
+            new = max(self.minimum, int(self.limit * self.decrease))
+            if new != self.limit:
+                self._set(new, reason)
+            return
+        if self.best_seconds is None or result.seconds < self.best_seconds:
+            self.best_seconds = result.seconds
+        if result.seconds > self.best_seconds * self.latency_factor:
+            self.healthy = 0
+            return
+        self.healthy += 1
+        if self.healthy >= self.limit and self.limit < self.maximum:
+            self._set(
+                self.limit + 1,
+                f"{self.healthy} healthy runs, last {result.seconds:.1f}s (best {self.best_seconds:.1f}s)",
+            )
+            self.healthy = 0
+
+    def _set(self, new: int, reason: str) -> None:
+        old = self.limit
+        self.limit = new
+        self.changes.append(LimitChange(time.monotonic() - self._created, old, new, reason))
+        if self.log is not None:
+            self.log(f"[concurrency] {old} -> {new}: {reason}")
+
+
+def add_concurrency_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adaptive-concurrency and timeout flags; the script defines --concurrency."""
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        help="Adapt concurrency (AIMD) between --min-concurrency and this, starting at --concurrency.",
+    )
+    parser.add_argument(
+        "--min-concurrency",
+        type=int,
+        default=1,
+        help="Lower bound when adapting concurrency.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Terminate a wrapper run after this many seconds (counts as a failure).",
+    )
+
+
+def concurrency_limit(args: argparse.Namespace) -> Union[int, AdaptiveLimit]:
+    if args.max_concurrency is None:
+        return args.concurrency
+    return AdaptiveLimit(args.concurrency, minimum=args.min_concurrency, maximum=args.max_concurrency)
+
+
+def record_result(concurrency: Union[int, AdaptiveLimit], result: ProcessResult) -> None:
+    if isinstance(concurrency, AdaptiveLimit):
+        concurrency.record(result)
+
+
+def summarize(concurrency: Union[int, AdaptiveLimit]) -> Optional[str]:
+    if not isinstance(concurrency, AdaptiveLimit):
+        return None
+    return (
+        f"[concurrency] final {concurrency.limit}, {len(concurrency.changes)} changes, "
+        f"{concurrency.failures} failed runs"
+    )
+
+
+class Retry(NamedTuple):
+    """Returned by a ``run_bounded`` worker to run its job again at Unix time ``at``."""
+
+    at: float
+
+
+async def run_bounded(
+    jobs: Iterable[Job],
+    worker: Callable[[Job], Awaitable[Union[Result, Retry]]],
+    concurrency: Union[int, AdaptiveLimit],
+    ready_at: Optional[Callable[[Job], float]] = None,
+) -> List[Result]:
+    """
+    ``worker(job)`` for every job, at most ``concurrency`` at a time, starting
+    the next job as soon as any running one finishes. An AdaptiveLimit is
+    re-read on every refill; lowering it lets running jobs finish. Results
+    are returned in job order. If a worker raises, the remaining jobs are
+    cancelled and the exception propagates.
+
+    A job starts no earlier than ``ready_at(job)`` (Unix time), and a worker
+    that returns ``Retry(at)`` has its job queued again until ``at``. Waiting
+    jobs hold no slot: due jobs start in job order while the rest wait.
+    """
+    queue = list(jobs)
+    results: List[Optional[Result]] = [None] * len(queue)
+    running: Dict[asyncio.Task, int] = {}
+    # Job index -> Unix time it may start.
+    waiting = {idx: ready_at(job) if ready_at else 0.0 for idx, job in enumerate(queue)}
+
+    def limit() -> int:
+        return max(1, concurrency.limit if isinstance(concurrency, AdaptiveLimit) else concurrency)
+
+    try:
+        while waiting or running:
+            now = time.time()
+            for idx in sorted(idx for idx, at in waiting.items() if at <= now):
+                if len(running) >= limit():
+                    break
+                del waiting[idx]
+                running[asyncio.ensure_future(worker(queue[idx]))] = idx
+            timeout = None
+            if waiting and len(running) < limit():
+                timeout = max(0.0, min(waiting.values()) - now)
+            if not running:
+                await asyncio.sleep(timeout or 0.0)
+                continue
+            done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                idx = running.pop(task)
+                result = task.result()
+                if isinstance(result, Retry):
+                    waiting[idx] = result.at
+                else:
+                    results[idx] = result
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+    return results  # type: ignore[return-value]
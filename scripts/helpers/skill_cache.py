@@ -0,0 +1,93 @@
+"""
+Per-skill result cache for incremental AoW pipeline runs.
+
+Stages 2-5 only ever combine rows that share a ``Skill``, so a stage's output
+for one skill depends only on that skill's input rows (plus the rules that
+name it). ``run_pipeline.py --incremental`` fingerprints each skill's slice
+of a stage's input and reuses the cached result when the fingerprint is
+unchanged:
+
+    cache = SkillCache("stage3", code=Path(stage3.__file__))
+    for skill, rows in partition_rows(rows1).items():
+        key = cache.key(skill, rows, fieldnames)
+        result = cache.get(key)
+        if result is None:
+            result = cache.put(key, compute(rows))
+    cache.save()
+
+Each stage keeps one JSON file under work/.cache/aow_pipeline/, rewritten
+with only the entries used by the latest run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+from helpers.params import ROOT
+
+CACHE_DIR = ROOT / "work/.cache/aow_pipeline"
+CACHE_VERSION = 1
+
+
+def partition_rows(
+    rows: Iterable[Mapping[str, str]], field: str = "Skill"
+) -> Dict[str, List[Mapping[str, str]]]:
+    """Rows grouped by ``field``, groups and rows in first-seen order."""
+    groups: Dict[str, List[Mapping[str, str]]] = {}
+    for row in rows:
+        groups.setdefault(row.get(field, ""), []).append(row)
+    return groups
+
+
+class SkillCache:
+    def __init__(
+        self, stage: str, code: Union[Path, Sequence[Path]], cache_dir: Path = CACHE_DIR
+    ) -> None:
+        self.path = Path(cache_dir) / f"{stage}.json"
+        # Results are only valid for the code that produced them.
+        files = [code] if isinstance(code, (str, Path)) else list(code)
+        digest = hashlib.sha1()
+        for path in files:
+            digest.update(Path(path).read_bytes())
+        self.salt = f"{CACHE_VERSION}:{digest.hexdigest()}"
+        try:
+            self.entries: Dict[str, Any] = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.entries = {}
+        self.used: Dict[str, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, *parts: Any) -> str:
+        """Fingerprint of the JSON-serializable ``parts`` for this stage's code."""
+        payload = json.dumps([self.salt, parts], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.used[key] = value
+        return value
+
+    def put(self, key: str, value: Any) -> Any:
+        self.used[key] = value
+        return value
+
+    def summary(self) -> str:
+        return f"{self.misses}/{self.hits + self.misses} skills recomputed"
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.tmp{os.getpid()}")
+        try:
+            tmp.write_text(json.dumps(self.used, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
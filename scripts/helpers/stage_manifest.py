@@ -0,0 +1,181 @@
+"""
+Content-hash manifests that let AoW pipeline stages skip unchanged work.
+
+A stage records, next to each output (``.<output name>.manifest.json``), the
+SHA-1 of every input file, its effective CLI arguments, the source of the
+stage script plus every repo module it imported, and the output's own hash.
+On the next run the stage is skipped when all of those still match, so a
+downstream stage only reruns when an upstream output actually changed:
+
+    stage = StageManifest("stage2", args, inputs=[args.input, args.copy_rows], outputs=[args.output])
+    if stage.up_to_date():
+        return
+    ...  # build and write args.output
+    stage.record()
+
+Stages expose ``--explain`` (print why the stage runs or is skipped) and
+``--rebuild`` (ignore the manifest) via ``add_manifest_arguments``.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from helpers.params import ROOT
+
+MANIFEST_VERSION = 1
+SCRIPTS_DIR = ROOT / "scripts"
+# CLI flags that never change a stage's output (--jobs only changes how fast).
+MANIFEST_FLAGS = ("explain", "rebuild", "jobs")
+
+
+def add_manifest_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Print why this stage runs or is skipped.",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Run even if inputs, arguments and scripts are unchanged.",
+    )
+
+
+def manifest_path(output: Path) -> Path:
+    return output.with_name(f".{output.name}.manifest.json")
+
+
+def file_digest(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha1(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _display(path: Path) -> str:
+    resolved = Path(path).resolve()
+    try:
+        return resolved.relative_to(ROOT).as_posix()
+    except ValueError:
+        return resolved.as_posix()
+
+
+def _arg_text(value: object) -> object:
+    if isinstance(value, Path):
+        return _display(value)
+    if isinstance(value, (list, tuple)):
+        return [_arg_text(item) for item in value]
+    return value
+
+
+def script_digests() -> Dict[str, Optional[str]]:
+    """The running script and every module it loaded from scripts/, by content hash."""
+    files = set()
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if not path:
+            continue
+        path = Path(path).resolve()
+        if path.suffix == ".py" and SCRIPTS_DIR in path.parents:
+            files.add(path)
+    return {_display(path): file_digest(path) for path in sorted(files)}
+
+
+class StageManifest:
+    def __init__(
+        self,
+        stage: str,
+        args: argparse.Namespace,
+        inputs: Iterable[Path],
+        outputs: Iterable[Path],
+    ) -> None:
+        self.stage = stage
+        self.outputs = [Path(path) for path in outputs]
+        self.explain = bool(getattr(args, "explain", False))
+        self.rebuild = bool(getattr(args, "rebuild", False))
+        # Snapshot now: a stage may import more modules (or rewrite an input
+        # that is also its output) before record() runs.
+        self.state = {
+            "version": MANIFEST_VERSION,
+            "stage": stage,
+            "args": {
+                key: _arg_text(value)
+                for key, value in sorted(vars(args).items())
+                if key not in MANIFEST_FLAGS
+            },
+            "scripts": script_digests(),
+            "inputs": {_display(path): file_digest(Path(path)) for path in inputs},
+        }
+
+    def _stale_reasons(self) -> List[str]:
+        if self.rebuild:
+            return ["--rebuild given"]
+        reasons: List[str] = []
+        for output in self.outputs:
+            try:
+                recorded = json.loads(manifest_path(output).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                reasons.append(f"no manifest for {_display(output)}")
+                continue
+            if recorded.get("version") != MANIFEST_VERSION:
+                reasons.append(f"manifest for {_display(output)} has an old format")
+                continue
+            current = file_digest(output)
+            if current is None:
+                reasons.append(f"{_display(output)} is missing")
+            elif current != recorded.get("output"):
+                reasons.append(f"{_display(output)} changed since it was built")
+            for section, label in (("inputs", "input"), ("scripts", "script")):
+                before = recorded.get(section, {})
+                after = self.state[section]
+                for name in sorted(set(before) | set(after)):
+                    if name not in before:
+                        reasons.append(f"new {label} {name}")
+                    elif name not in after:
+                        reasons.append(f"{label} {name} no longer used")
+                    elif after[name] is None:
+                        reasons.append(f"{label} {name} is missing")
+                    elif before[name] != after[name]:
+                        reasons.append(f"{label} {name} changed")
+            before_args = recorded.get("args", {})
+            for key in sorted(set(before_args) | set(self.state["args"])):
+                old, new = before_args.get(key), self.state["args"].get(key)
+                if old != new:
+                    reasons.append(f"argument --{key.replace('_', '-')} changed: {old!r} -> {new!r}")
+        # Several outputs share inputs, so the same reason can repeat.
+        return list(dict.fromkeys(reasons))
+
+    def up_to_date(self) -> bool:
+        """True (after saying so) when the stage can be skipped."""
+        reasons = self._stale_reasons()
+        targets = ", ".join(_display(path) for path in self.outputs)
+        if not reasons:
+            print(f"{self.stage}: {targets} is up to date; skipping (--rebuild to force).")
+            if self.explain:
+                print(
+                    f"  [explain] {len(self.state['inputs'])} inputs, "
+                    f"{len(self.state['scripts'])} scripts and the arguments match the manifest"
+                )
+            return True
+        if self.explain:
+            print(f"{self.stage}: running because")
+            for reason in reasons:
+                print(f"  [explain] {reason}")
+        return False
+
+    def record(self) -> None:
+        """Write the manifest for every output; call after the outputs are written."""
+        for output in self.outputs:
+            data = dict(self.state, output=file_digest(output))
+            path = manifest_path(output)
+            tmp = path.with_name(f"{path.name}.tmp{os.getpid()}")
+            try:
+                tmp.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+                os.replace(tmp, path)
+            except OSError:
+                pass
@@ -0,0 +1,763 @@
+"""
+Bulk reader for Elden Ring TAE3 (.tae) animation event files.
+
+Each file is memory-mapped and its header tables are decoded with precompiled
+``struct.Struct`` objects (``iter_unpack`` over the animation and event header
+blocks), so nothing is copied out of the map and there is no per-field Python
+call. Events come back as parallel arrays rather than per-event dicts:
+
+    events = read_tae(Path("a01.tae"))       # Behavior (type 304) events only
+    events.anim_id[0], events.judge[0]       # 70710, 603
+    everything = read_tae(path, event_types=None)
+
+Layout follows the SoulsFormats TAE3 reader; files that fail the header checks
+yield an empty ``TaeEvents``.
+
+``scan_taes`` reads many files at once: results are cached per file under
+``work/.cache/tae`` (keyed by path, size, mtime and content hash), so reruns
+only parse TAEs that changed, and the misses can be spread over a process pool.
+
+``load_tae_index`` decodes every event type into a persistent ``TaeIndex``, so
+"which anims fire event X" is a dict lookup rather than a rescan:
+
+    index = load_tae_index(sorted(root.rglob("*.tae")))
+    index.anims_firing(304)       # {("a01.tae", 70710): [(1.5, 1.6), ...], ...}
+    index.query(judge=603)        # [TaeEvent(tae="a01.tae", anim_id=70710, ...)]
+
+``BehaviorMap`` is the compact binary form of the ``tae_dump_behaviors`` JSON;
+``BehaviorMap.open`` reads either format. ``judge_events()`` is a lazy
+judge -> events mapping: each judge's list is decoded on first access, the
+way ParamTable decodes columns.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Callable, Collection, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from helpers.params import int_array
+
+ROOT = Path(__file__).resolve().parents[2]
+CACHE_DIR = ROOT / "work/.cache/tae"
+CACHE_VERSION = 1
+CACHE_MAGIC = b"TAEC"
+BEHAVIOR_MAP_MAGIC = b"TAEB"
+BEHAVIOR_MAP_VERSION = 2
+# Columns of a binary behavior map, in file order. judge_id/judge_end index
+# the judge-sorted ``order`` column: sorted ids and where each one's slice ends.
+BEHAVIOR_MAP_COLUMNS = ("order", "tae", "anim_id", "start", "end", "judge", "judge_id", "judge_end")
+
+# BehaviorThing in SoulsFormats; its parameter is the BehaviorListID
+# (BehaviorParam behaviorJudgeId).
+BEHAVIOR_EVENT = 304
+
+TAE_VERSIONS = (0x1000C, 0x1000D)
+
+_VERSION = struct.Struct("<i")
+_ANIM_TABLE = struct.Struct("<iq")  # anim count @0x54, anim headers offset @0x58
+_ANIM_REF = struct.Struct("<qq")  # anim id, anim offset
+_ANIM = struct.Struct("<q24xi")  # event headers offset @+0x00, event count @+0x20
+_EVENT_REF = struct.Struct("<qqq")  # start time offset, end time offset, event data offset
+_EVENT_DATA = struct.Struct("<Q12xi")  # type @+0x00, behavior id @+0x14
+_TIME = struct.Struct("<f")
+_CACHE_HEADER = struct.Struct("<4sI")
+# Behavior map: magic, version, compressed flag, string table length; then one
+# segment (typecode, offset, size) per BEHAVIOR_MAP_COLUMNS entry, the string
+# table (tae_root and TAE names, NUL-separated) and the column data, as a
+# single zlib stream when compressed (segment offsets are into the inflated data).
+_MAP_HEADER = struct.Struct("<4sIB3xI")
+_MAP_SEGMENT = struct.Struct("<cxxxII")
+
+
+@dataclass
+class TaeEvents:
+    """
+    Events of one TAE file, one array slot per event. Times are float32
+    (NaN when the time offset points outside the file); ``judge`` holds the
+    behaviorJudgeId for Behavior events and -1 for every other type.
+    """
+
+    anim_id: array = field(default_factory=lambda: array("q"))
+    start: array = field(default_factory=lambda: array("f"))
+    end: array = field(default_factory=lambda: array("f"))
+    type: array = field(default_factory=lambda: array("Q"))
+    judge: array = field(default_factory=lambda: array("i"))
+
+    def __len__(self) -> int:
+        return len(self.anim_id)
+
+    def records(self, tae: str) -> List[dict]:
+        """Per-event dicts in the ``tae_dump_behaviors`` JSON shape."""
+        return [
+            {
+                "tae": tae,
+                "anim_id": anim_id,
+                "start": _time_or_none(start),
+                "end": _time_or_none(end),
+                "behaviorJudgeId": judge,
+            }
+            for anim_id, start, end, judge in zip(self.anim_id, self.start, self.end, self.judge)
+        ]
+
+
+def _time_or_none(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def _read_time(data: memoryview, offset: int, size: int) -> float:
+    if 0 <= offset and offset + 4 <= size:
+        return _TIME.unpack_from(data, offset)[0]
+    return math.nan
+
+
+def _decode(data: memoryview, event_types: Optional[Collection[int]]) -> TaeEvents:
+    size = len(data)
+    events = TaeEvents()
+    if size < 0xB0 or data[:4] != b"TAE ":
+        return events
+    if _VERSION.unpack_from(data, 0x8)[0] not in TAE_VERSIONS:
+        return events
+
+    anim_count, anims_offset = _ANIM_TABLE.unpack_from(data, 0x54)
+    anim_refs = list(_ANIM_REF.iter_unpack(data[anims_offset:anims_offset + anim_count * _ANIM_REF.size]))
+    if len(anim_refs) != anim_count:
+        raise struct.error(f"anim table at {anims_offset:#x} runs past the end of the file")
+
+    unpack_event = _EVENT_DATA.unpack_from
+    limit = size - _EVENT_DATA.size
+    for anim_id, anim_offset in anim_refs:
+        if anim_offset <= 0 or anim_offset >= size:
+            continue
+        headers_offset, event_count = _ANIM.unpack_from(data, anim_offset)
+        if event_count <= 0:
+            continue
+        headers_end = headers_offset + event_count * _EVENT_REF.size
+        if headers_offset <= 0 or headers_end > size:
+            continue
+        for start_offset, end_offset, data_offset in _EVENT_REF.iter_unpack(data[headers_offset:headers_end]):
+            if data_offset <= 0 or data_offset > limit:
+                continue
+            event_type, behavior_id = unpack_event(data, data_offset)
+            if event_types is not None and event_type not in event_types:
+                continue
+            events.anim_id.append(anim_id)
+            events.start.append(_read_time(data, start_offset, size))
+            events.end.append(_read_time(data, end_offset, size))
+            events.type.append(event_type)
+            events.judge.append(behavior_id if event_type == BEHAVIOR_EVENT else -1)
+    return events
+
+
+def read_tae(path: Path, event_types: Optional[Collection[int]] = (BEHAVIOR_EVENT,)) -> TaeEvents:
+    """
+    Decode the events of ``path`` whose type is in ``event_types`` (all events
+    when None). Raises ``struct.error`` on truncated header tables.
+    """
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return TaeEvents()
+    with mapped, memoryview(mapped) as data:
+        return _decode(data, event_types)
+
+
+def _file_digest(path: Path) -> str:
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return hashlib.sha1(mapped).hexdigest()
+        except ValueError:  # empty file
+            return hashlib.sha1(b"").hexdigest()
+
+
+def _scan_one(
+    path: Path, known_digest: Optional[str], event_types: Optional[Collection[int]]
+) -> Tuple[str, Optional[TaeEvents]]:
+    """Hash and parse one file; skips parsing (None) when the content is unchanged."""
+    digest = _file_digest(path)
+    if digest == known_digest:
+        return digest, None
+    return digest, read_tae(path, event_types)
+
+
+# path -> (size, mtime_ns, sha1, events)
+CacheEntries = Dict[str, Tuple[int, int, str, TaeEvents]]
+
+
+def _cache_path(cache_dir: Path, event_types: Optional[Collection[int]]) -> Path:
+    tag = "all" if event_types is None else "-".join(str(t) for t in sorted(event_types))
+    return cache_dir / f"events-{tag}.v{CACHE_VERSION}.bin"
+
+
+def _read_cache(path: Path) -> CacheEntries:
+    try:
+        raw = path.read_bytes()
+        magic, header_len = _CACHE_HEADER.unpack_from(raw, 0)
+        if magic != CACHE_MAGIC:
+            return {}
+        header = json.loads(raw[_CACHE_HEADER.size:_CACHE_HEADER.size + header_len])
+        if header.get("version") != CACHE_VERSION:
+            return {}
+    except (OSError, struct.error, ValueError):
+        return {}
+    body = memoryview(raw)[_CACHE_HEADER.size + header_len:]
+    entries: CacheEntries = {}
+    for key, (size, mtime_ns, digest, offset, count) in header["files"].items():
+        events = TaeEvents()
+        for column in fields(TaeEvents):
+            values = getattr(events, column.name)
+            end = offset + count * values.itemsize
+            values.frombytes(body[offset:end])
+            offset = end
+        entries[key] = (size, mtime_ns, digest, events)
+    return entries
+
+
+def _write_cache(path: Path, entries: CacheEntries) -> None:
+    files: Dict[str, list] = {}
+    blobs: List[bytes] = []
+    offset = 0
+    for key, (size, mtime_ns, digest, events) in entries.items():
+        files[key] = [size, mtime_ns, digest, offset, len(events)]
+        for column in fields(TaeEvents):
+            blob = getattr(events, column.name).tobytes()
+            blobs.append(blob)
+            offset += len(blob)
+    header = json.dumps({"version": CACHE_VERSION, "files": files}).encode("utf-8")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".tmp{os.getpid()}")
+        with tmp.open("wb") as f:
+            f.write(_CACHE_HEADER.pack(CACHE_MAGIC, len(header)))
+            f.write(header)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def scan_taes(
+    paths: Iterable[Path],
+    *,
+    jobs: int = 1,
+    event_types: Optional[Collection[int]] = (BEHAVIOR_EVENT,),
+    cache_dir: Optional[Path] = CACHE_DIR,
+    on_error: Optional[Callable[[Path, Exception], None]] = None,
+) -> List[Tuple[Path, TaeEvents]]:
+    """
+    ``read_tae`` over many files, in input order. Files whose size and mtime
+    match the cache are not opened at all; changed files are hashed and only
+    parsed when their content differs from the cached copy. Misses run on
+    ``jobs`` worker processes (0 = one per CPU). Files that fail to parse are
+    passed to ``on_error`` and left out of the result (raised when None).
+    ``cache_dir=None`` disables the cache.
+    """
+    paths = list(paths)
+    cache_file = _cache_path(cache_dir, event_types) if cache_dir is not None else None
+    cached = _read_cache(cache_file) if cache_file is not None else {}
+
+    results: Dict[int, TaeEvents] = {}
+    stamps: Dict[int, Tuple[str, int, int]] = {}
+    misses: List[int] = []
+    for idx, path in enumerate(paths):
+        stat = path.stat()
+        key = str(path.resolve())
+        stamps[idx] = (key, stat.st_size, stat.st_mtime_ns)
+        entry = cached.get(key)
+        if entry is not None and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+            results[idx] = entry[3]
+        else:
+            misses.append(idx)
+
+    def known_digest(idx: int) -> Optional[str]:
+        entry = cached.get(stamps[idx][0])
+        return entry[2] if entry is not None else None
+
+    def finish(idx: int, outcome: Callable[[], Tuple[str, Optional[TaeEvents]]]) -> None:
+        try:
+            digest, events = outcome()
+        except Exception as exc:  # noqa: BLE001 - reported per file
+            if on_error is None:
+                raise
+            on_error(paths[idx], exc)
+            return
+        key, size, mtime_ns = stamps[idx]
+        if events is None:
+            events = cached[key][3]
+        cached[key] = (size, mtime_ns, digest, events)
+        results[idx] = events
+
+    workers = jobs if jobs > 0 else (os.cpu_count() or 1)
+    if workers > 1 and len(misses) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(misses))) as pool:
+            futures = {
+                idx: pool.submit(_scan_one, paths[idx], known_digest(idx), event_types)
+                for idx in misses
+            }
+            for idx in misses:
+                finish(idx, futures[idx].result)
+    else:
+        for idx in misses:
+            finish(idx, lambda idx=idx: _scan_one(paths[idx], known_digest(idx), event_types))
+
+    if cache_file is not None and misses:
+        _write_cache(cache_file, cached)
+    return [(paths[idx], results[idx]) for idx in sorted(results)]
+
+
+class TaeEvent(NamedTuple):
+    tae: str
+    anim_id: int
+    type: int
+    start: Optional[float]
+    end: Optional[float]
+    judge: int
+
+
+# Columns with a lookup group: query keyword -> TaeEvents column.
+_GROUPS = {"event_type": "type", "anim_id": "anim_id", "judge": "judge"}
+
+
+def _group(values: array, positions: Sequence[int]) -> Tuple[array, Dict[int, Tuple[int, int]]]:
+    """Positions sorted (stably) by value, plus value -> (lo, hi) slice of them."""
+    order = array("i", sorted(positions, key=values.__getitem__))
+    ranges: Dict[int, Tuple[int, int]] = {}
+    lo = 0
+    counts = Counter(values[i] for i in positions)
+    for value in sorted(counts):
+        ranges[value] = (lo, lo + counts[value])
+        lo += counts[value]
+    return order, ranges
+
+
+class TaeIndex:
+    """
+    Every event of a set of TAE files in one columnar table (file-major, in
+    scan order) with grouped permutations by event type, anim id and
+    behaviorJudgeId. ``judge`` only groups Behavior events.
+    """
+
+    def __init__(
+        self,
+        taes: List[str],
+        tae_offsets: array,
+        events: TaeEvents,
+        groups: Dict[str, Tuple[array, Dict[int, Tuple[int, int]]]],
+        sources: List[list],
+    ) -> None:
+        self.taes = taes
+        self.tae_offsets = tae_offsets
+        self.events = events
+        self.groups = groups
+        self.sources = sources
+        self._tae_of = array("i")
+        for tae_idx in range(len(taes)):
+            self._tae_of.extend([tae_idx] * (tae_offsets[tae_idx + 1] - tae_offsets[tae_idx]))
+
+    @classmethod
+    def build(cls, scanned: Iterable[Tuple[Path, TaeEvents]], sources: List[list]) -> "TaeIndex":
+        taes: List[str] = []
+        tae_offsets = array("q", [0])
+        events = TaeEvents()
+        for path, file_events in scanned:
+            for column in fields(TaeEvents):
+                getattr(events, column.name).extend(getattr(file_events, column.name))
+            taes.append(str(path.resolve()))
+            tae_offsets.append(len(events))
+        everything = range(len(events))
+        behaviors = [i for i in everything if events.type[i] == BEHAVIOR_EVENT]
+        groups = {
+            "event_type": _group(events.type, everything),
+            "anim_id": _group(events.anim_id, everything),
+            "judge": _group(events.judge, behaviors),
+        }
+        return cls(taes, tae_offsets, events, groups, sources)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def event(self, pos: int) -> TaeEvent:
+        events = self.events
+        return TaeEvent(
+            Path(self.taes[self._tae_of[pos]]).name,
+            events.anim_id[pos],
+            events.type[pos],
+            _time_or_none(events.start[pos]),
+            _time_or_none(events.end[pos]),
+            events.judge[pos],
+        )
+
+    def event_types(self) -> Dict[int, int]:
+        """Event type -> number of events."""
+        return {value: hi - lo for value, (lo, hi) in self.groups["event_type"][1].items()}
+
+    def _positions(self, key: str, value: int) -> Sequence[int]:
+        order, ranges = self.groups[key]
+        lo, hi = ranges.get(value, (0, 0))
+        return order[lo:hi]
+
+    def _tae_positions(self, tae: str) -> Sequence[int]:
+        positions: List[int] = []
+        resolved = str(Path(tae).resolve())
+        for idx, path in enumerate(self.taes):
+            if tae == Path(path).name or resolved == path:
+                positions.extend(range(self.tae_offsets[idx], self.tae_offsets[idx + 1]))
+        return positions
+
+    def query(
+        self,
+        *,
+        event_type: Optional[int] = None,
+        judge: Optional[int] = None,
+        anim_id: Optional[int] = None,
+        tae: Optional[str] = None,
+    ) -> List[TaeEvent]:
+        """Events matching every given filter (``tae`` is a file name or path), in scan order."""
+        filters = {"event_type": event_type, "judge": judge, "anim_id": anim_id}
+        given = {key: value for key, value in filters.items() if value is not None}
+        if tae is not None:
+            candidates: Optional[Sequence[int]] = self._tae_positions(tae)
+        elif given:
+            # Start from the most selective group, then check the other columns.
+            candidates = min((self._positions(key, value) for key, value in given.items()), key=len)
+        else:
+            candidates = range(len(self))
+        columns = {key: getattr(self.events, _GROUPS[key]) for key in given}
+        matches = [
+            pos
+            for pos in candidates
+            if all(columns[key][pos] == value for key, value in given.items())
+        ]
+        return [self.event(pos) for pos in sorted(matches)]
+
+    def anims_firing(self, event_type: int) -> Dict[Tuple[str, int], List[Tuple[Optional[float], Optional[float]]]]:
+        """(tae name, anim id) -> time ranges of every ``event_type`` event."""
+        out: Dict[Tuple[str, int], List[Tuple[Optional[float], Optional[float]]]] = {}
+        for event in self.query(event_type=event_type):
+            out.setdefault((event.tae, event.anim_id), []).append((event.start, event.end))
+        return out
+
+    def _blobs(self) -> Dict[str, array]:
+        blobs = {f"events.{column.name}": getattr(self.events, column.name) for column in fields(TaeEvents)}
+        blobs["tae_offsets"] = self.tae_offsets
+        for key, (order, _) in self.groups.items():
+            blobs[f"order.{key}"] = order
+        return blobs
+
+    def save(self, path: Path) -> None:
+        segments: Dict[str, list] = {}
+        offset = 0
+        blobs = self._blobs()
+        for name, values in blobs.items():
+            size = len(values) * values.itemsize
+            segments[name] = [values.typecode, offset, size]
+            offset += size
+        header = json.dumps(
+            {
+                "version": CACHE_VERSION,
+                "taes": self.taes,
+                "sources": self.sources,
+                "ranges": {key: ranges for key, (_, ranges) in self.groups.items()},
+                "segments": segments,
+            }
+        ).encode("utf-8")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".tmp{os.getpid()}")
+            with tmp.open("wb") as f:
+                f.write(_CACHE_HEADER.pack(CACHE_MAGIC, len(header)))
+                f.write(header)
+                for values in blobs.values():
+                    f.write(values.tobytes())
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["TaeIndex"]:
+        """Index saved at ``path``, or None when missing or written by another version."""
+        try:
+            raw = path.read_bytes()
+            magic, header_len = _CACHE_HEADER.unpack_from(raw, 0)
+            if magic != CACHE_MAGIC:
+                return None
+            header = json.loads(raw[_CACHE_HEADER.size:_CACHE_HEADER.size + header_len])
+            if header.get("version") != CACHE_VERSION:
+                return None
+        except (OSError, struct.error, ValueError):
+            return None
+        body = memoryview(raw)[_CACHE_HEADER.size + header_len:]
+        blobs: Dict[str, array] = {}
+        for name, (typecode, offset, size) in header["segments"].items():
+            values = array(typecode)
+            values.frombytes(body[offset:offset + size])
+            blobs[name] = values
+        events = TaeEvents(**{column.name: blobs[f"events.{column.name}"] for column in fields(TaeEvents)})
+        groups = {
+            key: (blobs[f"order.{key}"], {int(value): tuple(span) for value, span in ranges.items()})
+            for key, ranges in header["ranges"].items()
+        }
+        return cls(header["taes"], blobs["tae_offsets"], events, groups, header["sources"])
+
+
+def load_tae_index(
+    paths: Iterable[Path],
+    *,
+    jobs: int = 1,
+    cache_dir: Optional[Path] = CACHE_DIR,
+    on_error: Optional[Callable[[Path, Exception], None]] = None,
+) -> TaeIndex:
+    """
+    TaeIndex over ``paths``. The index is saved in ``cache_dir`` and reused
+    while every file keeps its size and mtime; otherwise it is rebuilt from
+    ``scan_taes`` (which only parses the files that changed).
+    """
+    paths = list(paths)
+    sources = []
+    for path in paths:
+        stat = path.stat()
+        sources.append([str(path.resolve()), stat.st_size, stat.st_mtime_ns])
+    index_path: Optional[Path] = None
+    if cache_dir is not None:
+        key = hashlib.sha1("\n".join(source[0] for source in sources).encode("utf-8")).hexdigest()
+        index_path = cache_dir / f"index-{key[:12]}.v{CACHE_VERSION}.bin"
+        index = TaeIndex.load(index_path)
+        if index is not None and index.sources == sources:
+            return index
+    scanned = scan_taes(paths, jobs=jobs, event_types=None, cache_dir=cache_dir, on_error=on_error)
+    index = TaeIndex.build(scanned, sources)
+    if index_path is not None:
+        index.save(index_path)
+    return index
+
+
+class JudgeEvents(Mapping):
+    """behaviorJudgeId -> events of a BehaviorMap, decoded per judge on first access."""
+
+    def __init__(self, behavior_map: "BehaviorMap") -> None:
+        self._map = behavior_map
+        self._decoded: Dict[int, List[dict]] = {}
+
+    def __getitem__(self, judge: int) -> List[dict]:
+        events = self._decoded.get(judge)
+        if events is None:
+            # Every judge in the map has at least one event.
+            events = self._map.events_for(judge)
+            if not events:
+                raise KeyError(judge)
+            self._decoded[judge] = events
+        return events
+
+    def __iter__(self):
+        return iter(self._map.behaviors)
+
+    def __len__(self) -> int:
+        return len(self._map.judges)
+
+
+class BehaviorMap:
+    """
+    Behavior events of a TAE scan (the ``tae_dump_behaviors`` output). The
+    binary form stores one narrow typed segment per column, TAE names once in
+    a string table, and a judge-sorted permutation with its judge index:
+    ``open`` unpacks only the fixed-size header and the string table, and
+    columns (the judge index included) are decoded on first use.
+    """
+
+    def __init__(
+        self,
+        tae_root: str,
+        taes: List[str],
+        judges: Optional[Dict[int, Tuple[int, int]]],
+        load: Callable[[str], array],
+    ) -> None:
+        self.tae_root = tae_root
+        self.taes = taes
+        self._judges = judges
+        self._load = load
+        self._columns: Dict[str, array] = {}
+
+    @property
+    def judges(self) -> Dict[int, Tuple[int, int]]:
+        """behaviorJudgeId -> (lo, hi) slice of the judge-sorted ``order`` column."""
+        if self._judges is None:
+            ends = self._column("judge_end")
+            starts = [0, *ends[:-1]]
+            self._judges = dict(zip(self._column("judge_id"), zip(starts, ends)))
+        return self._judges
+
+    @property
+    def behaviors(self) -> List[int]:
+        return sorted(self.judges)
+
+    def _column(self, name: str) -> array:
+        values = self._columns.get(name)
+        if values is None:
+            values = self._columns[name] = self._load(name)
+        return values
+
+    def _records(self, positions: Iterable[int]) -> List[dict]:
+        taes = self.taes
+        tae, anim_id, start, end, judge = (
+            self._column(name) for name in ("tae", "anim_id", "start", "end", "judge")
+        )
+        # NaN marks a missing time (NaN != NaN).
+        return [
+            {
+                "tae": taes[tae[pos]],
+                "anim_id": anim_id[pos],
+                "start": start[pos] if start[pos] == start[pos] else None,
+                "end": end[pos] if end[pos] == end[pos] else None,
+                "behaviorJudgeId": judge[pos],
+            }
+            for pos in positions
+        ]
+
+    def __len__(self) -> int:
+        return len(self._column("order"))
+
+    def judge_range(self, judge: int) -> Optional[Tuple[int, int]]:
+        """``judges[judge]`` without building ``judges`` for a binary map."""
+        if self._judges is not None:
+            return self._judges.get(judge)
+        judge_ids = self._column("judge_id")
+        idx = bisect_left(judge_ids, judge)
+        if idx == len(judge_ids) or judge_ids[idx] != judge:
+            return None
+        ends = self._column("judge_end")
+        return (ends[idx - 1] if idx else 0), ends[idx]
+
+    def events_for(self, judge: int) -> List[dict]:
+        """Events of one behaviorJudgeId, in scan order."""
+        lo, hi = self.judge_range(judge) or (0, 0)
+        return self._records(self._column("order")[lo:hi])
+
+    def judge_events(self) -> JudgeEvents:
+        """Lazy judge -> events mapping (``dict(...)`` of it decodes everything)."""
+        return JudgeEvents(self)
+
+    def events(self) -> List[dict]:
+        return self._records(range(len(self)))
+
+    def to_json(self) -> dict:
+        """The ``tae_dump_behaviors`` JSON document."""
+        return {"tae_root": self.tae_root, "behaviors": self.behaviors, "events": self.events()}
+
+    @classmethod
+    def _from_columns(cls, tae_root: str, taes: List[str], columns: Dict[str, array]) -> "BehaviorMap":
+        order, judges = _group(columns["judge"], range(len(columns["judge"])))
+        columns["order"] = int_array(list(order))
+        return cls(tae_root, taes, judges, columns.__getitem__)
+
+    @classmethod
+    def from_scan(cls, tae_root: Union[str, Path], scanned: Iterable[Tuple[Path, TaeEvents]]) -> "BehaviorMap":
+        """Map of ``scan_taes`` output (Behavior events only)."""
+        taes: List[str] = []
+        tae_ids: Dict[str, int] = {}
+        tae_column: List[int] = []
+        events = TaeEvents()
+        for tae, file_events in scanned:
+            if not len(file_events):
+                continue
+            tae_id = tae_ids.setdefault(tae.name, len(tae_ids))
+            if tae_id == len(taes):
+                taes.append(tae.name)
+            tae_column.extend([tae_id] * len(file_events))
+            for column in fields(TaeEvents):
+                getattr(events, column.name).extend(getattr(file_events, column.name))
+        columns = {
+            "tae": int_array(tae_column),
+            "anim_id": int_array(list(events.anim_id)),
+            "start": events.start,
+            "end": events.end,
+            "judge": int_array(list(events.judge)),
+        }
+        return cls._from_columns(str(tae_root), taes, columns)
+
+    @classmethod
+    def from_json(cls, document: dict) -> "BehaviorMap":
+        events = document.get("events", [])
+        taes: List[str] = []
+        tae_ids: Dict[str, int] = {}
+        for event in events:
+            if tae_ids.setdefault(event["tae"], len(tae_ids)) == len(taes):
+                taes.append(event["tae"])
+        columns = {
+            "tae": int_array([tae_ids[event["tae"]] for event in events]),
+            "anim_id": int_array([event["anim_id"] for event in events]),
+            "start": array("f", [math.nan if event["start"] is None else event["start"] for event in events]),
+            "end": array("f", [math.nan if event["end"] is None else event["end"] for event in events]),
+            "judge": int_array([event["behaviorJudgeId"] for event in events]),
+        }
+        return cls._from_columns(document.get("tae_root", ""), taes, columns)
+
+    @classmethod
+    def open(cls, path: Path) -> "BehaviorMap":
+        """Read a binary map (only its header until columns are used) or a JSON one."""
+        raw = Path(path).read_bytes()
+        if raw[:4] != BEHAVIOR_MAP_MAGIC:
+            return cls.from_json(json.loads(raw))
+        (version,) = _VERSION.unpack_from(raw, 4)
+        if version != BEHAVIOR_MAP_VERSION:
+            raise ValueError(
+                f"{path}: unsupported behavior map version {version}; "
+                "rewrite it with tae_dump_behaviors.py --format bin"
+            )
+        _, _, compressed, strings_len = _MAP_HEADER.unpack_from(raw, 0)
+        strings_at = _MAP_HEADER.size + _MAP_SEGMENT.size * len(BEHAVIOR_MAP_COLUMNS)
+        body_at = strings_at + strings_len
+        tae_root, *taes = raw[strings_at:body_at].decode("utf-8").split("\0")
+        columns: Dict[str, array] = {}
+
+        def load(name: str) -> array:
+            # The body is inflated in one go, so every column is split out at once.
+            if not columns:
+                body = zlib.decompress(raw[body_at:]) if compressed else raw[body_at:]
+                segments = _MAP_SEGMENT.iter_unpack(raw[_MAP_HEADER.size:strings_at])
+                for column, (typecode, offset, size) in zip(BEHAVIOR_MAP_COLUMNS, segments):
+                    values = columns[column] = array(typecode.decode("ascii"))
+                    values.frombytes(body[offset:offset + size])
+            return columns[name]
+
+        return cls(tae_root, taes, None, load)
+
+    def save(self, path: Path, *, compress: bool = True) -> None:
+        """Write the binary form (columns zlib-compressed unless ``compress=False``)."""
+        judge_ids = sorted(self.judges)
+        columns = {name: self._column(name) for name in BEHAVIOR_MAP_COLUMNS[:6]}
+        columns["judge_id"] = int_array(judge_ids)
+        columns["judge_end"] = int_array([self.judges[judge][1] for judge in judge_ids])
+        segments: List[bytes] = []
+        blobs: List[bytes] = []
+        offset = 0
+        for name in BEHAVIOR_MAP_COLUMNS:
+            values = columns[name]
+            blob = values.tobytes()
+            segments.append(_MAP_SEGMENT.pack(values.typecode.encode("ascii"), offset, len(blob)))
+            blobs.append(blob)
+            offset += len(blob)
+        body = b"".join(blobs)
+        if compress:
+            body = zlib.compress(body, 9)
+        strings = "\0".join([self.tae_root, *self.taes]).encode("utf-8")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as f:
+            f.write(_MAP_HEADER.pack(BEHAVIOR_MAP_MAGIC, BEHAVIOR_MAP_VERSION, compress, len(strings)))
+            f.write(b"".join(segments))
+            f.write(strings)
+            f.write(body)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Keep PARAM tables, FMG text and the behavior graph in memory and answer
+queries over a Unix socket and/or localhost HTTP (helpers/param_service.py).
+Query it with scripts/param_query.py.
+
+Usage:
+  python scripts/param_daemon.py &                      # work/.cache/param_daemon.sock
+  python scripts/param_daemon.py --http 8765 --no-socket
+  python scripts/param_daemon.py --behavior-map work/tae_behavior_map/behavior_ids_param.json --preload Bullet AtkParam_Npc
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from helpers.fmg import FMG_DIR
+from helpers.param_service import DEFAULT_PORT, PRELOAD_TABLES, SOCKET_PATH, ParamService, QueryError, serve
+from helpers.params import PARAM_DIR
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve PARAM/FMG/behavior-graph lookups from memory.")
+    parser.add_argument("--param-dir", default=PARAM_DIR, type=Path, help="Path to PARAM directory")
+    parser.add_argument("--fmg-dir", default=FMG_DIR, type=Path, help="Directory of *.fmg.xml text exports")
+    parser.add_argument("--behavior-map", type=Path, help="Skill ID -> behaviorJudgeId list used by trace when no judges are given")
+    parser.add_argument(
+        "--preload", nargs="*", default=[], help=f"Extra tables to load at startup, besides {', '.join(PRELOAD_TABLES)}"
+    )
+    parser.add_argument("--socket", default=SOCKET_PATH, type=Path, help="Unix socket path")
+    parser.add_argument("--no-socket", action="store_true", help="Do not listen on the Unix socket")
+    parser.add_argument("--http", type=int, nargs="?", const=DEFAULT_PORT, help=f"Also serve HTTP on 127.0.0.1 (default port {DEFAULT_PORT})")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    preload = list(dict.fromkeys([*PRELOAD_TABLES, *args.preload]))
+    service = ParamService(args.param_dir, args.fmg_dir, args.behavior_map, preload)
+    print(f"Loaded {len(service.query_tables()['loaded'])} tables and {len(service.fmg)} FMGs in {time.perf_counter() - start:.1f}s.", flush=True)
+
+    def ready(address: str) -> None:
+        print(f"Listening on {address}", flush=True)
+
+    try:
+        serve(service, None if args.no_socket else args.socket, args.http, on_ready=ready)
+    except QueryError as exc:
+        sys.exit(str(exc))
+
+
+if __name__ == "__main__":
+    main()
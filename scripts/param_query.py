@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Thin client for scripts/param_daemon.py: sends one query and prints the JSON
+result. Lookups take milliseconds because the daemon already holds the tables.
+
+Usage:
+  python scripts/param_query.py row Bullet 2250 [--columns atkId_Bullet life]
+  python scripts/param_query.py find BehaviorParam_PC behaviorJudgeId 430
+  python scripts/param_query.py join Bullet 2250 atkId_Bullet AtkParam_Pc
+  python scripts/param_query.py trace 1043 [--judges 430 440]
+  python scripts/param_query.py behavior 0 430 440
+  python scripts/param_query.py magic 1043
+  python scripts/param_query.py search "lion" [--fmg ArtsName | --table SpEffectParam]
+  python scripts/param_query.py text ArtsCaption 103
+  python scripts/param_query.py skill 1043 | tables [--available] | ping | shutdown
+  python scripts/param_query.py --http http://127.0.0.1:8765 ping
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from helpers.param_service import SOCKET_PATH, query
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query a running param_daemon.py.")
+    parser.add_argument("--socket", default=SOCKET_PATH, type=Path, help="Daemon Unix socket")
+    parser.add_argument("--http", help="Daemon HTTP base URL (instead of the socket)")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--compact", action="store_true", help="Print the result on one line")
+    ops = parser.add_subparsers(dest="op", required=True)
+
+    ops.add_parser("ping", parents=[common])
+    ops.add_parser("shutdown", parents=[common])
+    sub = ops.add_parser("tables", parents=[common])
+    sub.add_argument("--available", action="store_true", help="Also list every table that can be loaded")
+    sub = ops.add_parser("row", parents=[common])
+    sub.add_argument("table")
+    sub.add_argument("id")
+    sub.add_argument("--columns", nargs="+")
+    sub = ops.add_parser("find", parents=[common])
+    sub.add_argument("table")
+    sub.add_argument("column")
+    sub.add_argument("value")
+    sub.add_argument("--limit", type=int)
+    sub = ops.add_parser("join", parents=[common])
+    sub.add_argument("table")
+    sub.add_argument("id")
+    sub.add_argument("column")
+    sub.add_argument("target")
+    sub = ops.add_parser("skill", parents=[common])
+    sub.add_argument("skill")
+    sub = ops.add_parser("trace", parents=[common])
+    sub.add_argument("skill")
+    sub.add_argument("--judges", nargs="+", type=int)
+    sub = ops.add_parser("behavior", parents=[common])
+    sub.add_argument("variation")
+    sub.add_argument("judges", nargs="+", type=int)
+    sub = ops.add_parser("magic", parents=[common])
+    sub.add_argument("prefix")
+    sub = ops.add_parser("text", parents=[common])
+    sub.add_argument("fmg")
+    sub.add_argument("id", type=int)
+    sub = ops.add_parser("search", parents=[common])
+    sub.add_argument("text")
+    sub.add_argument("--fmg")
+    sub.add_argument("--table")
+    sub.add_argument("--limit", type=int)
+    args = parser.parse_args()
+
+    transport = {"socket", "http", "compact"}
+    request = {key: value for key, value in vars(args).items() if key not in transport and value not in (None, False)}
+    try:
+        response = query(request, socket_path=args.socket, http=args.http)
+    except ConnectionError as exc:
+        sys.exit(f"{exc}\nStart one with: python scripts/param_daemon.py &")
+    if not response.get("ok"):
+        sys.exit(f"error: {response.get('error')}")
+    print(json.dumps(response["result"], ensure_ascii=False, indent=None if args.compact else 2))
+
+
+if __name__ == "__main__":
+    main()
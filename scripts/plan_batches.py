@@ -1,15 +1,31 @@
+import argparse
 import json
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, NamedTuple
 import glob
 
-ITEMS_TODO = Path('work/items_todo_filtered.json') if Path('work/items_todo_filtered.json').exists() else Path('work/items_todo.json')
+from run_batches import FORMATTING_RULES, build_prompt, eligible_items, load_effect_lines_filtered
+
 # Count any ready file variant (original or renamed with suffixes) as processed.
 PROCESSED_GLOB = 'work/responses/ready/*_response*.json'
 OUT_PLAN = Path('work/batch_plan.json')
+# Fixed-size plan (--chunk-size), and the size the budget plan is compared with.
 CHUNK_SIZE = 15
 CATEGORY_ORDER = ['armor','talisman','weapon','spell','skill','ash','consumable']
-FILTERED_DIR = Path('work/fex_cache_filtered')
+# Rough tokenizer-free estimate; only used to size batches against each other.
+CHARS_PER_TOKEN = 4
+# The response restates caption/info and folds the effect lines into info as
+# formatted mechanics, so it runs somewhat longer than its inputs.
+OUTPUT_GROWTH = 1.2
+PROMPT_BUDGET = 24000
+OUTPUT_BUDGET = 4000
+MAX_ITEMS = 30
+
+
+class ItemEstimate(NamedTuple):
+    item: Dict
+    prompt_tokens: int
+    output_tokens: int
 
 
 def load_processed_ids():
@@ -25,60 +41,126 @@ def load_processed_ids():
     return ids
 
 
-def main():
-    items = json.load(ITEMS_TODO.open())
-    # Only include items that have a filtered effect_lines JSON available and non-empty.
-    def has_filtered(item):
-        fname = item['name'].replace(' ', '_') + '_filtered.json'
-        path = FILTERED_DIR / fname
-        if not path.exists():
-            return False
-        try:
-            data = json.load(path.open(encoding='utf-8'))
-            lines = data.get('effect_lines') or []
-            return isinstance(lines, list) and len([ln for ln in lines if isinstance(ln, str) and ln.strip()]) > 0
-        except Exception:
-            return False
+def tokens(chars: int) -> int:
+    return -(-chars // CHARS_PER_TOKEN)
 
-    # Exclude any items that are in ignore.json (normalized underscores/spaces)
-    ignore_names = set()
-    ignore_path = Path('ignore.json')
-    if ignore_path.exists():
-        try:
-            raw = json.load(ignore_path.open())
-            for n in raw:
-                s = str(n).strip()
-                ignore_names.add(s)
-                ignore_names.add(s.replace('_', ' '))
-                ignore_names.add(s.replace(' ', '_'))
-        except Exception:
-            pass
 
-    items = [i for i in items if has_filtered(i) and i['name'] not in ignore_names and i['name'].replace(' ', '_') not in ignore_names]
+def estimate_item(item: Dict) -> ItemEstimate:
+    """
+    Prompt tokens this item adds to a batch (its block in build_prompt) and
+    the tokens its JSON object is expected to take in the response.
+    """
+    prompt_chars = len(build_prompt([item], '', OUT_PLAN)) - len(build_prompt([], '', OUT_PLAN))
+    effects = '\n'.join(load_effect_lines_filtered(item['name']))
+    caption = item.get('mod_caption') or item.get('vanilla_caption') or ''
+    info = item.get('mod_info') or item.get('vanilla_info') or ''
+    expected = {
+        'id': item['id'],
+        'name': item['name'],
+        'category': item['category'],
+        'caption': caption,
+        'info': info + '\n' + effects,
+    }
+    output_chars = len(json.dumps(expected, ensure_ascii=False, indent=2)) * OUTPUT_GROWTH
+    return ItemEstimate(item, tokens(prompt_chars), tokens(int(output_chars)))
+
+
+def pack(estimates: List[ItemEstimate], prompt_budget: int, output_budget: int, max_items: int) -> List[List[ItemEstimate]]:
+    """
+    First-fit decreasing by expected output: each item goes into the first
+    batch that stays within both budgets and max_items. An item over budget
+    on its own gets a batch to itself. Batches keep todo order inside and are
+    ordered by their first item.
+    """
+    order = {id(est): idx for idx, est in enumerate(estimates)}
+    bins: List[List[ItemEstimate]] = []
+    totals: List[List[int]] = []
+    for est in sorted(estimates, key=lambda e: (-e.output_tokens, -e.prompt_tokens, order[id(e)])):
+        for idx, (prompt, output) in enumerate(totals):
+            if (
+                len(bins[idx]) < max_items
+                and prompt + est.prompt_tokens <= prompt_budget
+                and output + est.output_tokens <= output_budget
+            ):
+                bins[idx].append(est)
+                totals[idx][0] += est.prompt_tokens
+                totals[idx][1] += est.output_tokens
+                break
+        else:
+            bins.append([est])
+            totals.append([est.prompt_tokens, est.output_tokens])
+    for batch in bins:
+        batch.sort(key=lambda e: order[id(e)])
+    bins.sort(key=lambda batch: order[id(batch[0])])
+    return bins
+
+
+def chunk(estimates: List[ItemEstimate], size: int) -> List[List[ItemEstimate]]:
+    return [estimates[idx:idx + size] for idx in range(0, len(estimates), size)]
+
+
+def plan_entry(cat: str, chunk_idx: int, batch: List[ItemEstimate], base_tokens: int, planner: str) -> Dict:
+    ids = [int(est.item['id']) for est in batch]
+    return {
+        'category': cat,
+        'ids': ids,
+        'limit': len(ids),
+        'batch_size': len(ids),
+        'prefix': f"{cat[:3].upper()}{chunk_idx:03d}_",
+        'save_raw': True,
+        'planner': planner,
+        # Whole prompt (instructions + rules + items) and expected response.
+        'est_prompt_tokens': base_tokens + sum(est.prompt_tokens for est in batch),
+        'est_output_tokens': sum(est.output_tokens for est in batch),
+    }
+
+
+def describe(label: str, plan: List[Dict], output_budget: int) -> str:
+    if not plan:
+        return f"{label}: no entries"
+    outputs = [entry['est_output_tokens'] for entry in plan]
+    over = sum(1 for out in outputs if out > output_budget)
+    return (
+        f"{label}: {len(plan)} batches, est. output tokens/batch "
+        f"mean {sum(outputs) // len(outputs)} max {max(outputs)}, {over} over {output_budget}"
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Plan LLM batches per category, sized by estimated tokens.')
+    ap.add_argument('--prompt-budget', type=int, default=PROMPT_BUDGET, help='Max estimated prompt tokens per batch.')
+    ap.add_argument('--output-budget', type=int, default=OUTPUT_BUDGET, help='Max estimated response tokens per batch.')
+    ap.add_argument('--max-items', type=int, default=MAX_ITEMS, help='Max items per batch.')
+    ap.add_argument('--chunk-size', type=int, help=f'Plan fixed-size batches instead (previously always {CHUNK_SIZE}).')
+    ap.add_argument('--output', default=str(OUT_PLAN))
+    args = ap.parse_args()
+
+    rules_text = FORMATTING_RULES.read_text(encoding='utf-8') if FORMATTING_RULES.exists() else ''
+    base_tokens = tokens(len(build_prompt([], rules_text, OUT_PLAN)))
     processed = load_processed_ids()
+    items = list(eligible_items())
     plan: List[Dict] = []
+    fixed_plan: List[Dict] = []
     for cat in CATEGORY_ORDER:
         cat_items = [t for t in items if t.get('category') == cat and int(t['id']) not in processed]
         if not cat_items:
             continue
-        idx = 0
-        chunk_idx = 0
-        while idx < len(cat_items):
-            chunk = cat_items[idx:idx+CHUNK_SIZE]
-            chunk_idx += 1
-            prefix = f"{cat[:3].upper()}{chunk_idx:03d}_"
-            plan.append({
-                'category': cat,
-                'start': idx,
-                'limit': len(chunk),
-                'batch_size': CHUNK_SIZE,
-                'prefix': prefix,
-                'save_raw': True,
-            })
-            idx += CHUNK_SIZE
-    OUT_PLAN.parent.mkdir(parents=True, exist_ok=True)
-    json.dump(plan, OUT_PLAN.open('w'), ensure_ascii=False, indent=2)
+        estimates = [estimate_item(t) for t in cat_items]
+        fixed = chunk(estimates, args.chunk_size or CHUNK_SIZE)
+        fixed_entries = [plan_entry(cat, idx, batch, base_tokens, 'fixed') for idx, batch in enumerate(fixed, 1)]
+        fixed_plan.extend(fixed_entries)
+        if args.chunk_size:
+            plan.extend(fixed_entries)
+            continue
+        packed = pack(estimates, args.prompt_budget - base_tokens, args.output_budget, args.max_items)
+        plan.extend(plan_entry(cat, idx, batch, base_tokens, 'budget') for idx, batch in enumerate(packed, 1))
+    out_plan = Path(args.output)
+    out_plan.parent.mkdir(parents=True, exist_ok=True)
+    json.dump(plan, out_plan.open('w'), ensure_ascii=False, indent=2)
     print(f"Plan entries: {len(plan)}")
+    if not args.chunk_size:
+        print(describe('budget plan', plan, args.output_budget))
+    print(describe(f'fixed {args.chunk_size or CHUNK_SIZE}', fixed_plan, args.output_budget))
 
 if __name__ == '__main__':
     main()
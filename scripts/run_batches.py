@@ -3,15 +3,22 @@ import glob
 import json
 import re
 import subprocess
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, NamedTuple, Optional, Set, Tuple
+
+from helpers.prompt_archive import PromptArchive, join_prompt
 
 IGNORE_PATH = Path("ignore.json")
 FILTERED_DIR = Path("work/fex_cache_filtered")
 
 
+@lru_cache(maxsize=None)
 def load_effect_lines_filtered(name: str) -> List[str]:
-    """Load pre-filtered effect lines from work/fex_cache_filtered if present."""
+    """
+    Load pre-filtered effect lines from work/fex_cache_filtered if present.
+    Memoized: the item filter and the prompt both read them. Do not mutate.
+    """
     path = FILTERED_DIR / f"{name.replace(' ', '_')}_filtered.json"
     if not path.exists():
         return []
@@ -29,8 +36,11 @@ ITEMS_TODO = (
     else Path("work/items_todo.json")
 )
 FORMATTING_RULES = Path("formatting_rules.md")
+WRAPPER = "codex-mcp-wrapper"
 BATCH_DIR = Path("work/prompts")
 BATCH_DIR.mkdir(parents=True, exist_ok=True)
+# Preamble stored once by hash, per-batch deltas next to it.
+PROMPT_ARCHIVE = PromptArchive(BATCH_DIR)
 RESP_DIR = Path("work/responses")
 RESP_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -48,21 +58,14 @@ def load_processed_ids(glob_pattern: str) -> Set[int]:
     return processed
 
 
-def load_items(
-    names_filter: List[str],
-    limit: int,
-    start: int,
-    processed_ids: Set[int],
-    category: Optional[str],
-) -> List[Dict]:
+@lru_cache(maxsize=None)
+def eligible_items() -> Tuple[Dict, ...]:
+    """
+    The todo list minus ignored items and items without a non-empty filtered
+    effect_lines file. Read once per process; run_plan.py builds every plan
+    entry from it.
+    """
     todo = json.load(ITEMS_TODO.open())
-    # Category restriction first.
-    if category:
-        todo = [t for t in todo if t.get("category") == category]
-    # Names restriction (if explicitly provided).
-    if names_filter:
-        names_lower = {n.lower() for n in names_filter}
-        todo = [t for t in todo if t["name"].lower() in names_lower]
     # Respect ignore list (same as plan_batches).
     ignore_names = set()
     if IGNORE_PATH.exists():
@@ -84,20 +87,29 @@ def load_items(
 
     # Require a non-empty filtered effect_lines file (mirrors plan_batches).
     def has_filtered(item):
-        fname = item["name"].replace(" ", "_") + "_filtered.json"
-        path = FILTERED_DIR / fname
-        if not path.exists():
-            return False
-        try:
-            data = json.load(path.open(encoding="utf-8"))
-            lines = data.get("effect_lines") or []
-            return isinstance(lines, list) and any(
-                isinstance(ln, str) and ln.strip() for ln in lines
-            )
-        except Exception:
-            return False
+        lines = load_effect_lines_filtered(item["name"])
+        return isinstance(lines, list) and any(
+            isinstance(ln, str) and ln.strip() for ln in lines
+        )
+
+    return tuple(t for t in todo if has_filtered(t))
 
-    todo = [t for t in todo if has_filtered(t)]
+
+def load_items(
+    names_filter: List[str],
+    limit: int,
+    start: int,
+    processed_ids: Set[int],
+    category: Optional[str],
+) -> List[Dict]:
+    todo = list(eligible_items())
+    # Category restriction first.
+    if category:
+        todo = [t for t in todo if t.get("category") == category]
+    # Names restriction (if explicitly provided).
+    if names_filter:
+        names_lower = {n.lower() for n in names_filter}
+        todo = [t for t in todo if t["name"].lower() in names_lower]
     # Skip already processed ids.
     todo = [t for t in todo if int(t["id"]) not in processed_ids]
     if start:
@@ -107,7 +119,19 @@ def load_items(
     return todo
 
 
-def build_prompt(batch: List[Dict], rules_text: str, output_path: Path) -> str:
+def load_items_by_id(ids: List[int], processed_ids: Set[int]) -> List[Dict]:
+    """The eligible, unprocessed items with these ids, in the order given."""
+    by_id = {int(t["id"]): t for t in eligible_items()}
+    return [by_id[i] for i in ids if i in by_id and i not in processed_ids]
+
+
+@lru_cache(maxsize=None)
+def build_preamble(rules_text: str) -> str:
+    """
+    The static head of every batch prompt: instructions, formatting rules and
+    output schema. Byte-identical across batches (nothing batch-specific goes
+    in here) so provider-side prefix caching applies to it.
+    """
     lines = []
     lines.append(
         "You are updating Elden Ring item descriptions to match the 'Detailed Item Descriptions' mod style. Follow the formatting rules below exactly. Return JSON only, no prose."
@@ -124,11 +148,22 @@ def build_prompt(batch: List[Dict], rules_text: str, output_path: Path) -> str:
     lines.append(
         "Do not include spoilers, quest/location guidance, acquisition steps, or patch notes—focus only on what the item does."
     )
-    lines.append(f"Save the JSON array to this path: {output_path}")
     lines.append("Formatting rules:\n" + rules_text)
     lines.append(
         "For each item, produce JSON with: id, name, category, caption (lore-only), info (final description with formatting). Keep lore intact, put mechanics per rules."
     )
+    lines.append(
+        'Output JSON array, each object: {"id": int, "name": str, "category": str, "caption": str, "info": str}.'
+    )
+    lines.append("Do not include markdown fences.")
+    lines.append("The items to update and the output path follow.")
+    return "\n\n".join(lines)
+
+
+def build_batch_delta(batch: List[Dict], output_path: Path) -> str:
+    """The batch-specific tail of the prompt: output path and items."""
+    lines = []
+    lines.append(f"Save the JSON array to this path: {output_path}")
     for idx, item in enumerate(batch, 1):
         wiki_effects = load_effect_lines_filtered(item["name"])
         lines.append(f"Item {idx}:")
@@ -142,13 +177,13 @@ def build_prompt(batch: List[Dict], rules_text: str, output_path: Path) -> str:
         lines.append(
             "wiki_effect_lines:\n" + json.dumps(wiki_effects, ensure_ascii=False)
         )
-    lines.append(
-        'Output JSON array, each object: {"id": int, "name": str, "category": str, "caption": str, "info": str}.'
-    )
-    lines.append("Do not include markdown fences.")
     return "\n\n".join(lines)
 
 
+def build_prompt(batch: List[Dict], rules_text: str, output_path: Path) -> str:
+    return join_prompt(build_preamble(rules_text), build_batch_delta(batch, output_path))
+
+
 def extract_json_from_output(text: str) -> (Optional[str], Optional[object]):
     """Return the first JSON array snippet and parsed object if possible."""
     try:
@@ -161,31 +196,40 @@ def extract_json_from_output(text: str) -> (Optional[str], Optional[object]):
         return snippet if "snippet" in locals() else None, None
 
 
-def run_batch(
-    batch: List[Dict],
-    rules_text: str,
-    batch_idx: int,
-    execute: bool,
-    model: str,
-    config: Path,
-    save_raw: bool,
-    save_full: bool,
-    prefix: str,
-    output_dir: Path,
-):
+class BatchFiles(NamedTuple):
+    base: str
+    prompt: Path
+    raw: Path
+    full: Path
+    parsed: Path
+
+
+def batch_files(batch_idx: int, prefix: str, output_dir: Path) -> BatchFiles:
     base = f"{prefix}batch_{batch_idx:04d}" if prefix else f"batch_{batch_idx:04d}"
-    prompt_file = BATCH_DIR / f"{base}_prompt.txt"
     output_dir.mkdir(parents=True, exist_ok=True)
-    raw_file = output_dir / f"{base}_response_raw.txt"
-    full_file = output_dir / f"{base}_response_full.txt"
-    parsed_file = output_dir / f"{base}_response.json"
-    prompt = build_prompt(batch, rules_text, parsed_file)
-    prompt_file.write_text(prompt, encoding="utf-8")
-    if not execute:
-        print(f"[dry-run] wrote {prompt_file}")
-        return
-    cmd = [
-        "codex-mcp-wrapper",
+    return BatchFiles(
+        base=base,
+        prompt=PROMPT_ARCHIVE.prompt_path(base),
+        raw=output_dir / f"{base}_response_raw.txt",
+        full=output_dir / f"{base}_response_full.txt",
+        parsed=output_dir / f"{base}_response.json",
+    )
+
+
+def write_prompt(batch: List[Dict], rules_text: str, files: BatchFiles) -> str:
+    """Archive the batch prompt under work/prompts/ and return the full text."""
+    preamble = build_preamble(rules_text)
+    delta = build_batch_delta(batch, files.parsed)
+    PROMPT_ARCHIVE.write(files.base, preamble, delta)
+    return join_prompt(preamble, delta)
+
+
+def wrapper_command(
+    prompt: str, config: Path, model: str, wrapper: str = WRAPPER
+) -> List[str]:
+    """The ``codex-mcp-wrapper chat`` invocation for one prompt."""
+    return [
+        wrapper,
         "chat",
         prompt,
         "--config",
@@ -199,32 +243,68 @@ def run_batch(
         "--model",
         model,
     ]
-    res = subprocess.run(cmd, capture_output=True, text=True)
-    combined = res.stdout + "\n" + res.stderr
+
+
+def save_batch_output(
+    files: BatchFiles,
+    returncode: int,
+    stdout: str,
+    stderr: str,
+    save_raw: bool,
+    save_full: bool,
+) -> bool:
+    """
+    Write the parsed/raw/full response files for a finished wrapper run.
+    Returns whether a JSON array was parsed from the output.
+    """
+    combined = stdout + "\n" + stderr
     if save_full:
-        full_file.write_text(combined, encoding="utf-8")
+        files.full.write_text(combined, encoding="utf-8")
     snippet, parsed_obj = extract_json_from_output(combined)
     if save_raw:
-        raw_file.write_text(snippet or "", encoding="utf-8")
+        files.raw.write_text(snippet or "", encoding="utf-8")
     if parsed_obj is not None:
         parsed = parsed_obj
-        parsed_file.write_text(
+        files.parsed.write_text(
             json.dumps(parsed, ensure_ascii=False, indent=2), encoding="utf-8"
         )
-        print(
-            f"[run] batch {batch_idx} exit {res.returncode}, parsed JSON -> {parsed_file}"
-        )
+        print(f"[run] {files.base} exit {returncode}, parsed JSON -> {files.parsed}")
+        return True
     else:
         if snippet:
-            parsed_file.write_text(snippet, encoding="utf-8")
+            files.parsed.write_text(snippet, encoding="utf-8")
         else:
-            parsed_file.write_text("null", encoding="utf-8")
-        msg = f"[run] batch {batch_idx} exit {res.returncode}, no JSON parsed"
+            files.parsed.write_text("null", encoding="utf-8")
+        msg = f"[run] {files.base} exit {returncode}, no JSON parsed"
         if save_raw:
-            msg += f" (see {raw_file})"
+            msg += f" (see {files.raw})"
         if save_full:
-            msg += f" (full {full_file})"
+            msg += f" (full {files.full})"
         print(msg)
+        return False
+
+
+def run_batch(
+    batch: List[Dict],
+    rules_text: str,
+    batch_idx: int,
+    execute: bool,
+    model: str,
+    config: Path,
+    save_raw: bool,
+    save_full: bool,
+    prefix: str,
+    output_dir: Path,
+):
+    files = batch_files(batch_idx, prefix, output_dir)
+    prompt = write_prompt(batch, rules_text, files)
+    if not execute:
+        print(f"[dry-run] wrote {files.prompt}")
+        return
+    res = subprocess.run(wrapper_command(prompt, config, model), capture_output=True, text=True)
+    save_batch_output(
+        files, res.returncode, res.stdout, res.stderr, save_raw, save_full
+    )
 
 
 def main():
@@ -298,6 +378,7 @@ def main():
         )
 
     print(f"Prepared {batch_idx} batches")
+    print(PROMPT_ARCHIVE.report())
 
 
 if __name__ == "__main__":
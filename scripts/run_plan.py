@@ -1,31 +1,151 @@
 import argparse
+import asyncio
 import json
-import subprocess
 import time
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, NamedTuple, Optional, Tuple
+
+from helpers.job_journal import FINISHED, JOURNAL_PATH, JobJournal, backoff, job_key, retry_at
+from helpers.scheduler import (
+    Retry,
+    add_concurrency_arguments,
+    concurrency_limit,
+    failure_reason,
+    record_result,
+    run_bounded,
+    run_process,
+    summarize,
+)
+from run_batches import (
+    BatchFiles,
+    FORMATTING_RULES,
+    PROMPT_ARCHIVE,
+    WRAPPER,
+    batch_files,
+    load_items,
+    load_items_by_id,
+    load_processed_ids,
+    save_batch_output,
+    wrapper_command,
+    write_prompt,
+)
 
 PLAN_PATH = Path('work/batch_plan.json')
+# Always skip ids already produced into the ready folder to avoid duplicate work.
+PROCESSED_GLOB = 'work/responses/ready/*_response*.json'
+
+
+class PlanBatch(NamedTuple):
+    entry: Dict
+    batch_idx: int
+    items: List[Dict]
+
+    @property
+    def name(self) -> str:
+        return f"{self.entry.get('prefix', '')}batch_{self.batch_idx:04d}"
+
+    @property
+    def key(self) -> str:
+        return job_key(self.name, [item['id'] for item in self.items])
+
+
+def plan_batches(plan: List[Dict], processed_ids) -> List[PlanBatch]:
+    """
+    Every batch of every plan entry: the entry's ``ids`` (token-budget plans
+    from plan_batches.py), or else selected exactly as
+    ``run_batches.py --category C --start S --limit L --batch-size B`` would.
+    """
+    batches: List[PlanBatch] = []
+    for entry in plan:
+        batch_size = entry.get('batch_size', entry.get('limit', 100))
+        if 'ids' in entry:
+            items = load_items_by_id([int(i) for i in entry['ids']], processed_ids)
+        else:
+            items = load_items([], entry['limit'], entry['start'], processed_ids, entry['category'])
+        for batch_idx, i in enumerate(range(0, len(items), batch_size), 1):
+            batches.append(PlanBatch(entry, batch_idx, items[i:i + batch_size]))
+    return batches
+
+
+def resumable(batches: List[PlanBatch], journal: JobJournal, max_attempts: int) -> List[PlanBatch]:
+    """The batches a --resume run still has to do, with a summary of the rest."""
+    todo: List[PlanBatch] = []
+    finished = failed = interrupted = exhausted = 0
+    for job in batches:
+        state = journal.jobs.get(job.key)
+        if state is None:
+            todo.append(job)
+        elif state.state in FINISHED:
+            finished += 1
+        elif state.attempts >= max_attempts:
+            exhausted += 1
+        else:
+            if state.state == 'failed':
+                failed += 1
+            else:
+                interrupted += 1
+            todo.append(job)
+    print(
+        f"[resume] {finished} finished, {failed} failed and {interrupted} interrupted to retry, "
+        f"{len(todo) - failed - interrupted} new, {exhausted} skipped after {max_attempts} attempts"
+    )
+    return todo
+
+
+async def run_plan(batches: List[PlanBatch], rules_text: str, journal: JobJournal, args) -> None:
+    output_dir = Path(args.output_dir)
+    concurrency = concurrency_limit(args)
+    prior = {job.key: journal.jobs.get(job.key) for job in batches}
+    # Only new jobs are queued: a queued record would replace a failed job's
+    # failure time, and with it the backoff a later --resume waits out.
+    journal.record_many([key for key, state in prior.items() if state is None], 'queued')
+
+    prompts: Dict[str, Tuple[BatchFiles, str]] = {}
+    runs: Dict[str, int] = {}
+
+    def due(job: PlanBatch) -> float:
+        # A resumed job that failed before waits out its backoff first.
+        at = retry_at(prior[job.key], args.backoff) if args.resume else 0.0
+        if at > time.time():
+            print(f"[backoff] {job.name} attempt {prior[job.key].attempts + 1} in {at - time.time():.0f}s")
+        return at
 
+    async def run_one(job: PlanBatch) -> Optional[Retry]:
+        # Called once per attempt; a failed attempt with retries left returns
+        # Retry, so the backoff is waited out without holding a slot.
+        if job.key not in prompts:
+            files = batch_files(job.batch_idx, job.entry.get('prefix', ''), output_dir)
+            prompts[job.key] = (files, write_prompt(job.items, rules_text, files))
+        files, prompt = prompts[job.key]
+        attempt = journal.jobs[job.key].attempts + 1
+        runs[job.key] = runs.get(job.key, 0) + 1
+        journal.record(job.key, 'running', attempt=attempt)
+        res = await run_process(
+            wrapper_command(prompt, Path(args.config), args.model, args.wrapper), timeout=args.timeout
+        )
+        record_result(concurrency, res)
+        parsed = save_batch_output(
+            files, res.returncode, res.stdout, res.stderr,
+            save_raw=job.entry.get('save_raw', False), save_full=False,
+        )
+        reason = failure_reason(res) or (None if parsed else 'no JSON parsed')
+        journal.record(
+            job.key, 'failed' if reason else 'succeeded', attempt=attempt,
+            seconds=round(res.seconds, 2), output=str(files.parsed), reason=reason,
+        )
+        if reason is None or runs[job.key] > args.retries or attempt >= args.max_attempts:
+            return None
+        wait = backoff(attempt, args.backoff)
+        print(f"[backoff] {job.name} attempt {attempt + 1} in {wait:.0f}s")
+        return Retry(time.time() + wait)
 
-def launch(entry: Dict, config: str, model: str, output_dir: str):
-    cmd = [
-        '.venv/bin/python', 'scripts/run_batches.py',
-        '--batch-size', str(entry.get('batch_size', entry.get('limit', 100))),
-        '--start', str(entry['start']),
-        '--limit', str(entry['limit']),
-        '--category', entry['category'],
-        '--batch-prefix', entry.get('prefix', ''),
-        '--config', config,
-        '--model', model,
-        '--output-dir', output_dir,
-        # Always skip ids already produced into the ready folder to avoid duplicate work.
-        '--processed-glob', 'work/responses/ready/*_response*.json',
-        '--execute'
-    ]
-    if entry.get('save_raw', False):
-        cmd.append('--save-raw')
-    return subprocess.Popen(cmd)
+    await run_bounded(batches, run_one, concurrency, ready_at=due)
+    summary = summarize(concurrency)
+    if summary:
+        print(summary)
+    print(PROMPT_ARCHIVE.report())
+    states = [journal.jobs[job.key].state for job in batches]
+    print(f"[journal] {states.count('succeeded')} succeeded, {states.count('failed')} failed -> {journal.path}")
 
 
 def main():
@@ -33,44 +153,32 @@ def main():
     ap.add_argument('--plan', default=str(PLAN_PATH))
     ap.add_argument('--config', default='../codex-mcp-wrapper/wrapper.toml')
     ap.add_argument('--model', default='gpt-5.1-codex-mini')
-    ap.add_argument('--concurrency', type=int, default=5)
+    ap.add_argument('--concurrency', type=int, default=5, help='Wrapper runs in flight at once (initial value when adaptive).')
+    add_concurrency_arguments(ap)
     ap.add_argument('--output-dir', default='work/responses/pending')
+    ap.add_argument('--wrapper', default=WRAPPER, help='codex-mcp-wrapper executable (e.g. a stub for testing).')
+    ap.add_argument('--journal', default=str(JOURNAL_PATH), help='Append-only job journal (JSONL).')
+    ap.add_argument('--resume', action='store_true', help='Skip jobs the journal records as finished; retry failed/interrupted ones.')
+    ap.add_argument('--retries', type=int, default=0, help='Extra attempts for a job that fails during this run.')
+    ap.add_argument('--max-attempts', type=int, default=5, help='Never run a job more often than this, across resumes.')
+    ap.add_argument('--backoff', type=float, default=30.0, help='Seconds before the first retry; doubles per attempt.')
     args = ap.parse_args()
 
     plan = json.load(open(args.plan, encoding='utf-8'))
-    procs: List[subprocess.Popen] = []
-    idx = 0
+    # Todo list, rules and processed ids are read once for the whole plan
+    # instead of once per entry in a fresh interpreter.
+    rules_text = FORMATTING_RULES.read_text(encoding='utf-8')
+    batches = plan_batches(plan, load_processed_ids(PROCESSED_GLOB))
+    print(f"{len(plan)} plan entries -> {len(batches)} batches, concurrency {args.concurrency}")
+    journal = JobJournal(Path(args.journal))
+    if args.resume:
+        batches = resumable(batches, journal, args.max_attempts)
     try:
-        while idx < len(plan) or procs:
-            while idx < len(plan) and len(procs) < args.concurrency:
-                entry = plan[idx]
-                p = launch(entry, args.config, args.model, args.output_dir)
-                procs.append(p)
-                idx += 1
-            # wait for any to finish
-            done = []
-            for p in procs:
-                ret = p.poll()
-                if ret is not None:
-                    done.append(p)
-            for p in done:
-                procs.remove(p)
-            if not done:
-                time.sleep(1)
-        print("Plan run complete")
+        asyncio.run(run_plan(batches, rules_text, journal, args))
     except KeyboardInterrupt:
-        print("KeyboardInterrupt received; terminating running batches...")
-        for p in procs:
-            try:
-                p.terminate()
-            except Exception:
-                pass
-        for p in procs:
-            try:
-                p.wait(timeout=5)
-            except Exception:
-                pass
+        print("KeyboardInterrupt received; running batches were terminated")
         raise
+    print("Plan run complete")
 
 if __name__ == '__main__':
     main()
@@ -1,11 +1,21 @@
 import argparse
+import asyncio
 import glob
-import subprocess
-import time
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Union
 import tomllib
 
+from helpers.scheduler import (
+    AdaptiveLimit,
+    add_concurrency_arguments,
+    concurrency_limit,
+    record_result,
+    run_bounded,
+    run_process,
+    summarize,
+)
+from run_batches import WRAPPER, wrapper_command
+
 DEFAULT_PROMPT_GLOB = "work/prompts/reformat_ready/*.txt"
 
 
@@ -47,26 +57,38 @@ def ensure_state_dir(config_path: Path) -> Path:
     return state_path
 
 
-def launch(prompt_path: Path, config: Path, model: str, log_errors: bool) -> subprocess.Popen:
-    """Start a codex-mcp-wrapper chat for the given prompt file."""
+async def run_prompt(
+    prompt_path: Path,
+    config: Path,
+    model: str,
+    log_errors: bool,
+    wrapper: str,
+    concurrency: Union[int, AdaptiveLimit],
+    timeout: Optional[float] = None,
+) -> int:
+    """Run a codex-mcp-wrapper chat for the given prompt file and report its exit."""
     prompt_text = prompt_path.read_text(encoding="utf-8")
-    cmd = [
-        "codex-mcp-wrapper",
-        "chat",
-        prompt_text,
-        "--config",
-        str(config),
-        "--transport",
-        "streamable-http",
-        "--port",
-        "0",
-        "--light",
-        "--",
-        "--model",
-        model,
-    ]
-    stderr_target = subprocess.PIPE if log_errors else subprocess.DEVNULL
-    return subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=stderr_target, text=True)
+    print(f"[start] {prompt_path.name}")
+    res = await run_process(
+        wrapper_command(prompt_text, config, model, wrapper),
+        capture_stdout=False,
+        # The adaptive limit reads stderr for rate-limit messages.
+        capture_stderr=log_errors or isinstance(concurrency, AdaptiveLimit),
+        timeout=timeout,
+    )
+    record_result(concurrency, res)
+    ret = res.returncode
+    if res.timed_out:
+        print(f"[fail] {prompt_path.name} timed out after {res.seconds:.0f}s")
+    elif log_errors and ret != 0:
+        err_msg = res.stderr.strip()
+        if err_msg:
+            print(f"[fail] {prompt_path.name} exit {ret}: {err_msg}")
+        else:
+            print(f"[fail] {prompt_path.name} exit {ret}")
+    else:
+        print(f"[done] {prompt_path.name} exit {ret}")
+    return ret
 
 
 def main():
@@ -74,9 +96,11 @@ def main():
     ap.add_argument("--prompt-glob", default=DEFAULT_PROMPT_GLOB, help="Glob for prompt files to run (sorted) when no paths are provided.")
     ap.add_argument("--config", default="../codex-mcp-wrapper/wrapper.toml", help="codex-mcp-wrapper config path.")
     ap.add_argument("--model", default="gpt-5.1-codex-mini", help="Model name for codex-mcp-wrapper.")
-    ap.add_argument("--concurrency", type=int, default=5, help="Number of concurrent agents.")
+    ap.add_argument("--concurrency", type=int, default=5, help="Number of concurrent agents (initial value when adaptive).")
+    add_concurrency_arguments(ap)
     ap.add_argument("--dry-run", action="store_true", help="List prompts without launching agents.")
     ap.add_argument("--log-errors", action="store_true", help="Print stderr for prompts that exit non-zero.")
+    ap.add_argument("--wrapper", default=WRAPPER, help="codex-mcp-wrapper executable (e.g. a stub for testing).")
     ap.add_argument("paths", nargs="*", help="Prompt file(s) or directories; overrides --prompt-glob when provided.")
     args = ap.parse_args()
 
@@ -94,53 +118,22 @@ def main():
         print(f"Total prompts: {len(prompts)}")
         return
 
-    procs: List[Tuple[subprocess.Popen, Path]] = []
-    idx = 0
+    concurrency = concurrency_limit(args)
+
+    async def run_one(prompt_path: Path) -> int:
+        return await run_prompt(
+            prompt_path, config_path, args.model, args.log_errors, args.wrapper, concurrency, args.timeout
+        )
 
     try:
-        while idx < len(prompts) or procs:
-            while idx < len(prompts) and len(procs) < args.concurrency:
-                prompt_path = prompts[idx]
-                proc = launch(prompt_path, Path(args.config), args.model, args.log_errors)
-                procs.append((proc, prompt_path))
-                idx += 1
-                print(f"[start] {prompt_path.name}")
-
-            done = []
-            for proc, prompt_path in procs:
-                ret = proc.poll()
-                if ret is None:
-                    continue
-                if args.log_errors and ret != 0 and proc.stderr is not None:
-                    _out, err = proc.communicate()
-                    err_msg = (err or "").strip()
-                    if err_msg:
-                        print(f"[fail] {prompt_path.name} exit {ret}: {err_msg}")
-                    else:
-                        print(f"[fail] {prompt_path.name} exit {ret}")
-                else:
-                    print(f"[done] {prompt_path.name} exit {ret}")
-                done.append((proc, prompt_path))
-
-            for entry in done:
-                procs.remove(entry)
-
-            if not done:
-                time.sleep(1)
+        asyncio.run(run_bounded(prompts, run_one, concurrency))
     except KeyboardInterrupt:
-        print("Interrupted; terminating running agents...")
-        for proc, _ in procs:
-            try:
-                proc.terminate()
-            except Exception:
-                pass
-        for proc, _ in procs:
-            try:
-                proc.wait(timeout=5)
-            except Exception:
-                pass
+        print("Interrupted; running agents were terminated")
         raise
 
+    summary = summarize(concurrency)
+    if summary:
+        print(summary)
     print("All prompts completed.")
 
 
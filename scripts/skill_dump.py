@@ -7,6 +7,9 @@ Pulls:
 - Magic → Bullet/Atk/SpEffect chains (by swordArtsParamId prefix)
 - Optional BehaviorParam_PC → Bullet/Atk/SpEffect if a behavior ID list is provided per skill.
 
+The joins go through the precomputed graph in helpers/behavior_graph.py, so
+each hop is a lookup rather than a scan of Magic/BehaviorParam_PC/EquipParamWeapon.
+
 Usage:
   python scripts/skill_dump.py --skills work/responses/ready/skill.json --out work/skill_dump.json
   python scripts/skill_dump.py --skills work/responses/ready/skill.json --behavior-map configs/behavior_ids.json --out work/skill_dump.json
@@ -21,33 +24,15 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import csv
 import json
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
-
-PARAM_DIR = Path("PARAM")
-
-
-def load_csv(path: Path) -> List[dict]:
-    with path.open(newline="", encoding="utf-8") as f:
-        return list(csv.DictReader(f))
-
+from typing import List, Mapping, Tuple
 
-def index_by_id(rows: Iterable[dict]) -> Dict[str, dict]:
-    return {row["ID"]: row for row in rows}
+from helpers.behavior_graph import BehaviorGraph, load_behavior_graph
+from helpers.params import PARAM_DIR, ParamTable, load_param
 
 
-def gather_sp_effects(row: dict) -> List[str]:
-    ids: List[str] = []
-    for key in ("spEffectId0", "spEffectId1", "spEffectId2", "spEffectId3", "spEffectId4"):
-        val = row.get(key)
-        if val and val not in ("-1", "0"):
-            ids.append(val)
-    return ids
-
-
-def describe_atk(row: dict) -> dict:
+def describe_atk(row: Mapping[str, str]) -> dict:
     return {
         "id": row.get("ID"),
         "phys": row.get("atkPhys"),
@@ -61,18 +46,19 @@ def describe_atk(row: dict) -> dict:
     }
 
 
-def trace_bullet(bullet: dict, atk_rows: Dict[str, dict], spe_rows: Dict[str, dict]) -> dict:
-    spe_ids = gather_sp_effects(bullet)
-    atk = atk_rows.get(bullet.get("atkId_Bullet"))
+def trace_bullet(bullet: Mapping[str, str], graph: BehaviorGraph, atk_rows: ParamTable, spe_rows: ParamTable) -> dict:
+    edges = graph.bullet(bullet.get("ID"))
+    atk_id, spe_ids = edges if edges is not None else (bullet.get("atkId_Bullet"), [])
+    atk = atk_rows.get(atk_id)
     return {
         "id": bullet.get("ID"),
         "life": bullet.get("life"),
         "dist": bullet.get("dist"),
         "hitBullet": bullet.get("HitBulletID"),
-        "atkId": bullet.get("atkId_Bullet"),
+        "atkId": atk_id,
         "atk": describe_atk(atk) if atk else None,
         "spEffects": [
-            {"id": sid, "data": spe_rows.get(sid)} for sid in spe_ids if spe_rows.get(sid) is not None
+            {"id": sid, "data": dict(spe_rows.get(sid))} for sid in spe_ids if spe_rows.get(sid) is not None
         ],
     }
 
@@ -86,13 +72,11 @@ def main() -> None:
     args = parser.parse_args()
 
     param_dir: Path = args.param_dir
-    magic_rows = load_csv(param_dir / "Magic.csv")
-    bullet_rows = index_by_id(load_csv(param_dir / "Bullet.csv"))
-    atk_rows = index_by_id(load_csv(param_dir / "AtkParam_Pc.csv"))
-    spe_rows = index_by_id(load_csv(param_dir / "SpEffectParam.csv"))
-    behavior_rows = load_csv(param_dir / "BehaviorParam_PC.csv")
-    equip_weapon_rows = load_csv(param_dir / "EquipParamWeapon.csv")
-    equip_gem_rows = load_csv(param_dir / "EquipParamGem.csv")
+    bullet_rows = load_param("Bullet", param_dir)
+    atk_rows = load_param("AtkParam_Pc", param_dir)
+    spe_rows = load_param("SpEffectParam", param_dir)
+    behavior_rows = load_param("BehaviorParam_PC", param_dir)
+    graph = load_behavior_graph(param_dir)
 
     behavior_map = {}
     if args.behavior_map and args.behavior_map.exists():
@@ -101,47 +85,32 @@ def main() -> None:
     skills = json.loads(args.skills.read_text())
 
     def derive_swordarts_and_variation(skill_id: str) -> Tuple[str, str]:
-        for row in equip_gem_rows:
-            if row["ID"] == skill_id:
-                return row.get("swordArtsParamId", skill_id), "0"
-        for row in equip_weapon_rows:
-            if row.get("ID") == skill_id or row.get("swordArtsParamId") == skill_id:
-                return row.get("swordArtsParamId", skill_id), row.get("behaviorVariationId") or "0"
-        return skill_id, "0"
+        sword_arts, variation = graph.skill(skill_id)
+        return sword_arts, variation or "0"
 
     def magic_hits(sid_prefix: str) -> List[dict]:
         hits: List[dict] = []
-        for row in magic_rows:
-            for i in range(1, 11):
-                rid = row.get(f"refId{i}")
-                if not rid or rid == "-1" or not rid.startswith(sid_prefix):
-                    continue
-                cat = row.get(f"refCategory{i}")
-                hit = {"magicId": row.get("ID"), "ref": rid, "refCategory": cat}
-                if cat == "0":  # AtkParam
-                    atk = atk_rows.get(rid)
-                    if atk:
-                        hit["atk"] = describe_atk(atk)
-                elif cat == "1":  # Bullet
-                    bullet = bullet_rows.get(rid)
-                    if bullet:
-                        hit["bullet"] = trace_bullet(bullet, atk_rows, spe_rows)
-                elif cat == "2":  # SpEffectParam
-                    spe = spe_rows.get(rid)
-                    if spe:
-                        hit["spEffect"] = {"id": rid, "data": spe}
-                hits.append(hit)
+        for magic_id, _, rid, cat in graph.magic_refs(sid_prefix):
+            hit = {"magicId": magic_id, "ref": rid, "refCategory": cat}
+            if cat == "0":  # AtkParam
+                atk = atk_rows.get(rid)
+                if atk:
+                    hit["atk"] = describe_atk(atk)
+            elif cat == "1":  # Bullet
+                bullet = bullet_rows.get(rid)
+                if bullet:
+                    hit["bullet"] = trace_bullet(bullet, graph, atk_rows, spe_rows)
+            elif cat == "2":  # SpEffectParam
+                spe = spe_rows.get(rid)
+                if spe:
+                    hit["spEffect"] = {"id": rid, "data": dict(spe)}
+            hits.append(hit)
         return hits
 
     def behavior_hits(skill_id: str, variation_id: str, judge_ids: List[int]) -> List[dict]:
         if not judge_ids:
             return []
-        judge_set = {str(j) for j in judge_ids}
-        matches = [
-            row
-            for row in behavior_rows
-            if row["variationId"] == variation_id and row["behaviorJudgeId"] in judge_set and row.get("refId") not in (None, "-1")
-        ]
+        matches = [behavior_rows.get(bid) for bid in graph.behavior_ids(variation_id, judge_ids)]
         out: List[dict] = []
         for row in matches:
             ref_type = row.get("refType")
@@ -159,11 +128,11 @@ def main() -> None:
             elif ref_type == "1":  # Bullet
                 bullet = bullet_rows.get(ref_id)
                 if bullet:
-                    entry["bullet"] = trace_bullet(bullet, atk_rows, spe_rows)
+                    entry["bullet"] = trace_bullet(bullet, graph, atk_rows, spe_rows)
             elif ref_type == "2":  # SpEffectParam
                 spe = spe_rows.get(ref_id)
                 if spe:
-                    entry["spEffect"] = {"id": ref_id, "data": spe}
+                    entry["spEffect"] = {"id": ref_id, "data": dict(spe)}
             out.append(entry)
         return out
 
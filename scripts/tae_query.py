@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Query TAE events of every type through a persistent index (helpers/tae.py).
+
+The first run decodes all events under --tae-root and saves the index in
+work/.cache/tae; later runs load it directly and only rescan when a TAE changed.
+
+Usage:
+  python scripts/tae_query.py --tae-root PARAM/tae_behavior_map/tae --types
+  python scripts/tae_query.py --tae-root PARAM/tae_behavior_map/tae --type 304
+  python scripts/tae_query.py --tae-root dump/tae_collected --judge 430
+  python scripts/tae_query.py --tae-root dump/tae_collected --tae a880.tae --type 304
+  python scripts/tae_query.py --tae-root dump/tae_collected --anim 31700 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Optional
+
+from helpers.tae import CACHE_DIR, TaeEvent, load_tae_index
+
+
+def format_time(value: Optional[float]) -> str:
+    return "?" if value is None else f"{value:.3f}"
+
+
+def format_event(event: TaeEvent) -> str:
+    text = f"{event.tae}:{event.anim_id}@{format_time(event.start)}-{format_time(event.end)} type {event.type}"
+    if event.judge >= 0:
+        text += f" judge {event.judge}"
+    return text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Look up TAE events by type, behaviorJudgeId, anim ID or TAE file.")
+    parser.add_argument("--tae-root", required=True, type=Path, help="Root directory to search for .tae files (recursively).")
+    parser.add_argument("--types", action="store_true", help="List event types with their event counts.")
+    parser.add_argument("--type", dest="event_type", type=int, help="Event type (e.g. 304 for Behavior).")
+    parser.add_argument("--judge", type=int, help="behaviorJudgeId of Behavior events.")
+    parser.add_argument("--anim", dest="anim_id", type=int, help="Animation ID.")
+    parser.add_argument("--tae", help="TAE file name (e.g. a880.tae) or path.")
+    parser.add_argument("--json", action="store_true", help="Print matches as JSON.")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for parsing changed TAEs (0 = one per CPU).")
+    parser.add_argument("--no-cache", action="store_true", help="Rebuild the index without reading or writing the cache.")
+    args = parser.parse_args()
+
+    tae_files = sorted(args.tae_root.rglob("*.tae"))
+    if not tae_files:
+        raise SystemExit(f"No .tae files found under {args.tae_root}")
+
+    def report(tae: Path, exc: Exception) -> None:
+        print(f"Failed to parse {tae}: {exc}")
+
+    index = load_tae_index(
+        tae_files,
+        jobs=args.jobs,
+        cache_dir=None if args.no_cache else CACHE_DIR,
+        on_error=report,
+    )
+
+    if args.types:
+        counts = index.event_types()
+        if args.json:
+            print(json.dumps({str(event_type): count for event_type, count in counts.items()}, indent=2))
+        else:
+            for event_type, count in counts.items():
+                print(f"{event_type:>6} {count:>9}")
+        return
+
+    filters = {"event_type": args.event_type, "judge": args.judge, "anim_id": args.anim_id, "tae": args.tae}
+    if all(value is None for value in filters.values()):
+        parser.error("give --types or at least one of --type/--judge/--anim/--tae")
+    matches = index.query(**filters)
+    if args.json:
+        print(json.dumps([event._asdict() for event in matches], indent=2))
+        return
+    for event in matches:
+        print(format_event(event))
+    anims = {(event.tae, event.anim_id) for event in matches}
+    print(f"{len(matches)} events in {len(anims)} anims across {len({tae for tae, _ in anims})} TAE files.")
+
+
+if __name__ == "__main__":
+    main()